@@ -0,0 +1,73 @@
+"""
+Lazy Section Loading Benchmark
+------------------------------
+Writes a large organization file (scaled sample sections plus a long list of
+stored reports) and compares loading the whole document with loading only the
+metrics section through LazyOrganization: wall time and peak Python memory.
+
+Usage: python -m benchmarks.bench_lazy [--scale 1000] [--reports 200]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_serialization import make_organization
+from esg_implementation import serialization
+from esg_implementation.lazy import _INDEX_CACHE, LazyOrganization
+
+
+def measure(func, path: Path, cached_index: bool = False) -> tuple:
+    """Time ``func``, then run it again under tracemalloc; returns (seconds, peak traced MiB).
+
+    The offset-index cache is emptied before each run unless ``cached_index``,
+    in which case it is primed first.
+    """
+    results = []
+    for traced in (False, True):
+        _INDEX_CACHE.clear()
+        if cached_index:
+            load_metrics_lazily(path)
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        results.append(time.perf_counter() - start)
+        if traced:
+            results.append(tracemalloc.get_traced_memory()[1] / 2**20)
+            tracemalloc.stop()
+    return results[0], results[2]
+
+
+def load_metrics_lazily(path: Path) -> None:
+    with LazyOrganization(path) as view:
+        view.metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args()
+
+    organization = make_organization(args.scale)
+    organization.reports = [
+        {"title": f"GRI Report {i}", "framework": "GRI", "content": "## Section\n" + "Narrative text. " * 5000}
+        for i in range(args.reports)
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = serialization.save(organization, Path(temp_dir) / "org.json")
+        print(f"file size: {path.stat().st_size / 2**20:.1f} MiB, {len(organization.metrics):,} metrics")
+        print(f"{'load':>14} {'seconds':>8} {'peak MiB':>9}")
+        for label, func, cached in (
+            ("full", lambda: serialization.load(path), False),
+            ("lazy metrics", lambda: load_metrics_lazily(path), False),
+            ("lazy (cached)", lambda: load_metrics_lazily(path), True),
+        ):
+            elapsed, peak = measure(func, path, cached)
+            print(f"{label:>14} {elapsed:8.3f} {peak:9.1f}")
+
+if __name__ == "__main__":
+    main()
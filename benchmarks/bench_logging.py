@@ -0,0 +1,67 @@
+"""
+Log File Writer Benchmark
+-------------------------
+Measures lines per second written to a run log file, as a verbose crew does
+with thousands of small messages, with a per-write file flush versus the
+BufferedFileWriter behind ESGLogger. The buffered timing includes the final
+flush to disk.
+
+Usage: python -m benchmarks.bench_logging [--lines 200000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from esg_implementation.logging import BufferedFileWriter
+
+
+class FlushingFileWriter:
+    """Baseline: writes and flushes the file on every call."""
+
+    def __init__(self, filename: Path):
+        self.file = open(filename, 'a', encoding='utf-8')
+
+    def write(self, message):
+        self.file.write(message)
+        self.file.flush()
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def measure(factory, path: Path, lines: int) -> float:
+    """Lines per second written through a file writer built by ``factory``."""
+    message = "Agent: ESG Monitoring and Reporting Specialist - Thinking about the next step...\n"
+    writer = factory(path)
+    try:
+        start = time.perf_counter()
+        for _ in range(lines):
+            writer.write(message)
+        writer.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        writer.close()
+    assert path.read_text(encoding='utf-8').count("\n") == lines
+    return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        flushing = measure(FlushingFileWriter, Path(temp_dir) / "flushing.log", args.lines)
+        buffered = measure(BufferedFileWriter, Path(temp_dir) / "buffered.log", args.lines)
+    print(f"{'writer':>10} {'lines/s':>12}")
+    print(f"{'per-write':>10} {flushing:12,.0f}")
+    print(f"{'buffered':>10} {buffered:12,.0f}  ({buffered / flushing:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Materiality Matrix Benchmark
+---------------------------
+Times materiality matrix rendering (draw + PNG encode) for synthetic issue sets,
+comparing the batched renderer against the per-issue scatter/annotate loop.
+
+Usage: python -m benchmarks.bench_materiality [--sizes 100 1000 10000] [--skip-naive-above 1000]
+"""
+
+import argparse
+import io
+import random
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from esg_implementation.visualization import CATEGORY_COLORS, render_materiality_matrix
+
+
+def make_issues(count: int, seed: int = 42) -> list:
+    """Generate synthetic material issues with integer importance ratings."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_COLORS)
+    return [
+        {
+            "name": f"Issue {i}",
+            "category": rng.choice(categories),
+            "importance_to_business": rng.randint(1, 10),
+            "importance_to_stakeholders": rng.randint(1, 10),
+        }
+        for i in range(count)
+    ]
+
+
+def render_naive(issues: list) -> plt.Figure:
+    """Per-issue rendering loop as used by the original VisualizationTool."""
+    fig, ax = plt.subplots(figsize=(10, 8))
+    for issue in issues:
+        x, y = issue["importance_to_business"], issue["importance_to_stakeholders"]
+        ax.scatter(x, y, color=CATEGORY_COLORS.get(issue["category"], "gray"), s=100)
+        ax.annotate(issue["name"], (x, y), xytext=(5, 5), textcoords='offset points')
+    ax.set_xlim(0, 11)
+    ax.set_ylim(0, 11)
+    return fig
+
+
+def time_render(render, issues: list) -> float:
+    """Render and encode to PNG, returning elapsed seconds."""
+    start = time.perf_counter()
+    fig = render(issues)
+    fig.savefig(io.BytesIO(), format="png")
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--skip-naive-above", type=int, default=1000,
+                        help="Skip the naive renderer for larger sets (it scales poorly)")
+    args = parser.parse_args()
+
+    print(f"{'issues':>8} {'batched (s)':>12} {'naive (s)':>10}")
+    for size in args.sizes:
+        issues = make_issues(size)
+        batched = time_render(render_materiality_matrix, issues)
+        naive = time_render(render_naive, issues) if size <= args.skip_naive_above else None
+        naive_text = f"{naive:10.3f}" if naive is not None else f"{'skipped':>10}"
+        print(f"{size:>8} {batched:12.3f} {naive_text}")
+
+
+if __name__ == "__main__":
+    main()
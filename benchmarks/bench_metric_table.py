@@ -0,0 +1,79 @@
+"""
+Metric Table Benchmark
+----------------------
+Compares building facility-level metrics as List[ESGMetric] (validated per
+record) with building a MetricTable (validated per column): build time, peak
+and retained Python memory, and GRI markdown report rendering time (from the
+plain dict records versus from the table).
+
+Usage: python -m benchmarks.bench_metric_table [--sizes 10000 100000 500000]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from typing import List
+
+from esg_implementation.metric_table import MetricTable
+from esg_implementation.models import ESGMetric
+from esg_implementation.reporting import ReportEngine
+
+CATEGORIES = ("Environmental", "Social", "Governance")
+UNITS = ("tCO2e", "MWh", "m3", "%", "count")
+
+
+def make_records(count: int, seed: int = 42) -> list:
+    """Synthetic per-facility metric records."""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Facility {i // 20} Metric {i % 20}",
+            "unit": rng.choice(UNITS),
+            "data_source": f"Meter network {i % 50}",
+            "category": CATEGORIES[i % 3],
+            "current_value": rng.uniform(0, 1000),
+            "target_value": rng.uniform(500, 1000) if i % 4 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func):
+    """Run ``func`` under tracemalloc; returns (result, seconds, peak MiB, retained MiB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    retained, peak = (size / 2**20 for size in tracemalloc.get_traced_memory())
+    tracemalloc.stop()
+    return result, elapsed, peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[ESGMetric])
+    engine = ReportEngine("GRI", "markdown")
+    print(f"{'metrics':>8} {'layout':>8} {'build (s)':>10} {'peak MiB':>9} {'kept MiB':>9} {'report (s)':>11}")
+    for size in args.sizes:
+        records = make_records(size)
+        for label, build in (
+            ("models", lambda: adapter.validate_python(records)),
+            ("table", lambda: MetricTable.from_records(records)),
+        ):
+            metrics, build_seconds, peak, retained = measure(build)
+            data = {"name": "Benchmark Corp", "metrics": metrics if label == "table" else records}
+            start = time.perf_counter()
+            engine.render(data, date="2024-01-01")
+            report_seconds = time.perf_counter() - start
+            print(f"{size:>8} {label:>8} {build_seconds:10.3f} {peak:9.1f} {retained:9.1f} {report_seconds:11.3f}")
+            del metrics
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Serialization Codec Benchmark
+-----------------------------
+Times save and load of an organization file and reports its size for each
+codec and compression, at the sample organization's size and scaled up, against
+the original pretty-printed JSON written with json.load + model_validate.
+
+Usage: python -m benchmarks.bench_serialization [--scales 1 100] [--repeat 20]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from esg_implementation import serialization
+from esg_implementation.models import ESGOrganization
+
+SAMPLE = Path(__file__).resolve().parent.parent / "examples" / "greentech_solutions_esg_data.json"
+SECTIONS = ("stakeholders", "material_issues", "metrics", "initiatives")
+
+
+def make_organization(scale: int) -> ESGOrganization:
+    """Load the sample organization and repeat each section ``scale`` times with distinct names."""
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    for section in SECTIONS:
+        data[section] = [
+            {**record, "name": f"{record['name']} {copy}"}
+            for copy in range(scale) for record in data.get(section, [])
+        ]
+    return ESGOrganization.model_validate(data)
+
+
+def save_legacy(organization: ESGOrganization, path: Path) -> None:
+    """Original save: pretty-printed JSON."""
+    path.write_text(organization.model_dump_json(indent=2))
+
+
+def load_legacy(path: Path) -> ESGOrganization:
+    """Original load: json.load, then model_validate."""
+    with path.open('r') as f:
+        return ESGOrganization.model_validate(json.load(f))
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Best wall time in milliseconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    variants = [(codec, compression) for codec in serialization.CODECS for compression in (None, "gzip", "lzma")]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in args.scales:
+            organization = make_organization(scale)
+            print(f"\nscale {scale}x")
+            print(f"{'format':>16} {'save (ms)':>10} {'load (ms)':>10} {'size (KiB)':>11}")
+
+            legacy = Path(temp_dir) / "legacy.json"
+            save_ms = best_of(args.repeat, save_legacy, organization, legacy)
+            load_ms = best_of(args.repeat, load_legacy, legacy)
+            print(f"{'pretty json':>16} {save_ms:10.2f} {load_ms:10.2f} {legacy.stat().st_size / 1024:11.1f}")
+
+            for codec, compression in variants:
+                path = Path(temp_dir) / f"org{serialization.file_extension(codec, compression)}"
+                save_ms = best_of(args.repeat, serialization.save, organization, path, codec, compression)
+                load_ms = best_of(args.repeat, serialization.load, path)
+                label = codec + (f"+{compression}" if compression else "")
+                print(f"{label:>16} {save_ms:10.2f} {load_ms:10.2f} {path.stat().st_size / 1024:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Trends Rendering Benchmark
+--------------------------
+Writes a synthetic sub-daily meter series to a temporary time-series store and
+times the trends chart (query + downsample + draw + PNG encode) for each
+downsampling method, against plotting every reading.
+
+Usage: python -m benchmarks.bench_trends [--points 10000000] [--skip-raw-above 1000000]
+"""
+
+import argparse
+import io
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from esg_implementation.timeseries import TimeSeriesStore
+from esg_implementation.visualization import render_trends
+
+
+def write_series(store: TimeSeriesStore, points: int, seed: int = 42) -> None:
+    """Append a noisy, seasonal meter series sampled every 10 seconds."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2020-01-01T00:00:00").astype(np.int64)
+    timestamps = start + np.arange(points, dtype=np.int64) * 10
+    seasonal = 50 * np.sin(2 * np.pi * np.arange(points) / (points / 4))
+    values = 500 + seasonal + rng.normal(0, 20, points).cumsum() / 100 + rng.normal(0, 5, points)
+    store.append("Energy Use", timestamps, values)
+
+
+def time_render(store: TimeSeriesStore, method: str, max_points=None) -> float:
+    """Render and encode to PNG, returning elapsed seconds."""
+    start = time.perf_counter()
+    fig = render_trends(store, ["Energy Use"], method=method, max_points=max_points)
+    fig.savefig(io.BytesIO(), format="png")
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10_000_000)
+    parser.add_argument("--skip-raw-above", type=int, default=1_000_000,
+                        help="Skip plotting every reading for larger series (it scales poorly)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        write_series(store, args.points)
+        print(f"{'method':>12} {'seconds':>8}  ({args.points:,} points)")
+        for method in ("minmax_lttb", "minmax", "lttb"):
+            print(f"{method:>12} {time_render(store, method):8.3f}")
+        if args.points <= args.skip_raw_above:
+            print(f"{'raw':>12} {time_render(store, 'minmax', max_points=args.points):8.3f}")
+        else:
+            print(f"{'raw':>12} {'skipped':>8}")
+
+
+if __name__ == "__main__":
+    main()
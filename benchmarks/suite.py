@@ -0,0 +1,253 @@
+"""
+ESG Toolchain Benchmark Suite
+-----------------------------
+Times the toolchain end to end on synthetic organizations of increasing size:
+the five agent tools, organization save/load and validation, report
+generation, chart rendering, and a full run_implementation against a fake LLM
+with a fixed latency per call. Results are written as JSON with the
+environment they were measured in; ``--compare`` prints the change against an
+earlier results file.
+
+Usage: python -m benchmarks.suite [--sizes 100 1000 10000] [--repeat 3] [--llm-latency 0.05]
+                                  [--output results.json] [--compare baseline.json] [--skip-run]
+"""
+
+import os
+
+# Before crewai is imported: no telemetry from benchmark runs
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from types import SimpleNamespace
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from esg_implementation.config import ESGConfig
+from esg_implementation.core import ESGWorkflowManager
+from esg_implementation.llm import GeminiLLM
+from esg_implementation.models import ESGOrganization
+from esg_implementation.reporting import render_reports
+from esg_implementation.validation import get_validation_engine
+from esg_implementation.visualization import render_materiality_matrix, render_metrics_dashboard
+
+CATEGORIES = ["Environmental", "Social", "Governance"]
+PACKAGES = ["crewai", "pydantic", "numpy", "matplotlib", "google-generativeai"]
+FINAL_ANSWER = "Thought: I now know the final answer\nFinal Answer: Done."
+
+
+class FakeModel:
+    """Stands in for a Gemini model: answers every prompt after ``latency`` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        usage = SimpleNamespace(prompt_token_count=len(str(prompt)) // 4, candidates_token_count=len(FINAL_ANSWER) // 4)
+        return SimpleNamespace(text=FINAL_ANSWER, usage_metadata=usage)
+
+
+def make_organization(size: int, seed: int = 42) -> ESGOrganization:
+    """Synthetic organization with ``size`` metrics and a tenth as many of each other record."""
+    rng = random.Random(seed)
+    records = max(size // 10, 1)
+    return ESGOrganization.model_validate({
+        "name": f"Benchmark Corp {size}",
+        "vision": {
+            "vision_statement": "Net zero operations by 2040",
+            "environmental_goals": ["Cut emissions"], "social_goals": ["Safe workplaces"],
+            "governance_goals": ["Independent board"],
+        },
+        "stakeholders": [
+            {"name": f"Stakeholder {i}", "category": CATEGORIES[i % 3], "influence_level": rng.randint(1, 10),
+             "expectations": ["Transparency", "Emission cuts"]}
+            for i in range(records)
+        ],
+        "material_issues": [
+            {"name": f"Issue {i}", "description": "Synthetic issue", "category": CATEGORIES[i % 3],
+             "materiality_score": round(rng.uniform(0, 10), 2)}
+            for i in range(records)
+        ],
+        "metrics": [
+            {"name": f"Facility {i // 10} Metric {i % 10}", "unit": "tCO2e", "data_source": "Meters",
+             "category": CATEGORIES[i % 3], "current_value": round(rng.uniform(0, 1000), 3),
+             "target_value": round(rng.uniform(0, 1000), 3)}
+            for i in range(size)
+        ],
+        "initiatives": [
+            {"name": f"Initiative {i}", "description": "Synthetic initiative", "timeline": "2025-2027",
+             "responsible_team": "Sustainability", "resources_needed": ["Budget"],
+             "success_criteria": ["Target met"]}
+            for i in range(records)
+        ],
+    })
+
+
+def measure(fn, repeat: int) -> dict:
+    """Call ``fn`` ``repeat`` times and summarize the wall-clock seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+        plt.close("all")  # Tools leave figures open
+    return {"repeat": repeat, "min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times)}
+
+
+def save_figure(figure) -> None:
+    figure.savefig(io.BytesIO(), format="png")
+
+
+def benchmarks_for(organization: ESGOrganization, manager: ESGWorkflowManager, work_dir: Path) -> dict:
+    """Benchmark name to a zero-argument callable, for one organization."""
+    data = organization.model_dump(mode="json")
+    tools = manager.tools
+    stakeholder_input = {issue["name"]: issue["materiality_score"] for issue in data["material_issues"]}
+    issues = [{**issue, "importance_to_business": issue["materiality_score"]} for issue in data["material_issues"]]
+    json_path = str(work_dir / "organization.json")
+    validation = get_validation_engine()
+
+    def data_collection():
+        tools["data_collection"]._run("save", data=data, filepath=json_path)
+        tools["data_collection"]._run("load", filepath=json_path)
+
+    def repository_round_trip():
+        manager.repository.save(organization)
+        manager.repository.load(organization.name)
+
+    def charts():
+        save_figure(render_metrics_dashboard(organization.metrics))
+        save_figure(render_materiality_matrix(organization.material_issues))
+
+    return {
+        "tool.data_collection": data_collection,
+        "tool.stakeholder_analysis": lambda: tools["stakeholder_analysis"]._run(data["stakeholders"]),
+        "tool.materiality_assessment": lambda: tools["materiality_assessment"]._run(issues, stakeholder_input),
+        "tool.report_generation": lambda: tools["report_generation"]._run(data),
+        "tool.visualization": lambda: tools["visualization"]._run(data),
+        "organization.save_load": repository_round_trip,
+        "organization.model_validate": lambda: ESGOrganization.model_validate(data),
+        "organization.validation_engine": lambda: validation.validate_organization(data),
+        "reports.all_frameworks": lambda: render_reports(data, ("GRI", "SASB", "TCFD")),
+        "charts.render": charts,
+    }
+
+
+def full_run(config: ESGConfig, organization: ESGOrganization, latency: float) -> dict:
+    """Time one run_implementation against a fake LLM and count its LLM calls."""
+    model = FakeModel(latency)
+    manager = ESGWorkflowManager(config, llm=GeminiLLM(model))
+    manager.save_organization_data(organization)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.run_implementation(organization.name)
+    elapsed = time.perf_counter() - start
+    plt.close("all")
+    return {"repeat": 1, "min": elapsed, "median": elapsed, "mean": elapsed,
+            "llm_calls": model.calls, "llm_seconds": model.calls * latency}
+
+
+def environment() -> dict:
+    """Where the results were measured, so runs can be compared like for like."""
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "packages": packages,
+    }
+
+
+def run_suite(sizes, repeat: int, llm_latency: float, skip_run: bool = False) -> dict:
+    """Run every benchmark at every size; results are keyed ``"<benchmark>@<size>"``."""
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir)
+        os.chdir(work_dir)  # The visualization tool saves its figures to the working directory
+        try:
+            for size in sizes:
+                config = ESGConfig(data_path=str(work_dir / f"data_{size}"), output_path=str(work_dir / f"output_{size}"),
+                                   agents={"verbose": False})
+                organization = make_organization(size)
+                manager = ESGWorkflowManager(config, llm=GeminiLLM(FakeModel(0)))
+                for name, fn in benchmarks_for(organization, manager, work_dir).items():
+                    results[f"{name}@{size}"] = {"benchmark": name, "size": size, **measure(fn, repeat)}
+                    print(f"{name + '@' + str(size):<40} {results[f'{name}@{size}']['median'] * 1000:>10.2f} ms")
+                if not skip_run:
+                    run = full_run(config, organization, llm_latency)
+                    results[f"run_implementation@{size}"] = {"benchmark": "run_implementation", "size": size, **run}
+                    print(f"{'run_implementation@' + str(size):<40} {run['median'] * 1000:>10.2f} ms"
+                          f" ({run['llm_calls']} LLM calls)")
+        finally:
+            os.chdir(cwd)
+    return {
+        "environment": environment(),
+        "parameters": {"sizes": list(sizes), "repeat": repeat, "llm_latency": llm_latency},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Print median changes of benchmarks present in both results."""
+    print(f"\ncompared with {baseline['environment'].get('git_commit') or 'baseline'} "
+          f"from {baseline['environment'].get('timestamp')}:")
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None or not before["median"]:
+            continue
+        change = result["median"] / before["median"] - 1
+        print(f"{key:<40} {before['median'] * 1000:>10.2f} ms -> {result['median'] * 1000:>10.2f} ms ({change:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Metrics per organization")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--output", default=f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--skip-run", action="store_true", help="Leave out the full run_implementation")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeat, args.llm_latency, args.skip_run)
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nresults written to {args.output}")
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,14 @@
 from typing import Dict, List, Optional
 import google.generativeai as genai
 from crewai import Agent
+from crewai.llms.base_llm import BaseLLM
 from crewai.tools import BaseTool
 
 from .config import ESGConfig
 from .llm import GeminiLLM
 
-def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = None) -> List[Agent]:
-    """Creates and configures agents for ESG implementation."""
-    # Use default config if none provided
-    config = config or ESGConfig()
-    
+def _create_gemini_llm(config: ESGConfig) -> GeminiLLM:
+    """Gemini model configured from ``config.llm``."""
     # Configure the generation settings
     generation_config = {
         "temperature": config.llm.temperature,
@@ -32,9 +30,20 @@ def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = No
     )
     
     # Create our custom LLM instance
-    llm = GeminiLLM(model)
-    """Creates and configures agents for ESG implementation."""
-    
+    return GeminiLLM(model)
+
+def create_esg_crew(
+    tools: Dict[str, BaseTool], config: Optional[ESGConfig] = None, llm: Optional[BaseLLM] = None
+) -> List[Agent]:
+    """Creates and configures agents for ESG implementation.
+
+    The agents share ``llm``, which defaults to Gemini configured from ``config.llm``.
+    """
+    # Use default config if none provided
+    config = config or ESGConfig()
+    if llm is None:
+        llm = _create_gemini_llm(config)
+
     # Assessment Agent
     assessment_agent = Agent(
         role="ESG Assessment Specialist",
@@ -42,7 +51,7 @@ def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = No
         backstory="""You are an expert in ESG assessment with years of experience 
                     helping organizations understand their ESG baseline. You excel at 
                     stakeholder analysis, materiality assessment, and gap analysis.""",
-        verbose=True,
+        verbose=config.agents.verbose,
         llm=llm,
         tools=[tools["stakeholder_analysis"], tools["materiality_assessment"]],
         allow_delegation=True
@@ -56,7 +65,7 @@ def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = No
                     ESG assessments into actionable strategies. You know how to set 
                     effective goals, develop action plans, and integrate ESG into 
                     business processes.""",
-        verbose=True,
+        verbose=config.agents.verbose,
         llm=llm,
         allow_delegation=True
     )
@@ -68,7 +77,7 @@ def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = No
         backstory="""You are an experienced project manager specialized in ESG implementation. 
                     You know how to coordinate actions, engage stakeholders, and build 
                     capacity for sustainable change.""",
-        verbose=True,
+        verbose=config.agents.verbose,
         llm=llm,
         tools=[tools["data_collection"]],
         allow_delegation=True
@@ -81,7 +90,7 @@ def create_esg_crew(tools: Dict[str, BaseTool], config: Optional[ESGConfig] = No
         backstory="""You are an expert in ESG metrics, monitoring systems, and 
                     reporting frameworks. You ensure that organizations can 
                     effectively measure, report, and improve their ESG performance.""",
-        verbose=True,
+        verbose=config.agents.verbose,
         llm=llm,
         tools=[tools["report_generation"], tools["visualization"]],
         allow_delegation=True
@@ -0,0 +1,257 @@
+"""Append-only change log for ESG organizations."""
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set, Union
+from pydantic import BaseModel, Field, TypeAdapter
+
+from .lazy import FIELD_ADAPTERS
+from .models import ESGOrganization, IndexedList
+from .validation import SECTION_MODELS
+
+class Operation(BaseModel):
+    """A single change to an organization, as stored in its change log.
+
+    ``rev`` is the organization revision the change produces; replay skips
+    operations already reflected in a snapshot's revision, so replaying a
+    log that outlived a compaction is harmless.
+    """
+    op: Literal["upsert", "update", "remove", "append", "set"]
+    section: Optional[str] = None
+    name: Optional[str] = None
+    record: Optional[Dict[str, Any]] = None
+    changes: Dict[str, Any] = Field(default_factory=dict)
+    field: Optional[str] = None
+    value: Any = None
+    rev: int = 0
+    ts: Optional[str] = None
+
+def upsert(section: str, record: Union[BaseModel, Dict[str, Any]]) -> Operation:
+    """Insert a record into a section, or replace the one with the same name."""
+    if isinstance(record, BaseModel):
+        record = record.model_dump(mode="json")
+    return Operation(op="upsert", section=section, name=record.get("name"), record=record)
+
+def update(section: str, name: str, **changes: Any) -> Operation:
+    """Change fields of the named record in a section, e.g. ``update("metrics", "Scope 1", current_value=9)``."""
+    return Operation(op="update", section=section, name=name, changes=changes)
+
+def remove(section: str, name: str) -> Operation:
+    """Remove the named record from a section."""
+    return Operation(op="remove", section=section, name=name)
+
+def append(section: str, record: Dict[str, Any]) -> Operation:
+    """Append a record to a section without name matching (e.g. a stored report)."""
+    return Operation(op="append", section=section, record=record)
+
+def set_field(field: str, value: Any) -> Operation:
+    """Set a top-level organization field such as ``vision``."""
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    return Operation(op="set", field=field, value=value)
+
+def _position(records: List[Any], name: Optional[str]) -> Optional[int]:
+    if isinstance(records, IndexedList):
+        return records.position("name", name)
+    for i, record in enumerate(records):
+        if getattr(record, "name", None) == name:
+            return i
+    return None
+
+# Validators for each record field, so an update is checked without the record it changes
+_RECORD_FIELD_ADAPTERS: Dict[str, Dict[str, TypeAdapter]] = {
+    section: {name: TypeAdapter(field.annotation) for name, field in model.model_fields.items()}
+    for section, model in SECTION_MODELS.items()
+}
+
+def validate_operation(operation: Operation) -> None:
+    """Check an operation on its own, without reading the organization it applies to.
+
+    Catches everything ``apply_operation`` rejects except an update of a
+    record that does not exist, which only the stored state can tell.
+
+    Raises:
+        ValueError: If the operation names an unknown section or field, or a
+                    value fails validation
+    """
+    if operation.op == "set":
+        if operation.field not in FIELD_ADAPTERS:
+            raise ValueError(f"Unknown organization field: {operation.field}")
+        FIELD_ADAPTERS[operation.field].validate_python(operation.value)
+        return
+    if operation.op == "append":
+        if operation.section != "reports":
+            raise ValueError(f"Only reports can be appended, not {operation.section}")
+        FIELD_ADAPTERS["reports"].validate_python([operation.record])
+        return
+    if operation.section not in SECTION_MODELS:
+        raise ValueError(f"Unknown section: {operation.section}")
+    if operation.op == "upsert":
+        SECTION_MODELS[operation.section].model_validate(operation.record)
+    elif operation.op == "update":
+        adapters = _RECORD_FIELD_ADAPTERS[operation.section]
+        for field, value in operation.changes.items():
+            # Unknown fields are ignored, as model validation in apply_operation ignores them
+            if field in adapters:
+                adapters[field].validate_python(value)
+
+def apply_operation(organization: ESGOrganization, operation: Operation) -> None:
+    """Apply an operation to an organization in place."""
+    if operation.op == "set":
+        setattr(organization, operation.field, FIELD_ADAPTERS[operation.field].validate_python(operation.value))
+        return
+    records = getattr(organization, operation.section)
+    if operation.op == "append":
+        records.append(operation.record)
+        return
+    model = SECTION_MODELS[operation.section]
+    index = _position(records, operation.name)
+    if operation.op == "upsert":
+        record = model.model_validate(operation.record)
+        if index is None:
+            records.append(record)
+        else:
+            records[index] = record
+    elif operation.op == "update":
+        if index is None:
+            raise KeyError(f"No {operation.section} record named {operation.name}")
+        records[index] = model.model_validate({**records[index].model_dump(), **operation.changes})
+    elif operation.op == "remove" and index is not None:
+        del records[index]
+
+def diff(base: ESGOrganization, changed: ESGOrganization) -> List[Operation]:
+    """Operations that turn ``base`` into ``changed``.
+
+    Named records are compared by name: new or modified records become
+    upserts and missing ones removals. Reports appended after the base's
+    become appends; any other change to a top-level field is set whole.
+    Applied to a newer state than ``base``, the result merges the changes
+    at record granularity.
+    """
+    operations: List[Operation] = []
+    if changed.vision != base.vision:
+        operations.append(set_field("vision", changed.vision))
+    for section in ESGOrganization.indexed_sections:
+        before = {record.name: record for record in getattr(base, section)}
+        after = getattr(changed, section)
+        for record in after:
+            if before.get(record.name) != record:
+                operations.append(upsert(section, record))
+        names = {record.name for record in after}
+        operations.extend(remove(section, name) for name in before if name not in names)
+    if changed.reports[:len(base.reports)] == base.reports:
+        operations.extend(append("reports", report) for report in changed.reports[len(base.reports):])
+    else:
+        operations.append(set_field("reports", changed.reports))
+    return operations
+
+class ChangeLog:
+    """JSON Lines file of operations applied on top of an organization snapshot.
+
+    Appends write one line per operation and are fsynced by default, so an
+    update costs O(change) instead of a full-file rewrite. A line torn by a
+    crash mid-append is ignored on read and cut off before the next append.
+    """
+
+    def __init__(self, path: Union[str, Path], durable: bool = True):
+        self.path = Path(path)
+        self.durable = durable
+
+    def __iter__(self) -> Iterator[Operation]:
+        if not self.path.exists():
+            return
+        with self.path.open('rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn final write
+                yield Operation.model_validate_json(line)
+
+    def size(self) -> int:
+        """Log size in bytes."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def last_revision(self) -> Optional[int]:
+        """Revision of the last complete operation, without reading the whole log."""
+        size = self.size()
+        if not size:
+            return None
+        with self.path.open('rb') as f:
+            window = 4096
+            while True:
+                f.seek(max(size - window, 0))
+                tail = f.read()
+                lines = tail.split(b"\n")
+                # Drop the torn or empty remainder after the final newline, and a partial first line
+                complete = lines[1:-1] if size > window else lines[:-1]
+                if complete:
+                    return Operation.model_validate_json(complete[-1]).rev
+                if window >= size:
+                    return None
+                window *= 4
+
+    def _repair(self) -> None:
+        """Cut off a torn final line so the next append starts on a fresh line."""
+        size = self.size()
+        if not size:
+            return
+        with self.path.open('rb+') as f:
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+
+    def append(self, operations: Iterable[Operation], revision: int) -> int:
+        """Append operations, numbering them after ``revision``.
+
+        Returns:
+            int: The revision after the last appended operation
+        """
+        self._repair()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        lines = []
+        for operation in operations:
+            revision += 1
+            operation = operation.model_copy(update={"rev": revision, "ts": operation.ts or timestamp})
+            lines.append(operation.model_dump_json(exclude_defaults=True).encode("utf-8") + b"\n")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('ab') as f:
+            f.write(b"".join(lines))
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        return revision
+
+    def replay(self, organization: ESGOrganization, sections: Optional[Set[str]] = None) -> ESGOrganization:
+        """Apply logged operations newer than the organization's revision.
+
+        Args:
+            organization: Snapshot to apply the log to (modified in place)
+            sections: Only apply operations on these sections (for partial
+                      loads); top-level field changes always apply
+        """
+        complete = True
+        for operation in self:
+            if operation.rev <= organization.revision:
+                continue
+            if sections is not None and operation.section is not None and operation.section not in sections:
+                # Not applied, so from here on the revision must not claim later changes:
+                # a snapshot written from this organization would lose this one for good
+                complete = False
+                continue
+            try:
+                apply_operation(organization, operation)
+            except (KeyError, ValueError) as e:
+                # An invalid change must not make the organization unloadable; it
+                # can never apply, so it counts towards the revision all the same
+                logging.getLogger(__name__).warning(f"Skipping change {operation.rev} in {self.path}: {e}")
+            if complete:
+                organization.revision = operation.rev
+        return organization
+
+    def clear(self) -> None:
+        """Remove the log after its operations were folded into a snapshot."""
+        if self.path.exists():
+            self.path.unlink()
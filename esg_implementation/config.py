@@ -32,6 +32,35 @@ class LoggingConfig(BaseModel):
     level: str = "INFO"
     format: str = "%(asctime)s - %(levelname)s - %(message)s"
     date_format: str = "%Y-%m-%d %H:%M:%S"
+    buffer_size: int = 64 * 1024  # Characters of log file output buffered before a write
+    flush_interval: float = 1.0  # Maximum seconds log file output stays buffered
+    capture_stdout: bool = False  # Also copy output printed during a run to its log file
+    max_log_bytes: int = 50 * 1024 * 1024  # Size that rotates a run's log file (0 disables)
+    max_log_age: float = 0  # Seconds after which a run's log file rotates (0 disables)
+    compress_logs: bool = True  # Gzip closed log files in the background
+    retention_days: float = 30  # Delete closed log files older than this (0 keeps them)
+    retention_max_files: int = 10000  # Closed log files kept, newest first (0 for no limit)
+    events: bool = True  # Record a JSON Lines run-event log in output_path
+    events_max_bytes: int = 10 * 1024 * 1024  # Event log size that triggers rotation
+    events_backups: int = 5  # Rotated event logs kept
+    progress: bool = False  # Show a compact live view of runs and tasks on the console
+    trace: bool = False  # Write a Chrome trace of each run's spans to output_path
+    profile_cpu: bool = False  # Write a cProfile profile of each run to output_path
+    profile_memory: bool = False  # Write a tracemalloc snapshot of each run to output_path
+    profile_top: int = 30  # Functions and allocation sites listed in the profile summary
+
+class StorageConfig(BaseModel):
+    """Configuration for organization storage."""
+    backend: str = "file"  # file (one file per organization) or sqlite
+    sqlite_path: Optional[str] = None  # Defaults to <data_path>/esg.db
+    codec: str = "json"  # json or msgpack
+    compression: Optional[str] = None  # gzip, lzma or None
+
+class MetricsConfig(BaseModel):
+    """Configuration for the operational metrics endpoint."""
+    enabled: bool = False  # Serve Prometheus metrics at http://<host>:<port>/metrics
+    host: str = "127.0.0.1"
+    port: int = 9464
 
 class ESGConfig(BaseModel):
     """Main configuration for ESG Implementation."""
@@ -40,6 +69,8 @@ class ESGConfig(BaseModel):
     data_path: str = "examples"
     output_path: str = "output"
     logging: LoggingConfig = LoggingConfig()
+    storage: StorageConfig = StorageConfig()
+    metrics: MetricsConfig = MetricsConfig()
     
     @classmethod
     def load(cls, config_file: Optional[str] = None) -> "ESGConfig":
@@ -1,14 +1,22 @@
 """Core functionality for ESG Implementation."""
-import json
 import logging
 import os
-from typing import Dict, Any, Optional, List
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import ContextManager, Dict, Any, Iterable, Iterator, Optional, List
 from pathlib import Path
 from crewai import Crew, Process
+from crewai.llms.base_llm import BaseLLM
 import google.generativeai as genai
 
 from .config import ESGConfig
 from .models import ESGOrganization
+from . import changelog, events, metrics, serialization
+from .events import EventLog, run_events
+from .repository import OrganizationRepository, create_repository, organization_slug, require_complete
 from .tools import (
     DataCollectionTool,
     StakeholderAnalysisTool,
@@ -17,15 +25,33 @@ from .tools import (
     VisualizationTool
 )
 from .agents import create_esg_crew
+from .ingestion import IngestionStats, ingest_metrics
 from .logging import ESGLogger
+from .profiling import profile_run
+from .progress import ProgressView
+from .timeseries import TimeSeriesStore
+from .tracing import task_label, trace_run
 
 class ESGWorkflowManager:
     """Manages ESG implementation workflows."""
     
-    def __init__(self, config: Optional[ESGConfig] = None):
-        """Initialize the workflow manager."""
+    def __init__(self, config: Optional[ESGConfig] = None, llm: Optional[BaseLLM] = None):
+        """Initialize the workflow manager.
+
+        Args:
+            config: Configuration (defaults to ``ESGConfig()``)
+            llm: LLM for the agents; defaults to Gemini, which needs an API key
+        """
         self.config = config or ESGConfig()
-        self._setup_api_key()
+        self.llm = llm
+        self.repository: OrganizationRepository = create_repository(self.config)
+        self.event_log: Optional[EventLog] = None
+        self._event_log_lock = threading.Lock()
+        self.progress_view: Optional[ProgressView] = None
+        if self.config.metrics.enabled:
+            metrics.serve(self.config.metrics.host, self.config.metrics.port)
+        if llm is None:
+            self._setup_api_key()
         self._initialize_tools()
 
     def _setup_api_key(self) -> None:
@@ -45,6 +71,59 @@ class ESGWorkflowManager:
         for model in genai.list_models():
             print(f"- {model.name}")
 
+    @contextmanager
+    def _show_progress(self, detail: bool) -> Iterator[Optional[ProgressView]]:
+        """Live progress view of the runs started in the block, unless one is already showing."""
+        if not (self.config.logging.progress and self.progress_view is None):
+            yield None
+            return
+        with ProgressView(detail) as view:
+            self.progress_view = view
+            try:
+                yield view
+            finally:
+                self.progress_view = None
+
+    def _run_logging(self, run_id: str) -> ContextManager[Any]:
+        """Logging context for one run, with its own log file in the output directory."""
+        if not self.config.logging.enabled:
+            return nullcontext()
+        return ESGLogger(self.config, run_id)
+
+    def _run_events(self, organization_name: str, run_id: str) -> ContextManager[Any]:
+        """Event context for one run, recorded to the event log in the output directory (opened on first use).
+
+        Runs get an event context even with the log disabled, for listeners such as metrics.
+        """
+        settings = self.config.logging
+        if settings.enabled and settings.events:
+            with self._event_log_lock:
+                if self.event_log is None:
+                    self.event_log = EventLog(
+                        Path(self.config.output_path) / "esg_events.jsonl", settings.events_max_bytes, settings.events_backups
+                    )
+        return run_events(self.event_log, run_id, organization=organization_name)
+
+    def _trace_run(self, organization_name: str) -> ContextManager[Any]:
+        """Span tracing for one run, written to a Chrome trace file in the output directory."""
+        settings = self.config.logging
+        if not (settings.enabled and settings.trace):
+            return nullcontext()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = Path(self.config.output_path) / f"esg_trace_{organization_slug(organization_name)}_{timestamp}.json"
+        return trace_run(path, "run_implementation", organization=organization_name)
+
+    def _profile_run(self, organization_name: str) -> ContextManager[Any]:
+        """CPU and memory profiling for one run, written to the output directory."""
+        settings = self.config.logging
+        if not (settings.enabled and (settings.profile_cpu or settings.profile_memory)):
+            return nullcontext()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return profile_run(
+            self.config.output_path, f"esg_profile_{organization_slug(organization_name)}_{timestamp}",
+            cpu=settings.profile_cpu, memory=settings.profile_memory, top=settings.profile_top
+        )
+
     def _initialize_tools(self) -> None:
         """Initialize ESG implementation tools."""
         self.tools = {
@@ -55,37 +134,97 @@ class ESGWorkflowManager:
             "visualization": VisualizationTool()
         }
 
-    def load_or_create_organization(self, name: str, data_path: Optional[str] = None) -> ESGOrganization:
-        """Load an existing organization or create a new one."""
-        if data_path is None:
-            data_path = Path(self.config.data_path) / f"{name.lower().replace(' ', '_')}_esg_data.json"
+    def load_or_create_organization(
+        self,
+        name: str,
+        data_path: Optional[str] = None,
+        sections: Optional[List[str]] = None
+    ) -> ESGOrganization:
+        """Load an existing organization, or create a new one if none is stored.
 
-        try:
-            if data_path.exists() and data_path.stat().st_size > 0:
-                return ESGOrganization.load_from_json(str(data_path))
-        except (json.JSONDecodeError, IOError) as e:
-            self.logger.warning(f"Could not load organization data: {e}")
-        
-        return ESGOrganization(name=name)
+        Args:
+            name: Organization name
+            data_path: Explicit data file to load instead of the configured repository.
+                       Its format is detected from its contents.
+            sections: List sections to load (others are left empty); all if None
+
+        Raises:
+            ValueError: If stored data is corrupt or fails validation. It is
+                        never replaced by a new, empty organization.
+        """
+        if data_path is not None:
+            path = Path(data_path)
+            if path.exists() and path.stat().st_size > 0:
+                return serialization.load(path)
+            return ESGOrganization(name=name)
+        organization = self.repository.load(name, sections)
+        return organization if organization is not None else ESGOrganization(name=name)
 
-    def save_organization_data(self, organization: ESGOrganization, data_path: Optional[str] = None) -> Path:
-        """Save organization data to file."""
+    def save_organization_data(
+        self,
+        organization: ESGOrganization,
+        data_path: Optional[str] = None,
+        base: Optional[ESGOrganization] = None
+    ) -> Path:
+        """Save organization data to the configured repository, or to an explicit data file.
+
+        Args:
+            organization: Organization to save
+            data_path: Explicit data file to write instead of the configured repository
+            base: Copy of the organization as loaded. If given, changes made
+                  by other runs since then are merged instead of overwritten.
+        """
         if data_path is None:
-            # Ensure data path exists in config
-            if not hasattr(self.config, "data_path"):
-                self.config.data_path = "examples"  # Default to examples directory
-            
-            data_path = Path(self.config.data_path) / f"{organization.name.lower().replace(' ', '_')}_esg_data.json"
-        
-        # Ensure directory exists
-        data_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save data
-        with data_path.open('w') as f:
-            json_data = organization.model_dump_json(indent=2)
-            f.write(json_data)
-        
-        return data_path
+            if base is not None:
+                return self.repository.merge(organization, base)
+            return self.repository.save(organization)
+        require_complete(organization)
+        storage = self.config.storage
+        return serialization.save(organization, data_path, storage.codec, storage.compression)
+
+    def metric_history(self, name: str) -> TimeSeriesStore:
+        """Get the time-series store holding an organization's metric readings."""
+        return TimeSeriesStore.for_organization(self.config.data_path, name)
+
+    def record_changes(self, name: str, operations: List[changelog.Operation]) -> int:
+        """Apply small changes to a stored organization without rewriting it.
+
+        Args:
+            name: Organization name
+            operations: Changes built with the ``changelog`` helpers, e.g.
+                        ``changelog.update("metrics", "Water Use", current_value=5)``
+
+        Returns:
+            int: The organization's revision after the changes
+        """
+        return self.repository.apply(name, operations)
+
+    def ingest_metrics(self, name: str, feed_path: str, **kwargs: Any) -> IngestionStats:
+        """Stream a CSV or JSON Lines metric feed into an organization and record the changes.
+
+        Only the metrics section is loaded, and only the metrics the feed
+        touched are written, as change-log operations. Timestamped rows are
+        also appended to the organization's metric history.
+
+        Args:
+            name: Organization name
+            feed_path: Path to the metric feed
+            **kwargs: Passed through to ``ingestion.ingest_metrics``
+        """
+        organization = self.load_or_create_organization(name, sections=["metrics"])
+        kwargs.setdefault("history", self.metric_history(name))
+        changed: Dict[str, Any] = {}
+        callback = kwargs.pop("on_upsert", None)
+
+        def track(metric: Any) -> None:
+            changed[metric.name] = metric
+            if callback is not None:
+                callback(metric)
+
+        stats = ingest_metrics(organization, feed_path, on_upsert=track, **kwargs)
+        if changed:
+            self.record_changes(name, [changelog.upsert("metrics", metric) for metric in changed.values()])
+        return stats
 
     def create_workflow(self, organization: ESGOrganization) -> Crew:
         """Create an ESG implementation workflow."""
@@ -98,7 +237,7 @@ class ESGWorkflowManager:
         )
 
         # Create agents with tools and config
-        agents = create_esg_crew(self.tools, self.config)
+        agents = create_esg_crew(self.tools, self.config, self.llm)
 
         # Create all tasks
         assessment_tasks = create_assessment_tasks(agents[0])
@@ -115,22 +254,29 @@ class ESGWorkflowManager:
                 implementation_tasks +
                 monitoring_tasks
             ),
-            verbose=True,
+            verbose=self.config.agents.verbose,
             process=Process.sequential
         )
 
     def run_implementation(self, organization_name: str) -> Dict[str, Any]:
         """Run the complete ESG implementation process."""
-        # Load or create organization
-        organization = self.load_or_create_organization(organization_name)
+        run_id = uuid.uuid4().hex[:12]
+        with self._show_progress(detail=True), self._run_logging(run_id), \
+                self._run_events(organization_name, run_id), self._trace_run(organization_name), \
+                self._profile_run(organization_name):
+            logging.getLogger(__name__).info(f"Running ESG implementation for {organization_name} (run {run_id})")
+            # Load or create organization
+            organization = self.load_or_create_organization(organization_name)
+            base = organization.model_copy(deep=True)
 
-        # Create and run workflow
-        crew = self.create_workflow(organization)
-        result = crew.kickoff()
+            # Create and run workflow
+            crew = self.create_workflow(organization)
+            events.emit("plan", tasks=[task_label(task) for task in crew.tasks])
+            result = crew.kickoff()
 
-        # Save updated organization data
-        saved_path = self.save_organization_data(organization)
-        print(f"ESG implementation completed. Data saved to {saved_path}")
+            # Save updated organization data, merging with runs that saved meanwhile
+            saved_path = self.save_organization_data(organization, base=base)
+            print(f"ESG implementation completed. Data saved to {saved_path}")
 
         return result
 
@@ -145,7 +291,7 @@ class ESGWorkflowManager:
         )
 
         # Create agents with tools and config
-        agents = create_esg_crew(self.tools, self.config)
+        agents = create_esg_crew(self.tools, self.config, self.llm)
 
         # Create all tasks
         assessment_tasks = create_assessment_tasks(agents[0])
@@ -162,21 +308,59 @@ class ESGWorkflowManager:
                 implementation_tasks +
                 monitoring_tasks
             ),
-            verbose=True,
+            verbose=self.config.agents.verbose,
             process=Process.sequential
         )
 
     def run_implementation(self, organization_name: str) -> Dict[str, Any]:
         """Run the complete ESG implementation process."""
-        # Load or create organization
-        organization = self.load_or_create_organization(organization_name)
+        run_id = uuid.uuid4().hex[:12]
+        with self._show_progress(detail=True), self._run_logging(run_id), \
+                self._run_events(organization_name, run_id), self._trace_run(organization_name), \
+                self._profile_run(organization_name):
+            logging.getLogger(__name__).info(f"Running ESG implementation for {organization_name} (run {run_id})")
+            # Load or create organization
+            organization = self.load_or_create_organization(organization_name)
+            base = organization.model_copy(deep=True)
 
-        # Create and run workflow
-        crew = self.create_workflow(organization)
-        result = crew.kickoff()
+            # Create and run workflow
+            crew = self.create_workflow(organization)
+            events.emit("plan", tasks=[task_label(task) for task in crew.tasks])
+            result = crew.kickoff()
 
-        # Save updated organization data
-        saved_path = self.save_organization_data(organization)
-        print(f"ESG implementation completed. Data saved to {saved_path}")
+            # Save updated organization data, merging with runs that saved meanwhile
+            saved_path = self.save_organization_data(organization, base=base)
+            print(f"ESG implementation completed. Data saved to {saved_path}")
 
         return result
+
+    def run_batch(
+        self, organization_names: Iterable[str], max_workers: Optional[int] = None, return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """Run the implementation process for several organizations concurrently.
+
+        Each run executes in its own worker thread with its own log file, event
+        run ID and trace. Results are keyed by organization name. If a run fails,
+        its exception is raised once every run has finished, or, with
+        ``return_exceptions``, returned in place of its result.
+        """
+        names = list(dict.fromkeys(organization_names))
+
+        def run(name: str) -> Any:
+            metrics.BATCH_QUEUE_DEPTH.dec()
+            return self.run_implementation(name)
+
+        with self._show_progress(detail=False) as view, \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="esg-run") as executor:
+            for name in names:
+                if view is not None:
+                    view.expect(name)
+            metrics.BATCH_QUEUE_DEPTH.inc(len(names))
+            futures = {name: executor.submit(run, name) for name in names}
+        results: Dict[str, Any] = {}
+        for name, future in futures.items():
+            error = future.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results[name] = error if error is not None else future.result()
+        return results
@@ -0,0 +1,203 @@
+"""Structured JSON Lines event log of workflow runs."""
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from . import tracing
+from .tracing import task_label
+
+class EventLog:
+    """Append-only JSON Lines file with size-based rotation.
+
+    Each event is one compact JSON object written with a single append, e.g.
+    ``{"ts":1718000000.123,"run":"5f2c...","ev":"tool","name":"visualization_tool","dur":0.412}``.
+    When the file would exceed ``max_bytes`` it is renamed to ``<name>.1``
+    (older files shift up to ``<name>.<backups>``) and a new file is started,
+    as with ``logging.handlers.RotatingFileHandler``.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 10 * 1024 * 1024, backups: int = 5):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open('ab')
+
+    def write(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(line) > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = self.path.open('ab')
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+# Called with every event of every run, e.g. to update metrics; a listener
+# that raises is reported and skipped, never failing the run it observes.
+# Copy-on-write: changes replace the tuple under the lock, so emitters iterate
+# a snapshot without locking and never see a listener list mid-change.
+_listeners: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+_listeners_lock = threading.Lock()
+
+def add_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    """Receive every event emitted by any run, in the emitting thread."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+def remove_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    global _listeners
+    with _listeners_lock:
+        listeners = list(_listeners)
+        listeners.remove(listener)
+        _listeners = tuple(listeners)
+
+class RunEvents:
+    """Event context of one workflow run: its log, run ID and open task timers."""
+
+    def __init__(self, log: Optional[EventLog], run_id: Optional[str] = None):
+        self.log = log
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.task_starts: Dict[int, float] = {}
+
+    def emit(self, event: str, **fields: Any) -> None:
+        record = {"ts": round(time.time(), 3), "run": self.run_id, "ev": event, **fields}
+        if self.log is not None:
+            self.log.write(record)
+        for listener in _listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                sys.__stderr__.write(f"Event listener {getattr(listener, '__qualname__', listener)} failed on {event}: {e}\n")
+
+_current: ContextVar[Optional[RunEvents]] = ContextVar("esg_run_events", default=None)
+
+def current_run() -> Optional[RunEvents]:
+    """Event context of the run executing in the current thread or task, if any."""
+    return _current.get()
+
+def emit(event: str, **fields: Any) -> None:
+    """Record an event for the current run; does nothing outside a run."""
+    run = _current.get()
+    if run is not None:
+        run.emit(event, **fields)
+
+def args_hash(args: Tuple[Any, ...] = (), kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """Short stable hash of call arguments, so identical invocations can be grouped without logging data."""
+    payload = json.dumps([args, kwargs or {}], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+@contextmanager
+def timed(event: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """Emit one event with the duration of the block and, if it raised, the error.
+
+    Yields the event's fields, so the block can add results such as token counts.
+    """
+    if _current.get() is None:
+        yield fields
+        return
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        emit(event, dur=round(time.perf_counter() - start, 4), **fields)
+
+def instrument_tool(run: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorate a tool's ``_run`` to emit a ``tool`` event and trace a span per invocation."""
+    @functools.wraps(run)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if _current.get() is None and tracing.current_tracer() is None:
+            return run(self, *args, **kwargs)
+        with tracing.span(self.name, "tool"), timed("tool", name=self.name, args=args_hash(args, kwargs)):
+            return run(self, *args, **kwargs)
+    return wrapper
+
+def _agent_role(task: Any) -> Optional[str]:
+    return getattr(getattr(task, "agent", None), "role", None)
+
+def on_task_started(source: Any, event: Any) -> None:
+    """crewai ``TaskStartedEvent`` handler: start the task's timer and emit ``task_start``."""
+    run = _current.get()
+    if run is not None:
+        run.task_starts[id(event.task)] = time.perf_counter()
+        run.emit("task_start", name=task_label(event.task), agent=_agent_role(event.task))
+
+def on_task_finished(source: Any, event: Any) -> None:
+    """crewai ``TaskCompletedEvent``/``TaskFailedEvent`` handler: emit ``task_end`` with the duration."""
+    run = _current.get()
+    if run is None:
+        return
+    start = run.task_starts.pop(id(event.task), None)
+    fields: Dict[str, Any] = {"dur": None if start is None else round(time.perf_counter() - start, 4)}
+    if getattr(event, "error", None):
+        fields["error"] = event.error
+    run.emit("task_end", name=task_label(event.task), agent=_agent_role(event.task), **fields)
+
+_handlers_registered = False
+
+def _register_crew_handlers() -> None:
+    """Subscribe to crewai's task events once per process."""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+
+    crewai_event_bus.on(TaskStartedEvent)(on_task_started)
+    crewai_event_bus.on(TaskCompletedEvent)(on_task_finished)
+    crewai_event_bus.on(TaskFailedEvent)(on_task_finished)
+    _handlers_registered = True
+
+@contextmanager
+def run_events(log: Optional[EventLog], run_id: Optional[str] = None, **fields: Any) -> Iterator[RunEvents]:
+    """Record a run's events to ``log`` (if any) and the listeners for the duration of the block.
+
+    Emits ``run_start`` and ``run_end`` (with duration and status), plus an
+    ``error`` event if the block raises. The run is bound to the current
+    context, so concurrent runs in other threads or tasks log separately.
+    """
+    _register_crew_handlers()
+    run = RunEvents(log, run_id)
+    token = _current.set(run)
+    start = time.perf_counter()
+    run.emit("run_start", **fields)
+    status = "ok"
+    try:
+        yield run
+    except BaseException as e:
+        status = "error"
+        run.emit("error", error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        run.emit("run_end", dur=round(time.perf_counter() - start, 4), status=status)
+        _current.reset(token)
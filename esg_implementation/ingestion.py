@@ -0,0 +1,220 @@
+"""Streaming bulk ingestion of ESG metric feeds."""
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from .models import ESGMetric, ESGOrganization
+from .timeseries import TimeSeriesStore, to_epoch_seconds
+from .validation import get_validation_engine
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+FEED_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+class IngestionStats(BaseModel):
+    """Summary of a bulk ingestion run."""
+    rows: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    inserted: int = 0
+    updated: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    process_peak_memory_kb: Optional[int] = None  # High-water mark of the whole process, not this run
+    history_points: int = 0
+    history_dropped: int = 0
+    rejects: List[Dict[str, Any]] = Field(default_factory=list)
+
+def peak_memory_kb() -> Optional[int]:
+    """Process memory high-water mark in KiB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def detect_format(filepath: str) -> str:
+    """Detect the feed format from the file extension (``.gz`` is looked through)."""
+    suffixes = [s.lower() for s in Path(filepath).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    if not suffixes or suffixes[-1] not in FEED_FORMATS:
+        raise ValueError(f"Cannot detect feed format of {filepath}; expected .csv, .jsonl or .ndjson")
+    return FEED_FORMATS[suffixes[-1]]
+
+def _open_text(filepath: str) -> io.TextIOBase:
+    if filepath.lower().endswith(".gz"):
+        return gzip.open(filepath, "rt", encoding="utf-8", newline="")
+    return open(filepath, "r", encoding="utf-8", newline="")
+
+def iter_records(filepath: str, feed_format: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """Stream ``(line_number, record)`` pairs from a CSV or JSON Lines feed.
+
+    Records that cannot be parsed are yielded as exceptions so that the
+    caller can count them as rejects without stopping the stream.
+    """
+    feed_format = feed_format or detect_format(filepath)
+    with _open_text(filepath) as f:
+        if feed_format == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                # Empty cells mean "not reported", not an empty string value
+                yield reader.line_num, {k: v for k, v in record.items() if v != "" and k is not None}
+        elif feed_format == "jsonl":
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, e
+        else:
+            raise ValueError(f"Unsupported feed format: {feed_format}")
+
+def validate_chunk(records: List[Any]) -> Tuple[List[Tuple[int, ESGMetric]], Dict[int, List[str]]]:
+    """Validate a chunk of raw records with the shared validation engine.
+
+    Returns:
+        Tuple of ``(position, metric)`` pairs for valid records and a mapping
+        of chunk position to error messages for invalid ones
+    """
+    errors: Dict[int, List[str]] = {}
+    for position, record in enumerate(records):
+        if isinstance(record, Exception):
+            errors[position] = [f"parse error: {record}"]
+        elif not isinstance(record, dict):
+            errors[position] = ["record is not an object"]
+    candidates = [i for i in range(len(records)) if i not in errors] if errors else list(range(len(records)))
+    valid, issues = get_validation_engine().parse_records("metrics", [records[i] for i in candidates])
+    for issue in issues:
+        message = f"{issue.field}: {issue.message}" if issue.field else issue.message
+        errors.setdefault(candidates[issue.index], []).append(message)
+    return [(candidates[index], metric) for index, metric in valid], errors
+
+def record_history(
+    history: TimeSeriesStore,
+    readings: List[Tuple[str, Any, Optional[float]]]
+) -> Tuple[int, int]:
+    """Append ``(metric name, timestamp, value)`` readings to a time-series store.
+
+    Readings with unparseable timestamps or no value are dropped, as are
+    readings older than the metric's stored history.
+
+    Returns:
+        Tuple[int, int]: Readings appended and readings dropped
+    """
+    total = len(readings)
+    readings = [reading for reading in readings if reading[2] is not None]
+    dropped = total - len(readings)
+    try:
+        stamps = to_epoch_seconds([timestamp for _, timestamp, _ in readings])
+    except (TypeError, ValueError):
+        # Fall back to converting one by one so a single bad timestamp only drops its row
+        parsed = []
+        for reading in readings:
+            try:
+                parsed.append((reading, to_epoch_seconds(reading[1])[0]))
+            except (TypeError, ValueError):
+                dropped += 1
+        readings = [reading for reading, _ in parsed]
+        stamps = [stamp for _, stamp in parsed]
+    appended, out_of_order = history.append_batch(
+        [name for name, _, _ in readings], stamps, [value for _, _, value in readings]
+    )
+    return appended, dropped + out_of_order
+
+def ingest_metrics(
+    organization: ESGOrganization,
+    filepath: str,
+    feed_format: Optional[str] = None,
+    chunk_size: int = 5000,
+    max_rejects: int = 100,
+    history: Optional[TimeSeriesStore] = None,
+    on_upsert: Optional[Callable[[ESGMetric], None]] = None
+) -> IngestionStats:
+    """Stream a metric feed into an organization, upserting by metric name.
+
+    The feed is read and validated in chunks of ``chunk_size`` records, so
+    memory use is bounded by the chunk size and the number of distinct
+    metric names, not by the size of the feed.
+
+    Args:
+        organization: Organization to upsert metrics into
+        filepath: CSV or JSON Lines feed (optionally gzip-compressed)
+        feed_format: 'csv' or 'jsonl'. Detected from the extension if None.
+        chunk_size: Number of records validated per batch
+        max_rejects: Maximum number of rejected rows kept in the stats
+        history: Time-series store that accepted rows carrying a ``timestamp``
+                 are also appended to, preserving the readings the upsert
+                 overwrites
+        on_upsert: Called with each accepted metric after it is upserted
+
+    Returns:
+        IngestionStats: Row counts, throughput, the process memory
+        high-water mark and a sample of rejected rows
+    """
+    stats = IngestionStats()
+    # Plain counters on the hot path; pydantic attribute assignment is comparatively slow
+    counts = {"accepted": 0, "rejected": 0, "inserted": 0, "updated": 0, "history_points": 0, "history_dropped": 0}
+    metrics = organization.metrics
+    position_of = metrics.position
+    start = time.perf_counter()
+
+    def flush(line_numbers: List[int], records: List[Any]) -> None:
+        valid, errors = validate_chunk(records)
+        inserted = 0
+        for position, metric in valid:
+            index = position_of("name", metric.name)
+            if index is None:
+                metrics.append(metric)
+                inserted += 1
+            else:
+                metrics[index] = metric
+            if on_upsert is not None:
+                on_upsert(metric)
+        counts["inserted"] += inserted
+        counts["updated"] += len(valid) - inserted
+        counts["accepted"] += len(valid)
+        counts["rejected"] += len(errors)
+        if history is not None:
+            readings = [
+                (metric.name, records[position]["timestamp"], metric.current_value)
+                for position, metric in valid if "timestamp" in records[position]
+            ]
+            if readings:
+                appended, dropped = record_history(history, readings)
+                counts["history_points"] += appended
+                counts["history_dropped"] += dropped
+        for position in sorted(errors):
+            if len(stats.rejects) >= max_rejects:
+                break
+            stats.rejects.append({"line": line_numbers[position], "errors": errors[position]})
+
+    line_numbers: List[int] = []
+    records: List[Any] = []
+    for line_number, record in iter_records(filepath, feed_format):
+        line_numbers.append(line_number)
+        records.append(record)
+        if len(records) >= chunk_size:
+            flush(line_numbers, records)
+            line_numbers, records = [], []
+    if records:
+        flush(line_numbers, records)
+
+    stats.accepted, stats.rejected = counts["accepted"], counts["rejected"]
+    stats.inserted, stats.updated = counts["inserted"], counts["updated"]
+    stats.history_points, stats.history_dropped = counts["history_points"], counts["history_dropped"]
+    stats.rows = stats.accepted + stats.rejected
+    stats.elapsed_seconds = time.perf_counter() - start
+    stats.rows_per_second = stats.rows / stats.elapsed_seconds if stats.elapsed_seconds else 0.0
+    stats.process_peak_memory_kb = peak_memory_kb()
+    return stats
@@ -0,0 +1,230 @@
+"""Lazy, section-level loading of organization files."""
+import json
+import mmap
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from pydantic import TypeAdapter
+
+from . import metrics, serialization
+from .metric_table import MetricTable
+from .models import SCHEMA_VERSION, ESGOrganization
+
+# Bytes scanned per step; bounds the scanner's temporary arrays
+SCAN_BLOCK_SIZE = 1024 * 1024
+# Bytes classified per vectorized pass; small enough to stay in CPU cache
+_MASK_SLICE_SIZE = 64 * 1024
+
+_QUOTE, _BACKSLASH, _COLON, _COMMA = ord('"'), ord('\\'), ord(':'), ord(',')
+_DEPTH_DELTA = np.zeros(256, dtype=np.int64)
+_DEPTH_DELTA[list(b'{[')] = 1
+_DEPTH_DELTA[list(b'}]')] = -1
+
+def _event_mask(block: np.ndarray) -> np.ndarray:
+    """Mark quotes, braces, brackets, colons and commas in a block of bytes."""
+    mask = np.empty(len(block), dtype=bool)
+    for start in range(0, len(block), _MASK_SLICE_SIZE):
+        chunk = block[start:start + _MASK_SLICE_SIZE]
+        # Clearing bit 5 maps '{' and '}' onto '[' and ']'
+        folded = chunk & 0xDF
+        mask[start:start + _MASK_SLICE_SIZE] = (
+            (chunk == _QUOTE) | (chunk == _COLON) | (chunk == _COMMA) | (folded == ord('[')) | (folded == ord(']'))
+        )
+    return mask
+
+def _top_level_delimiters(data: np.ndarray) -> List[Tuple[int, int]]:
+    """Positions and bytes of the root object's braces and its member colons and commas.
+
+    The scan is vectorized: each block is reduced to the positions of
+    structurally relevant bytes, string state is tracked by the parity of
+    unescaped quotes, and nesting depth by a cumulative sum, so no Python
+    code runs per byte or per token.
+    """
+    delimiters: List[Tuple[int, int]] = []
+    in_string, depth = 0, 0
+    for start in range(0, len(data), SCAN_BLOCK_SIZE):
+        block = data[start:start + SCAN_BLOCK_SIZE]
+        positions = np.flatnonzero(_event_mask(block))
+        if not len(positions):
+            continue
+        chars = block[positions]
+        positions += start
+        quotes = chars == _QUOTE
+        # A quote is escaped when preceded by an odd run of backslashes; such runs are rare
+        maybe_escaped = np.flatnonzero(quotes & (data[np.maximum(positions - 1, 0)] == _BACKSLASH) & (positions > 0))
+        for event in maybe_escaped:
+            run, cursor = 0, positions[event] - 1
+            while cursor >= 0 and data[cursor] == _BACKSLASH:
+                run, cursor = run + 1, cursor - 1
+            if run % 2:
+                quotes[event] = False
+        toggles = np.cumsum(quotes) + in_string
+        outside = (toggles % 2 == 0) & (chars != _QUOTE)
+        in_string = int(toggles[-1] % 2)
+
+        structural = positions[outside]
+        structural_chars = chars[outside]
+        if not len(structural):
+            continue
+        delta = _DEPTH_DELTA[structural_chars]
+        depth_after = np.cumsum(delta) + depth
+        depth_before = depth_after - delta
+        depth = int(depth_after[-1])
+        top = ((depth_before == 0) & (delta == 1)) | ((depth_before == 1) & (
+            (delta == -1) | (structural_chars == _COLON) | (structural_chars == _COMMA)
+        ))
+        delimiters.extend(zip(structural[top].tolist(), structural_chars[top].tolist()))
+    return delimiters
+
+def index_json_object(buffer: Any) -> Dict[str, Tuple[int, int]]:
+    """Map each top-level key of a JSON object to the byte range of its value.
+
+    Args:
+        buffer: Bytes-like object (e.g. an mmap) holding a JSON object
+
+    Returns:
+        Dict of key to ``(start, end)`` offsets of the raw value
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    delimiters = _top_level_delimiters(data)
+    if len(delimiters) < 2 or delimiters[0][1] != ord('{') or delimiters[-1][1] != ord('}'):
+        raise ValueError("Data is not a JSON object")
+    index: Dict[str, Tuple[int, int]] = {}
+    previous = delimiters[0][0]
+    for i in range(1, len(delimiters) - 1, 2):
+        colon, _ = delimiters[i]
+        end, _ = delimiters[i + 1]
+        index[json.loads(bytes(buffer[previous + 1:colon]))] = (colon + 1, end)
+        previous = end
+    return index
+
+# Scalar fields, always included in partial loads
+HEAD_FIELDS = ("name", "vision", "revision")
+
+# Offset indexes of recently opened files, keyed by (path, mtime, size)
+_INDEX_CACHE: Dict[Tuple[str, int, int], Dict[str, Tuple[int, int]]] = {}
+INDEX_CACHE_SIZE = 32
+# Guards the cache's reordering and eviction; files are indexed outside it
+_index_cache_lock = threading.Lock()
+
+def _cached_index(path: Path, buffer: Any) -> Dict[str, Tuple[int, int]]:
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _index_cache_lock:
+        index = _INDEX_CACHE.pop(key, None)
+        if index is not None:
+            _INDEX_CACHE[key] = index  # Most recently used last
+    metrics.cache_lookup("lazy_index", index is not None)
+    if index is not None:
+        return index
+    index = index_json_object(buffer)
+    with _index_cache_lock:
+        _INDEX_CACHE[key] = index
+        while len(_INDEX_CACHE) > INDEX_CACHE_SIZE:
+            del _INDEX_CACHE[next(iter(_INDEX_CACHE))]
+    return index
+
+# Validators for each field, so a section is parsed straight from its bytes
+FIELD_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(field.annotation) for name, field in ESGOrganization.model_fields.items()
+}
+
+class LazyOrganization:
+    """Read-only view of an organization file that parses sections on first access.
+
+    Opening the view memory-maps the file and indexes the byte range of each
+    top-level field (indexes are cached while the file is unchanged); reading
+    ``view.metrics`` then validates only that range.
+    Fields absent from the file take their model defaults. Compressed and
+    binary files have no byte ranges to index, and files in another schema
+    version must be migrated whole, so these are decoded in full on open.
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.path = Path(filepath)
+        self._values: Dict[str, Any] = {}
+        self._file = self.path.open('rb')
+        self._buffer: Optional[mmap.mmap] = None
+        head = self._file.read(8)
+        self._file.seek(0)
+        if serialization.detect_codec(head).name == "json" and not any(
+            head.startswith(c.magic) for c in serialization.COMPRESSIONS.values()
+        ):
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = _cached_index(self.path, self._buffer)
+            if self._schema_version() != SCHEMA_VERSION:
+                # Sections of another layout need migrating (or rejecting) as a whole
+                self._buffer.close()
+                self._buffer = None
+                self._file.seek(0)
+        if self._buffer is None:
+            organization = serialization.loads(self._file.read())
+            self._values = {name: getattr(organization, name) for name in ESGOrganization.model_fields}
+            self._index = {}
+            self.close()
+
+    def _schema_version(self) -> int:
+        if "schema_version" not in self._index:
+            return 0  # Predates versioning
+        start, end = self._index["schema_version"]
+        return int(json.loads(bytes(self._buffer[start:end])))
+
+    def __enter__(self) -> "LazyOrganization":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the file mapping. Sections already loaded stay available."""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        self._file.close()
+
+    @property
+    def loaded_sections(self) -> List[str]:
+        """Fields parsed so far."""
+        return list(self._values)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in ESGOrganization.model_fields:
+            raise AttributeError(name)
+        if name not in self._values:
+            self._values[name] = self._parse(name)
+        return self._values[name]
+
+    def _parse(self, name: str) -> Any:
+        if name not in self._index:
+            field = ESGOrganization.model_fields[name]
+            if field.is_required():
+                raise ValueError(f"Organization file {self.path} has no {name}")
+            return field.get_default(call_default_factory=True)
+        if self._buffer is None:
+            raise ValueError(f"Section {name} was not loaded before the view was closed")
+        start, end = self._index[name]
+        return FIELD_ADAPTERS[name].validate_json(self._buffer[start:end])
+
+    def metric_table(self) -> MetricTable:
+        """The metrics section as a ``MetricTable``, built without per-metric models."""
+        if "metrics" in self._values or self._buffer is None or "metrics" not in self._index:
+            return MetricTable.from_records(getattr(self, "metrics"))
+        start, end = self._index["metrics"]
+        return MetricTable.from_json(self._buffer[start:end])
+
+    def to_organization(self, sections: Optional[List[str]] = None) -> ESGOrganization:
+        """Build a model from the view.
+
+        Args:
+            sections: Fields to include; the others keep their defaults. All if None.
+                      A partial organization is marked as such (see
+                      ``ESGOrganization.loaded_sections``), so it cannot be
+                      saved over the complete one.
+        """
+        names = list(ESGOrganization.model_fields) if sections is None else [*HEAD_FIELDS, *sections]
+        # Each field was validated on its own when parsed
+        organization = ESGOrganization.model_construct(**{name: getattr(self, name) for name in dict.fromkeys(names)})
+        if sections is not None:
+            organization.mark_partial(sections)
+        return organization
@@ -3,6 +3,8 @@ import google.generativeai as genai
 from crewai.llms.base_llm import BaseLLM
 from typing import Optional, Any, Dict, List
 
+from . import events, tracing
+
 class GeminiLLM(BaseLLM):
     """Custom LLM implementation using Google Generative AI directly."""
     
@@ -59,10 +61,15 @@ class GeminiLLM(BaseLLM):
                 generation_config['stop_sequences'] = stop
 
             # Generate content with the processed prompt
-            response = self.gemini_model.generate_content(
-                formatted_prompt,
-                generation_config=generation_config
-            )
+            with tracing.span(self.model, "llm") as trace, events.timed("llm", model=self.model) as event:
+                response = self.gemini_model.generate_content(
+                    formatted_prompt,
+                    generation_config=generation_config
+                )
+                usage = getattr(response, "usage_metadata", None)
+                if usage is not None:
+                    event["in_tokens"] = trace["in_tokens"] = usage.prompt_token_count
+                    event["out_tokens"] = trace["out_tokens"] = usage.candidates_token_count
             
             if not response.text:
                 error_msg = "Empty response from Gemini API"
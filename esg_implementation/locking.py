@@ -0,0 +1,27 @@
+"""Advisory file locks shared by the storage and logging layers."""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where file saves are not locked
+    fcntl = None
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a lock file for the duration of the block.
+
+    Locks are per open file, so they exclude other threads as well as other
+    processes; they are not reentrant.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
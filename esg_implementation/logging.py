@@ -1,68 +1,343 @@
 """Logging utilities for ESG Implementation."""
+import atexit
+import os
+import queue
 import sys
 import logging
+import logging.handlers
+import threading
+import time
+import uuid
+from contextvars import ContextVar, Token
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import Any, Callable, List, Optional, TextIO, Union
 from .config import ESGConfig
+from .retention import LogIndex, LogMaintenance
 
-class TeeLogger:
-    """Logger that writes to both file and console."""
-    
-    def __init__(self, filename: Path):
-        self.console = sys.stdout
+class BufferedFileWriter:
+    """Append-only text file written in batches by a background thread.
+
+    ``write`` only appends the message to an in-memory batch. Once
+    ``buffer_size`` characters are pending, or ``flush_interval`` seconds
+    pass without a full batch, the batch is handed to a writer thread
+    through a queue, so a burst of small writes costs a few large system
+    calls instead of one write and flush each. ``flush`` blocks until
+    everything written before it has reached the file. Pending output is
+    written on ``close``, which also runs at interpreter exit, including
+    exit after an unhandled exception; only a hard kill loses up to
+    ``flush_interval`` seconds of output.
+
+    With ``max_bytes`` or ``max_age`` (seconds) set, the writer thread
+    rotates the file before a batch would take it past either limit: the
+    file is renamed to ``<stem>.<n><suffix>`` (numbered in write order), a
+    new one is started and ``on_rotate`` is called with the renamed path.
+    """
+
+    _CLOSE = object()
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        max_bytes: int = 0,
+        max_age: float = 0,
+        on_rotate: Optional[Callable[[Path], None]] = None,
+    ):
+        self.path = Path(filename)
         self.file = open(filename, 'a', encoding='utf-8')
-        
-    def write(self, message):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.on_rotate = on_rotate
+        self._opened = time.monotonic()
+        self._segments = 0
+        self.closed = False
+        self._pending: List[str] = []
+        self._size = 0
+        # Batches are queued while holding the lock, which keeps them in write order
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="esg-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, message: str) -> int:
+        with self._lock:
+            if self.closed:
+                raise ValueError("I/O operation on closed writer")
+            self._pending.append(message)
+            self._size += len(message)
+            if self._size >= self.buffer_size:
+                self._hand_off()
+        return len(message)
+
+    def _hand_off(self, request: object = None) -> None:
+        # Called with the lock held
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending, self._size = [], 0
+        if request is not None:
+            self._queue.put(request)
+
+    def flush(self) -> None:
+        """Write everything written so far to the file and wait for it."""
+        done = threading.Event()
+        with self._lock:
+            if self.closed:
+                return
+            self._hand_off(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Write pending output, stop the writer thread and close the file."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._hand_off(self._CLOSE)
+        atexit.unregister(self.close)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                with self._lock:
+                    self._hand_off()
+                continue
+            if isinstance(item, list):
+                try:
+                    data = "".join(item)
+                    if self._due_for_rotation(len(data)):
+                        self._rotate()
+                    self.file.write(data)
+                    self.file.flush()
+                except (OSError, ValueError) as e:
+                    # Keep serving flush and close requests so callers never hang
+                    sys.__stderr__.write(f"Log writer dropped {len(item)} messages: {e}\n")
+            elif isinstance(item, threading.Event):
+                item.set()
+            elif item is self._CLOSE:
+                self.file.close()
+                return
+
+    def _due_for_rotation(self, size: int) -> bool:
+        position = self.file.tell()
+        if not position:
+            return False
+        return bool(
+            (self.max_bytes and position + size > self.max_bytes)
+            or (self.max_age and time.monotonic() - self._opened >= self.max_age)
+        )
+
+    def _rotate(self) -> None:
+        self.file.close()
+        rotated = self.path.with_name(f"{self.path.stem}.{self._segments + 1}{self.path.suffix}")
+        try:
+            os.replace(self.path, rotated)
+        finally:
+            # Keep writing to the same file if the rename failed
+            self.file = open(self.path, 'a', encoding='utf-8')
+            self._opened = time.monotonic()
+        self._segments += 1
+        if self.on_rotate is not None:
+            try:
+                self.on_rotate(rotated)
+            except Exception as e:
+                sys.__stderr__.write(f"Log rotation callback failed for {rotated}: {e}\n")
+
+class ContextStdout:
+    """``sys.stdout`` replacement that copies output printed during a run to that run's log file.
+
+    Writes always reach the console. Only writes from a thread or async task
+    bound to an ``ESGLogger`` with ``capture_stdout`` set are also copied to a
+    log file, so concurrent runs never see each other's output.
+    """
+
+    def __init__(self, console: TextIO):
+        self.console = console
+
+    def write(self, message: str) -> int:
         self.console.write(message)
-        self.file.write(message)
-        self.file.flush()
-        
-    def flush(self):
+        run = _current.get()
+        if run is not None and run.capture_stdout and not run.closed:
+            try:
+                run.writer.write(message)
+            except ValueError:
+                pass  # The run ended concurrently
+        return len(message)
+
+    def flush(self) -> None:
         self.console.flush()
-        self.file.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.console, name)
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stdout`` is when each record is handled."""
+
+    def __init__(self) -> None:
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self) -> TextIO:
+        return sys.stdout
+
+class _RunDispatchHandler(logging.Handler):
+    """Root handler that forwards each record to the queue of the run bound to the current context.
+
+    Records logged outside any run, such as a failure reported after a run
+    ended, go straight to the console handler instead.
+    """
+
+    def __init__(self, console: logging.Handler):
+        super().__init__()
+        self.console = console
+
+    def emit(self, record: logging.LogRecord) -> None:
+        run = _current.get()
+        if run is None or run.closed:
+            record.run_id = "-"
+            self.console.handle(record)
+        elif record.levelno >= run.level:
+            record.run_id = run.run_id
+            run.queue_handler.handle(record)
+
+_current: ContextVar[Optional["ESGLogger"]] = ContextVar("esg_run_logger", default=None)
+_setup_lock = threading.Lock()
+_dispatch: Optional[_RunDispatchHandler] = None
+_stdout_captures = 0
+
+def current_run_id() -> Optional[str]:
+    """ID of the run whose logging context the current thread or task is in, if any."""
+    run = _current.get()
+    return run.run_id if run is not None else None
 
 class ESGLogger:
-    """Manages logging for ESG implementation."""
+    """Per-run logging context.
+
+    Records logged from the thread or async task that created the logger go
+    to the console and to the run's own file,
+    ``esg_implementation_<timestamp>_<run_id>.log`` in the output directory.
+    Records from other runs, and from code outside any run, are not written
+    there, so many workflows can run in one process; records from outside
+    any run still reach the console. Records pass through a
+    queue to a listener thread, so the caller never waits on file or console
+    I/O. Run IDs are available to log formats as ``%(run_id)s``.
+
+    Use it as a context manager, or call ``cleanup`` when the run ends.
+    """
     
-    def __init__(self, config: ESGConfig):
-        """Initialize logger with configuration."""
+    def __init__(self, config: ESGConfig, run_id: Optional[str] = None):
+        """Initialize logger with configuration and bind it to the current context."""
         self.config = config
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.level = getattr(logging, self.config.logging.level)
+        self.capture_stdout = self.config.logging.capture_stdout
         self.log_file: Optional[Path] = None
-        self.output_file: Optional[TextIO] = None
-        self.original_stdout = sys.stdout
+        self.closed = False
+        self._token: Optional[Token] = None
         self._setup_logging()
     
     def _setup_logging(self):
         """Set up logging configuration."""
+        global _dispatch, _stdout_captures
         # Create output directory
         output_dir = Path(self.config.output_path)
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Create timestamped log file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_file = output_dir / f"esg_implementation_{timestamp}.log"
+        self.log_file = output_dir / f"esg_implementation_{timestamp}_{self.run_id}.log"
         
-        # Configure logging
-        logging.basicConfig(
-            level=getattr(logging, self.config.logging.level),
-            format=self.config.logging.format,
-            datefmt=self.config.logging.date_format,
-            handlers=[
-                logging.FileHandler(self.log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
+        # The index finds a run's files, compressed or rotated, without directory scans
+        settings = self.config.logging
+        self.index = LogIndex(output_dir)
+        self.maintenance = LogMaintenance(
+            self.index, settings.compress_logs, settings.retention_days, settings.retention_max_files
         )
-        
-        # Set up console output capture
-        sys.stdout = TeeLogger(self.log_file)
+        self.index.opened(self.log_file, self.run_id)
+        self.maintenance.sweep()
+
+        # Records are formatted and written by the listener thread
+        formatter = logging.Formatter(settings.format, settings.date_format)
+        self.writer = BufferedFileWriter(
+            self.log_file, settings.buffer_size, settings.flush_interval,
+            max_bytes=settings.max_log_bytes, max_age=settings.max_log_age, on_rotate=self._rotated
+        )
+        file_handler = logging.StreamHandler(self.writer)
+        console_handler = _ConsoleHandler()
+        for handler in (file_handler, console_handler):
+            handler.setFormatter(formatter)
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+        self.listener.start()
+
+        with _setup_lock:
+            root = logging.getLogger()
+            if _dispatch is None:
+                console = _ConsoleHandler()
+                console.setFormatter(formatter)
+                _dispatch = _RunDispatchHandler(console)
+                root.addHandler(_dispatch)
+            # Only ever lowered, so no run loses records another run asked for
+            if root.level > self.level:
+                root.setLevel(self.level)
+            if self.capture_stdout:
+                if _stdout_captures == 0:
+                    sys.stdout = ContextStdout(sys.stdout)
+                _stdout_captures += 1
+
+        self._token = _current.set(self)
+        atexit.register(self.cleanup)
+
+    def _rotated(self, segment: Path) -> None:
+        """Index a rotated-out segment and hand it to background maintenance."""
+        self.index.moved(self.log_file, segment)
+        self.index.opened(self.log_file, self.run_id)
+        self.maintenance.closed(segment)
+
+    def __enter__(self) -> "ESGLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.cleanup()
     
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger instance."""
         return logging.getLogger(name)
+
+    def flush(self) -> None:
+        """Write every record logged so far to the console and log file."""
+        if self.closed:
+            return
+        # Stopping the listener drains the queue; records queued meanwhile wait for the restart
+        self.listener.stop()
+        self.listener.start()
+        self.writer.flush()
     
     def cleanup(self):
         """Clean up logging resources."""
-        if hasattr(sys.stdout, 'file'):
-            sys.stdout.file.close()
-        sys.stdout = self.original_stdout
+        global _stdout_captures
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Cleaned up from a different context than the one that created it
+            pass
+        self.listener.stop()
+        self.writer.close()
+        self.maintenance.closed(self.log_file)
+        atexit.unregister(self.cleanup)
+        if self.capture_stdout:
+            with _setup_lock:
+                _stdout_captures -= 1
+                if _stdout_captures == 0 and isinstance(sys.stdout, ContextStdout):
+                    sys.stdout = sys.stdout.console
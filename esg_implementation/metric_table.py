@@ -0,0 +1,195 @@
+"""Compact, array-backed storage for large metric collections."""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from .models import ESGMetric
+from .validation import is_emissions
+
+STRING_COLUMNS: Tuple[str, ...] = ("name", "unit", "data_source", "category")
+VALUE_COLUMNS: Tuple[str, ...] = ("current_value", "target_value")
+
+_STRINGS = TypeAdapter(List[str])
+_VALUES = TypeAdapter(List[Optional[float]])
+
+class StringTable:
+    """Interned strings addressed by small integer codes."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        """Code of a string, adding it to the table if new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        """Codes of many strings as an int32 array."""
+        codes, lookup = self.codes, self.code
+        return np.fromiter((codes[v] if v in codes else lookup(v) for v in values), dtype=np.int32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Strings for an array of codes, as an object array."""
+        return np.array(self.values, dtype=object)[codes] if len(codes) else np.empty(0, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class MetricTable:
+    """Metrics stored as parallel typed columns instead of per-row models.
+
+    String fields are int32 codes into per-column interned string tables and
+    numeric fields are float64 arrays with NaN for unreported values, so a
+    metric costs about 32 bytes plus its distinct strings. Columns are
+    validated in bulk against the ``ESGMetric`` field types on construction.
+    Tables round-trip with ``List[ESGMetric]`` and can be filtered, grouped
+    and summarized with array operations.
+    """
+
+    def __init__(
+        self,
+        codes: Mapping[str, np.ndarray],
+        values: Mapping[str, np.ndarray],
+        strings: Optional[Mapping[str, StringTable]] = None
+    ):
+        self.strings: Dict[str, StringTable] = dict(strings) if strings else {c: StringTable() for c in STRING_COLUMNS}
+        self.codes: Dict[str, np.ndarray] = {c: np.asarray(codes[c], dtype=np.int32) for c in STRING_COLUMNS}
+        self.values: Dict[str, np.ndarray] = {c: np.asarray(values[c], dtype=np.float64) for c in VALUE_COLUMNS}
+        lengths = {len(column) for column in (*self.codes.values(), *self.values.values())}
+        if len(lengths) > 1:
+            raise ValueError("Metric table columns must have the same length")
+
+    @classmethod
+    def from_columns(cls, **columns: Sequence[Any]) -> "MetricTable":
+        """Build a table from one sequence per ``ESGMetric`` field, validating each column in bulk.
+
+        Value columns may be omitted (all unreported).
+        """
+        length = len(columns.get("name", ()))
+        strings = {c: StringTable() for c in STRING_COLUMNS}
+        codes, values = {}, {}
+        try:
+            for column in STRING_COLUMNS:
+                if column not in columns:
+                    raise ValueError(f"Missing metric column: {column}")
+                codes[column] = strings[column].encode(_STRINGS.validate_python(list(columns[column])))
+            for column in VALUE_COLUMNS:
+                raw = _VALUES.validate_python(list(columns.get(column, [None] * length)))
+                values[column] = np.array([np.nan if v is None else v for v in raw], dtype=np.float64)
+        except ValidationError as e:
+            error = e.errors(include_url=False)[0]
+            raise ValueError(f"Invalid {column} at row {error['loc'][0]}: {error['msg']}") from None
+        return cls(codes, values, strings)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[Mapping[str, Any], ESGMetric]]) -> "MetricTable":
+        """Build a table from metric dicts or models."""
+        columns: Dict[str, List[Any]] = {c: [] for c in (*STRING_COLUMNS, *VALUE_COLUMNS)}
+        appenders = [(c, columns[c].append) for c in columns]
+        for record in records:
+            if isinstance(record, ESGMetric):
+                record = record.__dict__
+            for column, add in appenders:
+                add(record.get(column))
+        return cls.from_columns(**columns)
+
+    from_metrics = from_records
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> "MetricTable":
+        """Build a table from a JSON array of metric objects without creating models."""
+        return cls.from_records(json.loads(data))
+
+    def __len__(self) -> int:
+        return len(self.codes["name"])
+
+    def column(self, name: str) -> np.ndarray:
+        """A column as an array: decoded strings (object dtype) or float values (NaN for None)."""
+        if name in self.values:
+            return self.values[name]
+        return self.strings[name].decode(self.codes[name])
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One metric as a dict."""
+        record: Dict[str, Any] = {c: self.strings[c].values[self.codes[c][index]] for c in STRING_COLUMNS}
+        for c in VALUE_COLUMNS:
+            value = self.values[c][index]
+            record[c] = None if np.isnan(value) else float(value)
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def to_metrics(self) -> List[ESGMetric]:
+        """Materialize the rows as ``ESGMetric`` models (already validated, so not re-validated)."""
+        return [ESGMetric.model_construct(**record) for record in self]
+
+    def select(self, rows: Union[np.ndarray, Sequence[int]]) -> "MetricTable":
+        """Subset of rows by index array or boolean mask; string tables are shared."""
+        return MetricTable(
+            {c: self.codes[c][rows] for c in STRING_COLUMNS},
+            {c: self.values[c][rows] for c in VALUE_COLUMNS},
+            self.strings
+        )
+
+    def where(self, column: str, value: str) -> "MetricTable":
+        """Rows whose string column equals ``value``."""
+        code = self.strings[column].codes.get(value)
+        if code is None:
+            return self.select(np.empty(0, dtype=np.int64))
+        return self.select(self.codes[column] == code)
+
+    def group_by(self, column: str = "category") -> Dict[str, "MetricTable"]:
+        """Split the table by a string column, in first-seen order."""
+        codes = self.codes[column]
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        groups = {}
+        for rows in np.split(order, bounds):
+            if len(rows):
+                groups[self.strings[column].values[codes[rows[0]]]] = self.select(rows)
+        return dict(sorted(groups.items(), key=lambda item: self.strings[column].codes[item[0]]))
+
+    def progress(self) -> np.ndarray:
+        """Progress towards target as a percentage (NaN without a usable target).
+
+        Emissions metrics are reduction targets: their progress is the target
+        as a percentage of the current value, capped at 100 once the target is
+        met. Other metrics report the current value as a percentage of target.
+        """
+        current, target = self.values["current_value"], self.values["target_value"]
+        # Classify each distinct name and unit once, then look the rows up by code
+        name_flags = np.array([is_emissions(name, "") for name in self.strings["name"].values], dtype=bool)
+        unit_flags = np.array([is_emissions("", unit) for unit in self.strings["unit"].values], dtype=bool)
+        reduction = name_flags[self.codes["name"]] | unit_flags[self.codes["unit"]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where((target != 0) & ~np.isnan(target), current / target * 100, np.nan)
+            # NaN comparisons are False, so a missing value falls through to NaN, as
+            # does a non-positive value above a negative (net removal) target
+            reduced = np.where(current <= target, 100.0, np.where(current > 0, target / current * 100, np.nan))
+        return np.where(reduction, reduced, growth)
+
+    def digest(self) -> str:
+        """Content hash of the rows (independent of string table order)."""
+        h = hashlib.blake2b(digest_size=16)
+        for c in STRING_COLUMNS:
+            h.update("\x1f".join(self.column(c).tolist()).encode("utf-8"))
+            h.update(b"\x1e")
+        for c in VALUE_COLUMNS:
+            h.update(self.values[c].tobytes())
+        return h.hexdigest()
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and string tables."""
+        arrays = sum(a.nbytes for a in (*self.codes.values(), *self.values.values()))
+        return arrays + sum(len(s.encode("utf-8")) + 49 for t in self.strings.values() for s in t.values)
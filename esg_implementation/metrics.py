@@ -0,0 +1,312 @@
+"""In-process operational metrics with a Prometheus text-format endpoint."""
+import abc
+import bisect
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import events
+
+class _Cells:
+    """Per-thread accumulators of a metric's values, summed when collected.
+
+    Each thread only ever adds to its own cell, so updates take no lock;
+    collection reads every cell, and folds those of finished threads into
+    a retired total so thread pools do not grow the list without bound.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._cells: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = [0.0] * self.size
+            with self._lock:
+                self._cells.append((threading.current_thread(), cell))
+            return cell
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            live = []
+            for thread, cell in self._cells:
+                if thread.is_alive():
+                    live.append((thread, cell))
+                else:
+                    self._retired = [a + b for a, b in zip(self._retired, cell)]
+            self._cells = live
+            totals = list(self._retired)
+        for _, cell in live:
+            totals = [a + b for a, b in zip(totals, cell)]
+        return totals
+
+class _Metric(abc.ABC):
+    """A named metric family, with one child per combination of label values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Rendered from the start, so a scrape sees zero rather than no series
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: Any) -> Any:
+        """Child metric for the given label values (created on first use)."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abc.abstractmethod
+    def _new_child(self) -> Any:
+        """A fresh child metric for one set of label values."""
+
+    def _unlabelled(self) -> Any:
+        child = self._children.get(())
+        return child if child is not None else self.labels()
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Sample name, labels and value of every series, for exposition."""
+
+class _Value:
+    def __init__(self) -> None:
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._cells.cell()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._cells.cell()[0] -= amount
+
+    def get(self) -> float:
+        return self._cells.totals()[0]
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. calls or errors."""
+
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for key, child in list(self._children.items()):
+            yield self.name + "_total", dict(zip(self.labelnames, key)), child.get()
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. runs in flight or queue depth."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled().dec(amount)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for key, child in list(self._children.items()):
+            yield self.name, dict(zip(self.labelnames, key)), child.get()
+
+# Seconds, from a fast tool call to a long crew task
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket plus +Inf, then the sum
+        self._cells = _Cells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. latencies, in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            totals = child._cells.totals()
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), totals):
+                cumulative += count
+                yield self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield self.name + "_sum", labels, totals[-1]
+            yield self.name + "_count", labels, cumulative
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class MetricsRegistry:
+    """Set of metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+RUNS_IN_FLIGHT = REGISTRY.gauge("esg_runs_in_flight", "Workflow runs currently executing")
+RUNS = REGISTRY.counter("esg_runs", "Finished workflow runs", ["status"])
+RUN_SECONDS = REGISTRY.histogram("esg_run_duration_seconds", "Workflow run duration")
+BATCH_QUEUE_DEPTH = REGISTRY.gauge("esg_batch_queue_depth", "Batch runs submitted but not yet started")
+TASK_SECONDS = REGISTRY.histogram("esg_task_duration_seconds", "Crew task duration", ["status"])
+TOOL_CALLS = REGISTRY.counter("esg_tool_calls", "Tool invocations", ["tool", "status"])
+TOOL_SECONDS = REGISTRY.histogram("esg_tool_duration_seconds", "Tool invocation duration", ["tool"])
+LLM_CALLS = REGISTRY.counter("esg_llm_calls", "LLM calls", ["model", "status"])
+LLM_SECONDS = REGISTRY.histogram("esg_llm_duration_seconds", "LLM call latency", ["model"])
+LLM_TOKENS = REGISTRY.counter("esg_llm_tokens", "LLM tokens", ["model", "direction"])
+CACHE_REQUESTS = REGISTRY.counter("esg_cache_requests", "Cache lookups", ["cache", "result"])
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup; the hit ratio is hits over all lookups of a cache."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+def _status(event: Dict[str, Any]) -> str:
+    return "error" if event.get("error") else "ok"
+
+def _on_event(event: Dict[str, Any]) -> None:
+    kind = event["ev"]
+    if kind == "tool":
+        TOOL_CALLS.labels(event["name"], _status(event)).inc()
+        TOOL_SECONDS.labels(event["name"]).observe(event["dur"])
+    elif kind == "llm":
+        model = event["model"]
+        LLM_CALLS.labels(model, _status(event)).inc()
+        LLM_SECONDS.labels(model).observe(event["dur"])
+        if event.get("in_tokens"):
+            LLM_TOKENS.labels(model, "in").inc(event["in_tokens"])
+        if event.get("out_tokens"):
+            LLM_TOKENS.labels(model, "out").inc(event["out_tokens"])
+    elif kind == "task_end":
+        if event.get("dur") is not None:
+            TASK_SECONDS.labels(_status(event)).observe(event["dur"])
+    elif kind == "run_start":
+        RUNS_IN_FLIGHT.inc()
+    elif kind == "run_end":
+        RUNS_IN_FLIGHT.dec()
+        RUNS.labels(event["status"]).inc()
+        RUN_SECONDS.observe(event["dur"])
+
+def _on_tool_finished(source: Any, event: Any) -> None:
+    cache_lookup("crewai_tool", event.from_cache)
+
+events.add_listener(_on_event)
+
+_handlers_registered = False
+
+def _register_crew_handlers() -> None:
+    """Subscribe to crewai's tool usage events once per process."""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.tool_usage_events import ToolUsageFinishedEvent
+
+    crewai_event_bus.on(ToolUsageFinishedEvent)(_on_tool_finished)
+    _handlers_registered = True
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Scrapes would otherwise print a line each to stderr
+
+_servers: Dict[Tuple[str, int], ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+def serve(host: str = "127.0.0.1", port: int = 9464, registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread; repeated calls for the same address reuse the server.
+
+    Port 0 picks a free port (see ``server.server_address``).
+    """
+    _register_crew_handlers()
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry or REGISTRY})
+            server = ThreadingHTTPServer((host, port), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="esg-metrics", daemon=True).start()
+            _servers[(host, port)] = server
+    return server
@@ -0,0 +1,246 @@
+"""Schema migrations for ESG organization data files."""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from pydantic import BaseModel, ValidationError
+
+from . import serialization
+from .locking import file_lock
+from .models import SCHEMA_VERSION, ESGOrganization
+from .repository import FileRepository
+
+Migration = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Migration from each version to the next
+MIGRATIONS: Dict[int, Migration] = {}
+
+def register_migration(from_version: int) -> Callable[[Migration], Migration]:
+    """Register a function that upgrades organization data from ``from_version`` to the next version."""
+    def decorator(migration: Migration) -> Migration:
+        if from_version in MIGRATIONS:
+            raise ValueError(f"A migration from schema version {from_version} is already registered")
+        MIGRATIONS[from_version] = migration
+        return migration
+    return decorator
+
+def detect_version(data: Dict[str, Any]) -> int:
+    """Schema version of organization data.
+
+    Files written before versioning have no ``schema_version``: monolith
+    files (version 1) are told apart by their ``actions`` and importance
+    fields, anything else has the package layout (version 2).
+    """
+    if "schema_version" in data:
+        return int(data["schema_version"])
+    if "actions" in data or any(
+        "importance_to_business" in issue for issue in data.get("material_issues") or ()
+    ):
+        return 1
+    return 2
+
+def migrate(data: Dict[str, Any], target: int = SCHEMA_VERSION) -> Dict[str, Any]:
+    """Upgrade organization data to the target schema version.
+
+    Raises:
+        ValueError: If the data is newer than the target or a migration step is missing
+    """
+    version = detect_version(data)
+    if version > target:
+        raise ValueError(f"Schema version {version} is newer than supported version {target}")
+    while version < target:
+        if version not in MIGRATIONS:
+            raise ValueError(f"No migration from schema version {version}")
+        data = MIGRATIONS[version](data)
+        version += 1
+        data["schema_version"] = version
+    return data
+
+@register_migration(1)
+def _monolith_to_package(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Monolith layout to package layout.
+
+    Material issue importance ratings fold into a float ``materiality_score``
+    (their mean, as the materiality tools compute it) unless a score was
+    already assessed, and ``actions`` become ``initiatives``.
+    """
+    data = dict(data)
+    issues = []
+    for issue in data.get("material_issues") or ():
+        issue = dict(issue)
+        business = issue.pop("importance_to_business", None)
+        stakeholders = issue.pop("importance_to_stakeholders", None)
+        if not issue.get("materiality_score") and business is not None and stakeholders is not None:
+            issue["materiality_score"] = (business + stakeholders) / 2
+        issue["materiality_score"] = float(issue.get("materiality_score") or 0.0)
+        issues.append(issue)
+    data["material_issues"] = issues
+
+    initiatives = list(data.get("initiatives") or ())
+    for action in data.pop("actions", None) or ():
+        resources = action.get("resources_required") or ""
+        initiatives.append({
+            "name": action["name"],
+            "description": action.get("description", ""),
+            "status": action.get("status") or "planned",
+            "timeline": action.get("timeline", ""),
+            "responsible_team": action.get("responsible_party", ""),
+            "resources_needed": [r.strip() for r in resources.split(",") if r.strip()],
+            # The metrics an action was meant to move are its measurable outcomes
+            "success_criteria": [f"Progress on {metric}" for metric in action.get("related_metrics") or ()]
+        })
+    data["initiatives"] = initiatives
+    return data
+
+class MigrationResult(BaseModel):
+    """Outcome of migrating one file."""
+    path: str
+    status: str  # 'migrated', 'current', 'skipped' or 'failed'
+    from_version: Optional[int] = None
+    bytes_read: int = 0
+    error: Optional[str] = None
+
+def migrate_file(path: str, dry_run: bool = False) -> MigrationResult:
+    """Migrate one organization file in place.
+
+    JSON files (optionally gzip/lzma-compressed) are upgraded, validated
+    against the current models and rewritten atomically with the same
+    compression. Binary-codec files are only ever written from the current
+    models, so they are skipped.
+
+    The rewrite holds the organization's repository lock and, like a save,
+    folds in the change log and advances the revision, so a concurrent save
+    based on the unmigrated file fails its revision check.
+    """
+    file = Path(path)
+    slug = file.name.rpartition("_esg_data")[0]
+    repository = FileRepository(file.parent)
+    try:
+        with nullcontext() if dry_run else file_lock(repository.lock_for(slug)):
+            return _migrate_locked_file(path, dry_run, repository, slug)
+    except (OSError, ValueError, ValidationError) as e:
+        return MigrationResult(path=path, status="failed", error=str(e))
+
+def _migrate_locked_file(path: str, dry_run: bool, repository: FileRepository, slug: str) -> MigrationResult:
+    raw = Path(path).read_bytes()
+    data, compression = raw, None
+    for candidate in serialization.COMPRESSIONS.values():
+        if data.startswith(candidate.magic):
+            data, compression = candidate.decompress(data), candidate.name
+            break
+    if serialization.detect_codec(data).name != "json":
+        return MigrationResult(path=path, status="skipped", bytes_read=len(raw))
+    document = json.loads(data)
+    version = detect_version(document)
+    if version == SCHEMA_VERSION and "schema_version" in document:
+        return MigrationResult(path=path, status="current", from_version=version, bytes_read=len(raw))
+    organization = ESGOrganization.model_validate(migrate(document))
+    if not dry_run:
+        # A file shadowed by the organization's current one does not own the change log
+        siblings = list(repository.data_path.glob(f"{glob.escape(slug)}_esg_data*"))
+        changelog = repository.changelog_for(slug) if siblings == [Path(path)] else None
+        if changelog is not None:
+            changelog.replay(organization)
+        organization.revision += 1
+        serialization.atomic_write_bytes(path, serialization.dumps(organization, "json", compression))
+        if changelog is not None:
+            changelog.clear()
+    return MigrationResult(path=path, status="migrated", from_version=version, bytes_read=len(raw))
+
+def _migrate_batch(paths: List[str], dry_run: bool) -> List[MigrationResult]:
+    return [migrate_file(path, dry_run) for path in paths]
+
+def iter_organization_files(paths: Iterable[str], pattern: str = "*_esg_data*") -> Iterator[str]:
+    """Yield organization files, expanding directories recursively, without listing them all first."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for directory, _, files in os.walk(path):
+            for name in files:
+                if not name.startswith(".") and Path(name).match(pattern):
+                    yield os.path.join(directory, name)
+
+def migrate_files(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    on_result: Optional[Callable[[MigrationResult], None]] = None,
+    batch_size: int = 16
+) -> Dict[str, int]:
+    """Migrate files in parallel in a process pool.
+
+    Files are streamed to the pool in batches (amortizing inter-process
+    overhead on small files) with a bounded number of batches in flight, so
+    memory stays flat however many files there are.
+
+    Args:
+        paths: Organization files to migrate
+        workers: Worker processes; one per CPU if None
+        dry_run: Validate the migration without rewriting files
+        on_result: Called with each result as it completes
+        batch_size: Files per task sent to a worker
+
+    Returns:
+        Dict of result status to file count
+    """
+    counts: Dict[str, int] = {}
+    workers = workers or os.cpu_count() or 1
+    pending: Set[Future] = set()
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            for result in future.result():
+                counts[result.status] = counts.get(result.status, 0) + 1
+                if on_result is not None:
+                    on_result(result)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch: List[str] = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) < batch_size:
+                continue
+            pending.add(pool.submit(_migrate_batch, batch, dry_run))
+            batch = []
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        if batch:
+            pending.add(pool.submit(_migrate_batch, batch, dry_run))
+        collect(wait(pending).done)
+    return counts
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate organization files to the current schema version")
+    parser.add_argument("paths", nargs="+", help="Organization files or directories to search")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Files per task sent to a worker")
+    parser.add_argument("--dry-run", action="store_true", help="Validate without rewriting files")
+    args = parser.parse_args(argv)
+
+    totals = {"files": 0, "bytes": 0}
+
+    def report(result: MigrationResult) -> None:
+        totals["files"] += 1
+        totals["bytes"] += result.bytes_read
+        if result.status == "failed":
+            print(f"failed:   {result.path}: {result.error}")
+
+    start = time.perf_counter()
+    counts = migrate_files(iter_organization_files(args.paths), args.workers, args.dry_run, report, args.batch_size)
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{status} {count}" for status, count in sorted(counts.items())) or "no files"
+    print(f"{summary}{' (dry run)' if args.dry_run else ''}")
+    print(f"elapsed:    {elapsed:.2f} s")
+    print(f"throughput: {totals['files'] / elapsed:,.0f} files/s, {totals['bytes'] / elapsed / 2**20:.1f} MiB/s")
+    return 1 if counts.get("failed") else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
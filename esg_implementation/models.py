@@ -1,6 +1,156 @@
 """Models for ESG Implementation."""
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from bisect import insort
+from typing import Any, ClassVar, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
+
+def _key_of(record: Any, key: str) -> Any:
+    return record.get(key) if isinstance(record, dict) else getattr(record, key, None)
+
+# Attributes any IndexedList has indexed, and a counter of in-place changes to
+# them; a record does not know the lists holding it, so a change to an indexed
+# attribute marks every list's indexes stale instead
+_indexed_attributes: Set[str] = set()
+_indexed_changes = [0]
+
+class IndexedList(list):
+    """List of records with secondary indexes on record attributes.
+
+    An index (attribute value to sorted positions) is built on the first
+    lookup by that attribute and kept in sync by ``append``, ``extend`` and
+    item assignment; other mutations drop the indexes, which are rebuilt on
+    the next lookup. Changing an indexed attribute of an ``IndexedRecord`` in
+    place (``records[0].category = "Social"``) also drops them. Dict records
+    changed in place must be reassigned (``records[i] = record``).
+    """
+
+    def __init__(self, records: Iterable[Any] = ()):
+        super().__init__(records)
+        self._indexes: Dict[str, Dict[Hashable, List[int]]] = {}
+        self._indexed_at = _indexed_changes[0]
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+        # Indexes are rebuilt on demand rather than copied or pickled
+        return (self.__class__, (list(self),))
+
+    def _index(self, key: str) -> Dict[Hashable, List[int]]:
+        if self._indexed_at != _indexed_changes[0]:
+            # A record changed an indexed attribute in place
+            self._indexes.clear()
+            self._indexed_at = _indexed_changes[0]
+        index = self._indexes.get(key)
+        if index is None:
+            _indexed_attributes.add(key)
+            index = self._indexes[key] = {}
+            for position, record in enumerate(self):
+                index.setdefault(_key_of(record, key), []).append(position)
+        return index
+
+    def positions(self, key: str, value: Hashable) -> List[int]:
+        """Positions of the records whose ``key`` attribute equals ``value``."""
+        return list(self._index(key).get(value, ()))
+
+    def position(self, key: str, value: Hashable) -> Optional[int]:
+        """Position of the first record whose ``key`` attribute equals ``value``."""
+        positions = self._index(key).get(value)
+        return positions[0] if positions else None
+
+    def find(self, key: str, value: Hashable) -> Optional[Any]:
+        """First record whose ``key`` attribute equals ``value``."""
+        position = self.position(key, value)
+        return None if position is None else self[position]
+
+    def select(self, key: str, value: Hashable) -> List[Any]:
+        """Records whose ``key`` attribute equals ``value``, in list order."""
+        return [self[position] for position in self._index(key).get(value, ())]
+
+    def groups(self, key: str) -> Dict[Hashable, List[Any]]:
+        """Records grouped by their ``key`` attribute, in first-seen order."""
+        return {value: [self[p] for p in positions] for value, positions in self._index(key).items()}
+
+    def append(self, record: Any) -> None:
+        for key, index in self._indexes.items():
+            index.setdefault(_key_of(record, key), []).append(len(self))
+        super().append(record)
+
+    def extend(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __iadd__(self, records: Iterable[Any]) -> "IndexedList":
+        self.extend(records)
+        return self
+
+    def __setitem__(self, position: Any, record: Any) -> None:
+        if not isinstance(position, int):
+            self._indexes.clear()
+            return super().__setitem__(position, record)
+        if position < 0:
+            position += len(self)
+        previous = self[position]
+        super().__setitem__(position, record)
+        for key, index in self._indexes.items():
+            old, new = _key_of(previous, key), _key_of(record, key)
+            if old != new:
+                bucket = index[old]
+                bucket.remove(position)
+                if not bucket:
+                    del index[old]
+                insort(index.setdefault(new, []), position)
+
+def _invalidating(name: str) -> Any:
+    method = getattr(list, name)
+
+    def mutate(self: IndexedList, *args: Any, **kwargs: Any) -> Any:
+        self._indexes.clear()
+        return method(self, *args, **kwargs)
+    mutate.__name__ = name
+    return mutate
+
+# Mutations that shift positions; cheaper to rebuild than to patch the indexes
+for _name in ("__delitem__", "__imul__", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(IndexedList, _name, _invalidating(_name))
+
+class IndexedRecord(BaseModel):
+    """Base for records kept in ``IndexedList`` sections.
+
+    Assigning a new value to an attribute some list has indexed marks the
+    lists' indexes stale, so lookups never return results for the old value.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _indexed_attributes and getattr(self, name, None) != value:
+            _indexed_changes[0] += 1
+        super().__setattr__(name, value)
+
+class IndexedSections(BaseModel):
+    """Base for models whose list sections are ``IndexedList`` instances.
+
+    The sections named in ``indexed_sections`` are wrapped after validation
+    (and construction) and on assignment; the indexes are not fields, so they
+    never reach serialized output.
+    """
+    indexed_sections: ClassVar[Tuple[str, ...]] = ()
+
+    def model_post_init(self, __context: Any) -> None:
+        for section in self.indexed_sections:
+            if section in self.__dict__ and not isinstance(self.__dict__[section], IndexedList):
+                self.__dict__[section] = IndexedList(self.__dict__[section])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.indexed_sections and not isinstance(value, IndexedList):
+            value = IndexedList(value)
+        super().__setattr__(name, value)
+
+    def find(self, section: str, name: str) -> Optional[Any]:
+        """The record with the given name in a section, if any."""
+        return getattr(self, section).find("name", name)
+
+    def by_category(self, section: str, category: str) -> List[Any]:
+        """Records of a section in the given category."""
+        return getattr(self, section).select("category", category)
+
+# Version of the organization data layout; see ``migrations`` for older layouts
+SCHEMA_VERSION = 2
 
 class ESGVision(BaseModel):
     """Represents the organization's ESG vision and goals."""
@@ -9,29 +159,30 @@ class ESGVision(BaseModel):
     social_goals: List[str]
     governance_goals: List[str]
 
-class Stakeholder(BaseModel):
+class Stakeholder(IndexedRecord):
     """Represents a stakeholder in the ESG implementation."""
     name: str
     category: str
     influence_level: int
     expectations: List[str]
 
-class MaterialIssue(BaseModel):
+class MaterialIssue(IndexedRecord):
     """Represents a material ESG issue."""
     name: str
     description: str
     category: str
     materiality_score: float = 0.0
 
-class ESGMetric(BaseModel):
+class ESGMetric(IndexedRecord):
     """Represents an ESG metric for tracking progress."""
     name: str
     unit: str
     data_source: str
     category: str
     current_value: Optional[float] = None
+    target_value: Optional[float] = None
 
-class Initiative(BaseModel):
+class Initiative(IndexedRecord):
     """Represents an ESG initiative."""
     name: str
     description: str
@@ -41,19 +192,38 @@ class Initiative(BaseModel):
     resources_needed: List[str]
     success_criteria: List[str]
 
-class ESGOrganization(BaseModel):
-    """Represents an organization's ESG profile."""
+class ESGOrganization(IndexedSections):
+    """Represents an organization's ESG profile.
+
+    Stakeholders, material issues, metrics and initiatives are indexed by
+    name and category (see ``IndexedList``).
+    """
+    indexed_sections: ClassVar[Tuple[str, ...]] = ("stakeholders", "material_issues", "metrics", "initiatives")
+
     name: str
     vision: Optional[ESGVision] = None
     stakeholders: List[Stakeholder] = Field(default_factory=list)
     material_issues: List[MaterialIssue] = Field(default_factory=list)
     metrics: List[ESGMetric] = Field(default_factory=list)
     initiatives: List[Initiative] = Field(default_factory=list)
+    reports: List[Dict[str, Any]] = Field(default_factory=list)
+    revision: int = 0  # Version of the stored state; advanced by each recorded change or checked save
+    schema_version: int = SCHEMA_VERSION
+
+    # Sections a partial load filled in (None if fully loaded); not a field, so never serialized
+    _loaded_sections: Optional[FrozenSet[str]] = PrivateAttr(default=None)
+
+    @property
+    def loaded_sections(self) -> Optional[FrozenSet[str]]:
+        """List sections a partial load filled in, or None if the organization is complete."""
+        return self._loaded_sections
+
+    def mark_partial(self, sections: Iterable[str]) -> None:
+        """Record that only ``sections`` were loaded, so the others must not be saved over."""
+        self._loaded_sections = frozenset(sections)
 
     @classmethod
     def load_from_json(cls, filepath: str) -> 'ESGOrganization':
-        """Load organization data from JSON file."""
-        import json
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return cls.model_validate(data)
+        """Load organization data from JSON file, migrating older schema versions."""
+        from .serialization import load  # serialization builds on this module
+        return load(filepath, cls)
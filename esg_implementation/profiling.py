@@ -0,0 +1,100 @@
+"""Opt-in CPU and memory profiling of workflow runs."""
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# cProfile and tracemalloc are process-wide, so only one run is profiled at a time
+_active = threading.Lock()
+
+class ProfileArtifacts(NamedTuple):
+    """Files written for one profiled run."""
+    summary: Path
+    cpu: Optional[Path]
+    memory: Optional[Path]
+
+def _cpu_summary(profiler: cProfile.Profile, top: int) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return out.getvalue()
+
+def _memory_summary(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB", f"Top {top} allocation sites still held at the end of the run:"]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+@contextmanager
+def profile_run(
+    output_dir: Union[str, Path],
+    label: str,
+    cpu: bool = True,
+    memory: bool = False,
+    top: int = 30,
+) -> Iterator[Optional[ProfileArtifacts]]:
+    """Profile the block and write its artifacts to ``output_dir`` when it ends, even on error.
+
+    CPU profiling uses the deterministic ``cProfile`` profiler, which covers
+    the calling thread (where crewai runs sequential crews), and writes
+    ``<label>.prof`` (``pstats`` format, loadable by snakeviz or
+    ``python -m pstats``). Memory profiling uses ``tracemalloc`` and writes
+    ``<label>.tracemalloc`` (a ``tracemalloc.Snapshot`` dump). ``<label>_profile.txt``
+    summarizes the top ``top`` functions by cumulative and own time and the
+    largest allocation sites.
+
+    Yields the artifact paths, or ``None`` if another run is already being
+    profiled, in which case the block runs unprofiled.
+    """
+    if not _active.acquire(blocking=False):
+        logger.warning("Profiling of %s skipped: another run is being profiled", label)
+        yield None
+        return
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    artifacts = ProfileArtifacts(
+        summary=output_dir / f"{label}_profile.txt",
+        cpu=output_dir / f"{label}.prof" if cpu else None,
+        memory=output_dir / f"{label}.tracemalloc" if memory else None,
+    )
+    profiler = cProfile.Profile() if cpu else None
+    # Leave tracemalloc running afterwards if someone else started it
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    try:
+        if started_tracemalloc:
+            tracemalloc.start(25)
+        if memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield artifacts
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            sections: List[str] = [f"Profile of {label}: {elapsed:.2f} s wall time\n"]
+            if profiler is not None:
+                profiler.dump_stats(artifacts.cpu)
+                sections.append(_cpu_summary(profiler, top))
+            if memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot.dump(str(artifacts.memory))
+                sections.append(_memory_summary(snapshot, peak, top))
+            artifacts.summary.write_text("\n".join(sections), encoding='utf-8')
+    finally:
+        if started_tracemalloc:
+            tracemalloc.stop()
+        _active.release()
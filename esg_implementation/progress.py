@@ -0,0 +1,188 @@
+"""Live terminal progress view of workflow runs, driven by run events."""
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+from . import events
+
+class ProgressRow:
+    """State of one run or task as shown in the view."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "pending"
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.tokens = 0
+        self.retries = 0
+
+    def start(self) -> None:
+        self.state = "running"
+        self.started = time.monotonic()
+
+    def finish(self, failed: bool) -> None:
+        self.state = "failed" if failed else "done"
+        self.ended = time.monotonic()
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.ended or time.monotonic()) - self.started
+
+class RunProgress(ProgressRow):
+    """A run's row, with a row per task of its crew."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.tasks: List[ProgressRow] = []
+        self.current: Optional[ProgressRow] = None
+
+    def task(self, name: str) -> ProgressRow:
+        # The first not yet started task of that name, so repeated names stay distinct
+        for row in self.tasks:
+            if row.name == name and row.state == "pending":
+                return row
+        row = ProgressRow(name)
+        self.tasks.append(row)
+        return row
+
+def _format_elapsed(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+class ProgressView:
+    """Compact live view of runs and their tasks.
+
+    Listens to the events every run emits, so it works with agent output
+    switched off (``agents.verbose``). Each run gets a row with its state,
+    elapsed time, task count, LLM tokens and retries (failed LLM or tool
+    calls the agents went on from); with ``detail`` each task gets its own
+    row beneath. On a terminal the view is redrawn in place every
+    ``interval`` seconds; otherwise a line is printed as each task or run
+    finishes.
+    """
+
+    def __init__(self, detail: bool = True, stream: Optional[TextIO] = None, interval: float = 0.5):
+        self.detail = detail
+        self.interval = interval
+        self._stream = stream
+        self.rows: List[RunProgress] = []
+        self.runs: Dict[str, RunProgress] = {}
+        self._expected: Dict[str, RunProgress] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._drawn = 0
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream or sys.stdout
+
+    @property
+    def live(self) -> bool:
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    def expect(self, organization: str) -> None:
+        """Show an organization's run as pending before it starts, e.g. while a batch is queued."""
+        with self._lock:
+            row = self._expected[organization] = RunProgress(organization)
+            self.rows.append(row)
+
+    def __enter__(self) -> "ProgressView":
+        events.add_listener(self.on_event)
+        if self.live:
+            self._thread = threading.Thread(target=self._refresh, name="esg-progress", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        events.remove_listener(self.on_event)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.draw()
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        """Update the view's state from one run event."""
+        kind = event["ev"]
+        lines: List[str] = []
+        with self._lock:
+            run = self.runs.get(event["run"])
+            if kind == "run_start":
+                name = event.get("organization") or event["run"]
+                run = self._expected.pop(name, None)
+                if run is None:
+                    run = RunProgress(name)
+                    self.rows.append(run)
+                self.runs[event["run"]] = run
+                run.start()
+                return
+            if run is None:
+                return  # Started before the view
+            if kind == "plan":
+                for name in event["tasks"]:
+                    run.tasks.append(ProgressRow(name))
+            elif kind == "task_start":
+                run.current = run.task(event["name"])
+                run.current.start()
+            elif kind == "task_end" and run.current is not None:
+                run.current.finish(bool(event.get("error")))
+                if self.detail:
+                    lines.append(self._task_line(run, run.current))
+                run.current = None
+            elif kind == "llm" or kind == "tool":
+                tokens = (event.get("in_tokens") or 0) + (event.get("out_tokens") or 0)
+                retry = 1 if event.get("error") else 0
+                for row in (run, run.current):
+                    if row is not None:
+                        row.tokens += tokens
+                        row.retries += retry
+            elif kind == "run_end":
+                run.finish(event.get("status") == "error")
+                lines.append(self._run_line(run))
+        if lines and not self.live:
+            self.stream.write("".join(line + "\n" for line in lines))
+
+    def _run_line(self, run: RunProgress) -> str:
+        done = sum(1 for task in run.tasks if task.state in ("done", "failed"))
+        tasks = f"task {done}/{len(run.tasks)}" if run.tasks else ""
+        return (f"{run.name[:30]:<30} {run.state:<8} {_format_elapsed(run.elapsed):>6} "
+                f"{tasks:<11} tokens {run.tokens:>8,} retries {run.retries}")
+
+    def _task_line(self, run: RunProgress, task: ProgressRow) -> str:
+        name = f"{run.name}: {task.name}" if not self.live else task.name
+        if task.state == "pending":
+            return f"  {name[:60]:<60} pending"
+        return (f"  {name[:60]:<60} {task.state:<8} {_format_elapsed(task.elapsed):>6} "
+                f"tokens {task.tokens:>8,} retries {task.retries}")
+
+    def render(self) -> List[str]:
+        """Current view, one line per run and, with ``detail``, per task."""
+        with self._lock:
+            lines = []
+            for run in self.rows:
+                lines.append(self._run_line(run))
+                if self.detail:
+                    lines.extend(self._task_line(run, task) for task in run.tasks)
+            return lines
+
+    def draw(self) -> None:
+        """Redraw the view in place of the previous drawing."""
+        lines = self.render()
+        # Move to the first line of the previous drawing, then overwrite and clear each line
+        out = f"\x1b[{self._drawn}F" if self._drawn else ""
+        out += "".join(f"{line}\x1b[K\n" for line in lines)
+        if len(lines) < self._drawn:
+            out += "\x1b[J"
+        self.stream.write(out)
+        self.stream.flush()
+        self._drawn = len(lines)
+
+    def _refresh(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.draw()
@@ -0,0 +1,559 @@
+"""Report rendering engine for ESG Implementation."""
+import hashlib
+import html
+import io
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, TextIO, Tuple, Union
+
+from . import metrics
+from .metric_table import MetricTable
+from .validation import is_emissions
+
+CATEGORIES = ("Environmental", "Social", "Governance")
+
+class SectionSpec(NamedTuple):
+    """A section in a framework layout."""
+    kind: str
+    title: str
+    category: Optional[str] = None
+
+# Section layouts for each supported reporting framework
+FRAMEWORK_LAYOUTS: Dict[str, Tuple[SectionSpec, ...]] = {
+    "GRI": (
+        SectionSpec("overview", "GRI 2: General Disclosures"),
+        SectionSpec("stakeholders", "GRI 2-29: Approach to Stakeholder Engagement"),
+        SectionSpec("materiality", "GRI 3: Material Topics"),
+        SectionSpec("metrics", "GRI 300: Environmental Topics", "Environmental"),
+        SectionSpec("metrics", "GRI 400: Social Topics", "Social"),
+        SectionSpec("metrics", "GRI 2-9: Governance", "Governance"),
+        SectionSpec("initiatives", "GRI 3-3: Management of Material Topics"),
+    ),
+    "SASB": (
+        SectionSpec("overview", "Introduction"),
+        SectionSpec("materiality", "Sustainability Disclosure Topics"),
+        SectionSpec("metrics", "Environment", "Environmental"),
+        SectionSpec("metrics", "Social Capital and Human Capital", "Social"),
+        SectionSpec("metrics", "Leadership and Governance", "Governance"),
+        SectionSpec("initiatives", "Activity Metrics and Initiatives"),
+    ),
+    "TCFD": (
+        SectionSpec("overview", "Introduction"),
+        SectionSpec("goals", "Governance", "Governance"),
+        SectionSpec("goals", "Strategy", "Environmental"),
+        SectionSpec("materiality", "Risk Management", "Environmental"),
+        SectionSpec("metrics", "Metrics and Targets", "Environmental"),
+        SectionSpec("initiatives", "Transition Plan"),
+    ),
+}
+
+# Markup primitives for each output format
+FORMAT_MARKUP: Dict[str, Dict[str, str]] = {
+    "markdown": {
+        "document_start": "",
+        "document_end": "",
+        "title": "# {}\n\n",
+        "heading": "## {}\n\n",
+        "subheading": "### {}\n\n",
+        "paragraph": "{}\n\n",
+        "empty": "_{}_\n\n",
+        "list_start": "",
+        "item": "- {}\n",
+        "list_end": "\n",
+        "table_start": "| Metric | Value | Target | Progress | Unit | Source |\n|---|---|---|---|---|---|\n",
+        "row": "| {} | {} | {} | {} | {} | {} |\n",
+        "table_end": "\n",
+    },
+    "html": {
+        "document_start": "<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{}</title></head>\n<body>\n",
+        "document_end": "</body>\n</html>\n",
+        "title": "<h1>{}</h1>\n",
+        "heading": "<h2>{}</h2>\n",
+        "subheading": "<h3>{}</h3>\n",
+        "paragraph": "<p>{}</p>\n",
+        "empty": "<p><em>{}</em></p>\n",
+        "list_start": "<ul>\n",
+        "item": "<li>{}</li>\n",
+        "list_end": "</ul>\n",
+        "table_start": "<table>\n<tr><th>Metric</th><th>Value</th><th>Target</th><th>Progress</th><th>Unit</th><th>Source</th></tr>\n",
+        "row": "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>\n",
+        "table_end": "</table>\n",
+    },
+}
+
+def _escape_markdown(text: Any) -> str:
+    """Escape text for use inside a markdown table or list."""
+    return str(text).replace("|", "\\|").replace("\n", " ")
+
+def _escape_html(text: Any) -> str:
+    return html.escape(str(text))
+
+ESCAPERS: Dict[str, Callable[[Any], str]] = {
+    "markdown": _escape_markdown,
+    "html": _escape_html,
+}
+
+def _format_value(value: Any) -> str:
+    if value is None:
+        return "n/a"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _materiality(issue: Mapping[str, Any]) -> float:
+    """Materiality score, derived from importance ratings when unscored."""
+    score = issue.get("materiality_score")
+    if not score and issue.get("importance_to_business") is not None:
+        return (issue["importance_to_business"] + (issue.get("importance_to_stakeholders") or 0)) / 2
+    return float(score or 0)
+
+def _progress(current: Any, target: Any, reduction: bool = False) -> str:
+    """Progress towards target; for reduction targets, the target as a share of the current value."""
+    if not isinstance(current, (int, float)) or not isinstance(target, (int, float)):
+        return "n/a"
+    if reduction:
+        if current <= target:
+            return "100%"
+        # Above a negative (net removal) target with no positive value to divide by
+        return f"{target / current * 100:.0f}%" if current > 0 else "n/a"
+    if not target:
+        return "n/a"
+    return f"{current / target * 100:.0f}%"
+
+class ReportAggregates:
+    """Aggregations shared by every framework, built in a single pass over the data.
+
+    Metrics and material issues are grouped by category once. Rows are
+    formatted (value, target, target progress) on first use per category and
+    then reused, so rendering several frameworks or formats from the same
+    aggregates never re-scans or re-formats the data, and rendering a single
+    section only formats that section's rows.
+    """
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.name: str = data.get("name", "Organization")
+        self.vision: Mapping[str, Any] = data.get("vision") or {}
+        self.stakeholders: List[Mapping[str, Any]] = list(data.get("stakeholders") or [])
+        # The monolith schema stores initiatives as "actions"
+        self.initiatives: List[Mapping[str, Any]] = list(data.get("initiatives") or data.get("actions") or [])
+
+        metrics = data.get("metrics")
+        self.metrics_by_category: Dict[Optional[str], Union[List[Mapping[str, Any]], MetricTable]] = {}
+        if isinstance(metrics, MetricTable):
+            # Grouped with array operations; rows are formatted straight from the columns
+            self.metrics_by_category.update(metrics.group_by("category"))
+        else:
+            for metric in metrics or []:
+                self.metrics_by_category.setdefault(metric.get("category"), []).append(metric)
+
+        self.issues_by_category: Dict[Optional[str], List[Mapping[str, Any]]] = {None: []}
+        for issue in data.get("material_issues") or []:
+            self.issues_by_category[None].append(issue)
+            self.issues_by_category.setdefault(issue.get("category"), []).append(issue)
+
+        self.status_counts: Counter = Counter(i.get("status", "planned") for i in self.initiatives)
+        self._metric_rows: Dict[Optional[str], List[Tuple[str, ...]]] = {}
+        self._issue_lines: Dict[Optional[str], List[str]] = {}
+        self._fingerprints: Dict[Tuple[str, Optional[str]], str] = {}
+
+    def metric_rows(self, category: Optional[str]) -> List[Tuple[str, ...]]:
+        """Formatted table rows for the metrics in a category."""
+        rows = self._metric_rows.get(category)
+        metrics = self.metrics_by_category.get(category, [])
+        if rows is None and isinstance(metrics, MetricTable):
+            rows = self._metric_rows[category] = _table_rows(metrics)
+        elif rows is None:
+            rows = self._metric_rows[category] = [
+                (
+                    metric.get("name", ""),
+                    _format_value(metric.get("current_value")),
+                    _format_value(metric.get("target_value")),
+                    _progress(
+                        metric.get("current_value"), metric.get("target_value"),
+                        is_emissions(metric.get("name", ""), metric.get("unit", ""))
+                    ),
+                    metric.get("unit", ""),
+                    metric.get("data_source", "")
+                )
+                for metric in metrics
+            ]
+        return rows
+
+    def issue_lines(self, category: Optional[str]) -> List[str]:
+        """Formatted list entries for material issues in a category (None for all)."""
+        lines = self._issue_lines.get(category)
+        if lines is None:
+            lines = self._issue_lines[category] = [
+                f"{issue.get('name')} ({issue.get('category', 'Unknown')}) - "
+                f"Materiality Score: {_materiality(issue):.1f}/10"
+                for issue in self.issues_by_category.get(category, [])
+            ]
+        return lines
+
+    def fingerprint(self, section: "SectionSpec") -> str:
+        """Digest of the data a section depends on."""
+        key = (section.kind, section.category)
+        digest = self._fingerprints.get(key)
+        if digest is None:
+            digest = self._fingerprints[key] = _digest(self.section_data(section))
+        return digest
+
+    def section_data(self, section: "SectionSpec") -> Any:
+        """The slice of the data a section is rendered from."""
+        if section.kind == "overview":
+            return [self.name, self.vision.get("vision_statement")]
+        if section.kind == "goals":
+            return self.vision.get(f"{(section.category or '').lower()}_goals")
+        if section.kind == "stakeholders":
+            return self.stakeholders
+        if section.kind == "materiality":
+            return self.issues_by_category.get(section.category, [])
+        if section.kind == "metrics":
+            return self.metrics_by_category.get(section.category, [])
+        if section.kind == "initiatives":
+            return self.initiatives
+        raise ValueError(f"Unknown section kind: {section.kind}")
+
+def _table_rows(table: MetricTable) -> List[Tuple[str, ...]]:
+    """Formatted table rows for a metric table, computed column-wise."""
+    def values(column: str) -> List[Optional[float]]:
+        return [None if v != v else v for v in table.values[column].tolist()]
+
+    current, target = values("current_value"), values("target_value")
+    progress = table.progress()
+    return list(zip(
+        table.column("name").tolist(),
+        map(_format_value, current),
+        map(_format_value, target),
+        ["n/a" if p != p else f"{p:.0f}%" for p in progress.tolist()],
+        table.column("unit").tolist(),
+        table.column("data_source").tolist()
+    ))
+
+def _digest(value: Any) -> str:
+    if isinstance(value, MetricTable):
+        return value.digest()
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+class CompiledTemplate:
+    """A framework layout bound to the markup of one output format.
+
+    Markup strings are resolved to bound ``str.format`` methods once at
+    compile time, so rendering is a single pass of direct ``write`` calls
+    with no intermediate string concatenation.
+    """
+
+    def __init__(self, framework: str, output_format: str):
+        if framework not in FRAMEWORK_LAYOUTS:
+            raise ValueError(f"Unsupported framework: {framework}")
+        if output_format not in FORMAT_MARKUP:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.framework = framework
+        self.output_format = output_format
+        self.sections = FRAMEWORK_LAYOUTS[framework]
+        self.escape = ESCAPERS[output_format]
+        self.markup: Dict[str, Callable[..., str]] = {
+            key: template.format for key, template in FORMAT_MARKUP[output_format].items()
+        }
+        self.renderers: Dict[str, Callable[[ReportAggregates, SectionSpec, Callable[[str], Any]], None]] = {
+            "overview": self._render_overview,
+            "goals": self._render_goals,
+            "stakeholders": self._render_stakeholders,
+            "materiality": self._render_materiality,
+            "metrics": self._render_metrics,
+            "initiatives": self._render_initiatives,
+        }
+
+    def render(self, aggregates: ReportAggregates, write: Callable[[str], Any], date: Optional[str] = None) -> None:
+        """Render a full report from ``aggregates`` through ``write``."""
+        title = self.report_title(aggregates, date)
+        markup = self.markup
+        write(markup["document_start"](self.escape(title)))
+        write(markup["title"](self.escape(title)))
+        for section in self.sections:
+            self.render_section(aggregates, section, write)
+        write(markup["document_end"]())
+
+    def render_section(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        """Render one section of the layout through ``write``."""
+        write(self.markup["heading"](self.escape(section.title)))
+        self.renderers[section.kind](aggregates, section, write)
+
+    def report_title(self, aggregates: ReportAggregates, date: Optional[str] = None) -> str:
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        return f"{aggregates.name} ESG Report ({self.framework}) - {date}"
+
+    def _write_list(self, items: Iterable[str], write: Callable[[str], Any], empty: str) -> None:
+        markup, escape = self.markup, self.escape
+        started = False
+        for item in items:
+            if not started:
+                write(markup["list_start"]())
+                started = True
+            write(markup["item"](escape(item)))
+        if started:
+            write(markup["list_end"]())
+        else:
+            write(markup["empty"](escape(empty)))
+
+    def _render_overview(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        write(self.markup["subheading"](self.escape("Executive Summary")))
+        write(self.markup["paragraph"](self.escape(f"{aggregates.name} is committed to its ESG journey.")))
+        if aggregates.vision.get("vision_statement"):
+            write(self.markup["paragraph"](self.escape(f"Our ESG vision: {aggregates.vision['vision_statement']}")))
+
+    def _render_goals(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        goals = aggregates.vision.get(f"{(section.category or '').lower()}_goals") or []
+        self._write_list(goals, write, f"No {(section.category or 'ESG').lower()} goals defined yet.")
+
+    def _render_stakeholders(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        items = (
+            f"{s.get('name')} ({s.get('category', 'Unknown')}) - Influence: {s.get('influence_level', 0)}/10"
+            for s in aggregates.stakeholders
+        )
+        self._write_list(items, write, "No stakeholders identified yet.")
+
+    def _render_materiality(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        self._write_list(aggregates.issue_lines(section.category), write, "No material issues assessed yet.")
+
+    def _render_metrics(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        self.write_metric_rows(aggregates.metric_rows(section.category), write, f"No {(section.category or '').lower()} metrics collected yet.")
+
+    def write_metric_rows(self, rows: Iterable[Tuple[str, ...]], write: Callable[[str], Any], empty: str) -> None:
+        """Write pre-formatted metric rows as a table, or the ``empty`` note if there are none."""
+        markup, escape = self.markup, self.escape
+        row = markup["row"]
+        started = False
+        for cells in rows:
+            if not started:
+                write(markup["table_start"]())
+                started = True
+            write(row(*map(escape, cells)))
+        if started:
+            write(markup["table_end"]())
+        else:
+            write(markup["empty"](escape(empty)))
+
+    def _render_initiatives(self, aggregates: ReportAggregates, section: SectionSpec, write: Callable[[str], Any]) -> None:
+        markup, escape = self.markup, self.escape
+        if not aggregates.initiatives:
+            write(markup["empty"](escape("No initiatives defined yet.")))
+            return
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(aggregates.status_counts.items()))
+        write(markup["paragraph"](escape(f"{len(aggregates.initiatives)} initiatives: {summary}")))
+        for initiative in aggregates.initiatives:
+            responsible = initiative.get("responsible_team") or initiative.get("responsible_party", "")
+            write(markup["subheading"](escape(initiative.get("name", ""))))
+            write(markup["list_start"]())
+            write(markup["item"](escape(f"Status: {initiative.get('status', 'planned')}")))
+            write(markup["item"](escape(f"Description: {initiative.get('description', '')}")))
+            write(markup["item"](escape(f"Timeline: {initiative.get('timeline', '')}")))
+            write(markup["item"](escape(f"Responsible: {responsible}")))
+            write(markup["list_end"]())
+
+@lru_cache(maxsize=None)
+def compile_template(framework: str, output_format: str = "markdown") -> CompiledTemplate:
+    """Get the compiled template for a framework and output format."""
+    return CompiledTemplate(framework.upper(), output_format.lower())
+
+class ReportEngine:
+    """Renders ESG reports from precompiled framework templates."""
+
+    def __init__(self, framework: str = "GRI", output_format: str = "markdown"):
+        self.template = compile_template(framework, output_format)
+
+    def render(
+        self,
+        data: Union[Mapping[str, Any], ReportAggregates],
+        out: Optional[TextIO] = None,
+        date: Optional[str] = None
+    ) -> Optional[str]:
+        """Render a report.
+
+        Args:
+            data: ESG data to include in the report, or aggregates already built from it
+            out: Stream to write to. If None, the report is returned as a string.
+            date: Report date (defaults to today)
+
+        Returns:
+            Optional[str]: The report content when no stream was given
+        """
+        aggregates = data if isinstance(data, ReportAggregates) else ReportAggregates(data)
+        if out is not None:
+            self.template.render(aggregates, out.write, date)
+            return None
+        buffer = io.StringIO()
+        self.template.render(aggregates, buffer.write, date)
+        return buffer.getvalue()
+
+    def render_to_file(
+        self,
+        data: Union[Mapping[str, Any], ReportAggregates],
+        filepath: str,
+        date: Optional[str] = None
+    ) -> Path:
+        """Render a report straight to a file without holding it in memory."""
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf-8') as f:
+            self.render(data, f, date)
+        return path
+
+FILE_EXTENSIONS = {"markdown": "md", "html": "html"}
+
+def render_reports(
+    data: Union[Mapping[str, Any], ReportAggregates],
+    frameworks: Sequence[str] = ("GRI", "SASB", "TCFD"),
+    output_format: str = "markdown",
+    output_dir: Optional[str] = None,
+    parallel: bool = False,
+    date: Optional[str] = None
+) -> Dict[str, str]:
+    """Render several frameworks from one set of shared aggregations.
+
+    Args:
+        data: ESG data to report on, or aggregates already built from it
+        frameworks: Frameworks to render
+        output_format: Output format for every report (markdown, html)
+        output_dir: If given, each report is written to
+                    ``<organization>_<framework>.<ext>`` in this directory
+        parallel: Render frameworks concurrently in a thread pool
+        date: Report date (defaults to today)
+
+    Returns:
+        Dict[str, str]: Framework to report content, or to file path when
+        writing to ``output_dir``
+    """
+    aggregates = data if isinstance(data, ReportAggregates) else ReportAggregates(data)
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    # Each framework once: duplicates would render, and in parallel write, the same file twice
+    frameworks = list(dict.fromkeys(frameworks))
+    slug = aggregates.name.lower().replace(' ', '_')
+
+    def render_one(framework: str) -> str:
+        engine = ReportEngine(framework, output_format)
+        if output_dir is None:
+            return engine.render(aggregates, date=date)
+        filepath = Path(output_dir) / f"{slug}_{framework.lower()}.{FILE_EXTENSIONS[output_format]}"
+        return str(engine.render_to_file(aggregates, str(filepath), date=date))
+
+    # Compile up front so unsupported frameworks fail before any rendering starts
+    for framework in frameworks:
+        compile_template(framework, output_format)
+    if parallel and len(frameworks) > 1:
+        with ThreadPoolExecutor(max_workers=len(frameworks)) as executor:
+            return dict(zip(frameworks, executor.map(render_one, frameworks)))
+    return {framework: render_one(framework) for framework in frameworks}
+
+def section_key(section: SectionSpec) -> str:
+    """Stable identifier of a section within a framework layout."""
+    return f"{section.kind}:{section.category or '*'}"
+
+def render_incremental(
+    data: Union[Mapping[str, Any], ReportAggregates],
+    framework: str = "GRI",
+    output_format: str = "markdown",
+    previous: Optional[Mapping[str, Any]] = None,
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """Render a report, reusing sections of a previous report whose data is unchanged.
+
+    Each section is stored as a fingerprint of the data it depends on (for
+    example the Environmental metrics, or the initiatives) and its span in
+    ``content``, so the stored report holds the rendered text only once.
+    Only sections whose fingerprint differs from ``previous`` are
+    re-rendered; the rest are sliced out of the stored report's content.
+
+    Args:
+        data: ESG data to report on, or aggregates already built from it
+        framework: Reporting framework (GRI, SASB, TCFD)
+        output_format: Output format (markdown, html)
+        previous: A report previously returned by this function
+        date: Report date (defaults to today)
+
+    Returns:
+        Dict[str, Any]: Report record with title, framework, date, format,
+        content, per-section fingerprints and spans, and the keys of the
+        sections that had to be re-rendered
+    """
+    aggregates = data if isinstance(data, ReportAggregates) else ReportAggregates(data)
+    template = compile_template(framework, output_format)
+    date = date or datetime.now().strftime("%Y-%m-%d")
+
+    cached: Dict[str, Mapping[str, Any]] = {}
+    previous_content = ""
+    if previous and previous.get("framework") == template.framework and previous.get("format") == template.output_format:
+        cached = {entry["key"]: entry for entry in previous.get("sections") or []}
+        previous_content = previous.get("content") or ""
+
+    title = template.report_title(aggregates, date)
+    markup, escape = template.markup, template.escape
+    parts = [markup["document_start"](escape(title)), markup["title"](escape(title))]
+    offset = sum(map(len, parts))
+    sections: List[Dict[str, Any]] = []
+    rendered: List[str] = []
+    for section in template.sections:
+        key = section_key(section)
+        fingerprint = aggregates.fingerprint(section)
+        entry = cached.get(key)
+        text = None
+        if entry is not None and entry.get("fingerprint") == fingerprint and "end" in entry:
+            text = previous_content[entry["start"]:entry["end"]]
+            # A span that no longer frames this section (edited content) is re-rendered
+            if not text.startswith(markup["heading"](escape(section.title))):
+                text = None
+        if previous is not None:
+            metrics.cache_lookup("report_section", text is not None)
+        if text is None:
+            buffer = io.StringIO()
+            template.render_section(aggregates, section, buffer.write)
+            text = buffer.getvalue()
+            rendered.append(key)
+        parts.append(text)
+        sections.append({"key": key, "fingerprint": fingerprint, "start": offset, "end": offset + len(text)})
+        offset += len(text)
+    parts.append(markup["document_end"]())
+    content = "".join(parts)
+    return {
+        "title": title,
+        "framework": template.framework,
+        "date": date,
+        "format": template.output_format,
+        "content": content,
+        "sections": sections,
+        "rendered_sections": rendered
+    }
+
+def update_stored_report(
+    reports: List[Dict[str, Any]],
+    data: Union[Mapping[str, Any], ReportAggregates],
+    framework: str = "GRI",
+    output_format: str = "markdown",
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """Regenerate the stored report for a framework and splice it into ``reports``.
+
+    The latest stored report with the same framework and format is replaced
+    in place; if there is none, the new report is appended.
+    """
+    template = compile_template(framework, output_format)
+    index = next(
+        (
+            i for i in range(len(reports) - 1, -1, -1)
+            if reports[i].get("framework") == template.framework
+            and reports[i].get("format", "markdown") == template.output_format
+        ),
+        None
+    )
+    previous = reports[index] if index is not None else None
+    report = render_incremental(data, framework, output_format, previous, date)
+    if index is None:
+        reports.append(report)
+    else:
+        reports[index] = report
+    return report
@@ -0,0 +1,641 @@
+"""Storage backends for ESG organizations."""
+import abc
+import json
+import logging
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from pydantic import BaseModel, TypeAdapter
+
+from . import serialization
+from .changelog import ChangeLog, Operation, apply_operation, diff, validate_operation
+from .lazy import FIELD_ADAPTERS, LazyOrganization
+from .locking import file_lock
+from .models import ESGMetric, ESGOrganization, ESGVision, Initiative, MaterialIssue, Stakeholder
+
+SECTIONS: Tuple[str, ...] = ("stakeholders", "material_issues", "metrics", "initiatives", "reports")
+
+def organization_slug(name: str) -> str:
+    """File-name form of an organization name."""
+    return name.lower().replace(' ', '_')
+
+class ConcurrentModificationError(Exception):
+    """A checked save found the stored organization changed since it was loaded."""
+
+    def __init__(self, name: str, expected: int, actual: int):
+        super().__init__(f"Organization {name} is at revision {actual}, expected {expected}")
+        self.name = name
+        self.expected = expected
+        self.actual = actual
+
+class PartialOrganizationError(ValueError):
+    """A save was given an organization loaded with only some of its sections."""
+
+    def __init__(self, name: str, sections: Iterable[str]):
+        super().__init__(
+            f"Organization {name} was loaded with only {', '.join(sorted(sections)) or 'no'} sections; "
+            "record changes to it with apply() instead of saving it"
+        )
+        self.name = name
+
+def require_complete(organization: ESGOrganization) -> None:
+    """Raise ``PartialOrganizationError`` if only some of an organization's sections were loaded."""
+    if organization.loaded_sections is not None:
+        raise PartialOrganizationError(organization.name, organization.loaded_sections)
+
+class OrganizationRepository(abc.ABC):
+    """Interface shared by the organization storage backends.
+
+    Concurrency is optimistic: ``revision`` versions the stored state, and a
+    save given ``expected_revision`` only succeeds if the stored revision
+    still matches (a missing organization counts as revision 0). Conflicting
+    writers either retry from fresh data (``update``) or merge their
+    changes into the newer state (``merge``).
+    """
+
+    @abc.abstractmethod
+    def load(self, name: str, sections: Optional[Iterable[str]] = None) -> Optional[ESGOrganization]:
+        """Load an organization, or None if it is not stored.
+
+        Args:
+            name: Organization name
+            sections: List sections to load (see ``SECTIONS``). Others are
+                      left empty and the result is marked partial, so it
+                      cannot be saved. All sections if None.
+        """
+
+    @abc.abstractmethod
+    def save(self, organization: ESGOrganization, expected_revision: Optional[int] = None) -> Path:
+        """Store an organization, replacing any previous version. Returns the storage path.
+
+        Args:
+            organization: Organization to store
+            expected_revision: Revision the changes were based on. If given,
+                               the save fails with ``ConcurrentModificationError``
+                               when the stored revision differs, and otherwise
+                               advances ``organization.revision`` by one.
+
+        Raises:
+            PartialOrganizationError: If the organization was loaded with only
+                                      some sections; saving it would erase the others
+        """
+
+    @abc.abstractmethod
+    def path_for(self, name: str) -> Path:
+        """Storage path of an organization."""
+
+    @abc.abstractmethod
+    def list_organizations(self) -> List[str]:
+        """Names of all stored organizations."""
+
+    def apply(self, name: str, operations: Iterable[Operation]) -> int:
+        """Apply change-log operations to an organization, creating it if needed.
+
+        Returns:
+            int: The organization's revision after the changes
+
+        Raises:
+            KeyError: If an operation updates a record that does not exist.
+                      ``FileRepository`` appends without reading the stored
+                      records, so it skips such updates on replay instead.
+            ValueError: If an operation's values fail validation. Nothing is
+                        recorded when any operation fails.
+        """
+        operations = list(operations)
+
+        def change(organization: ESGOrganization) -> None:
+            for operation in operations:
+                apply_operation(organization, operation)
+        return self.update(name, change).revision
+
+    def update(
+        self,
+        name: str,
+        change: Callable[[ESGOrganization], Any],
+        retries: int = 10
+    ) -> ESGOrganization:
+        """Read-modify-write an organization, retrying from fresh data on conflict.
+
+        Args:
+            name: Organization name; created if not stored
+            change: Modifies the loaded organization in place. It may run
+                    more than once, so it should have no other side effects.
+            retries: Conflicts tolerated before ``ConcurrentModificationError``
+                     is raised
+
+        Returns:
+            ESGOrganization: The organization as saved
+        """
+        conflicts = 0
+        while True:
+            organization = self.load(name) or ESGOrganization(name=name)
+            expected = organization.revision
+            change(organization)
+            try:
+                self.save(organization, expected_revision=expected)
+                return organization
+            except ConcurrentModificationError:
+                conflicts += 1
+                if conflicts > retries:
+                    raise
+
+    def merge(self, organization: ESGOrganization, base: ESGOrganization) -> Path:
+        """Save an organization modified from ``base``, merging with concurrent changes.
+
+        If the stored organization is still at ``base.revision`` this is a
+        checked save. Otherwise the differences between ``base`` and
+        ``organization`` are applied on top of the stored state as change-log
+        operations; where both sides changed the same record, this side's
+        version wins.
+
+        Returns:
+            Path: The storage path
+        """
+        try:
+            return self.save(organization, expected_revision=base.revision)
+        except ConcurrentModificationError as e:
+            logging.getLogger(__name__).info(f"Merging concurrent changes: {e}")
+            organization.revision = self.apply(organization.name, diff(base, organization))
+            return self.path_for(organization.name)
+
+class FileRepository(OrganizationRepository):
+    """One serialized snapshot file per organization in a directory.
+
+    Changes recorded with ``apply`` are validated on their own, then
+    appended to a per-organization change log and replayed on load, so
+    small updates never read or rewrite the snapshot. The log is
+    folded into a new snapshot once it outgrows the snapshot itself, which
+    keeps replay cost proportional to the data.
+
+    Writers of an organization (saves, appends and compactions) hold its
+    advisory lock file; readers take no lock, since snapshots are replaced
+    atomically and replay skips operations a snapshot already holds.
+    """
+
+    # The log is never compacted below this size
+    COMPACT_MIN_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        data_path: Union[str, Path],
+        codec: str = "json",
+        compression: Optional[str] = None,
+        durable: bool = True
+    ):
+        self.data_path = Path(data_path)
+        self.codec = codec
+        self.compression = compression
+        self.durable = durable
+        # Fail on an unknown or read-only codec now rather than at the first save
+        serialization.file_extension(codec, compression)
+
+    def path_for(self, name: str) -> Path:
+        """Data file of an organization, falling back to an existing legacy JSON or marshal file."""
+        return self._path_for_slug(organization_slug(name))
+
+    def _path_for_slug(self, slug: str) -> Path:
+        path = self.data_path / f"{slug}_esg_data{serialization.file_extension(self.codec, self.compression)}"
+        if not path.exists():
+            for extension in (".json", *(codec.extension for codec in serialization.LEGACY_CODECS.values())):
+                legacy_path = self.data_path / f"{slug}_esg_data{extension}"
+                if legacy_path.exists():
+                    return legacy_path
+        return path
+
+    def lock_for(self, name: str) -> Path:
+        """Lock file guarding writes to an organization."""
+        return self.data_path / f".{organization_slug(name)}_esg_data.lock"
+
+    def changelog_for(self, name: str) -> ChangeLog:
+        """Change log of an organization."""
+        return ChangeLog(self.data_path / f"{organization_slug(name)}_esg_changes.jsonl", durable=self.durable)
+
+    def _load_snapshot(self, name: str, sections: Optional[List[str]]) -> Optional[ESGOrganization]:
+        path = self.path_for(name)
+        if not path.exists() or path.stat().st_size == 0:
+            return None
+        if sections is None:
+            return serialization.load(path)
+        # Only the requested sections are parsed
+        with LazyOrganization(path) as view:
+            return view.to_organization(sections)
+
+    def load(self, name: str, sections: Optional[Iterable[str]] = None) -> Optional[ESGOrganization]:
+        if sections is not None:
+            sections = list(sections)
+            unknown = set(sections) - set(SECTIONS)
+            if unknown:
+                raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        organization = self._load_snapshot(name, sections)
+        changelog = self.changelog_for(name)
+        if not changelog.size():
+            return organization
+        if organization is None:
+            organization = ESGOrganization(name=name)
+            if sections is not None:
+                organization.mark_partial(sections)
+        return changelog.replay(organization, None if sections is None else set(sections))
+
+    def save(self, organization: ESGOrganization, expected_revision: Optional[int] = None) -> Path:
+        require_complete(organization)
+        with file_lock(self.lock_for(organization.name)):
+            if expected_revision is not None:
+                actual = self.current_revision(organization.name)
+                if actual != expected_revision:
+                    raise ConcurrentModificationError(organization.name, expected_revision, actual)
+                organization.revision = expected_revision + 1
+            try:
+                return self._write_snapshot(organization)
+            except BaseException:
+                if expected_revision is not None:
+                    organization.revision = expected_revision
+                raise
+
+    def _write_snapshot(self, organization: ESGOrganization) -> Path:
+        path = self.data_path / f"{organization_slug(organization.name)}_esg_data{serialization.file_extension(self.codec, self.compression)}"
+        path = serialization.save(organization, path, self.codec, self.compression)
+        # The snapshot now holds every logged change
+        self.changelog_for(organization.name).clear()
+        return path
+
+    def current_revision(self, name: str) -> int:
+        """Latest revision of an organization, read from the log tail or the snapshot."""
+        revision = self.changelog_for(name).last_revision()
+        if revision is not None:
+            return revision
+        path = self.path_for(name)
+        if not path.exists() or path.stat().st_size == 0:
+            return 0
+        with LazyOrganization(path) as view:
+            return view.revision
+
+    def apply(self, name: str, operations: Iterable[Operation]) -> int:
+        """Append change-log operations to an organization's log.
+
+        Operations are validated on their own, without reading the stored
+        organization, so an append costs O(change). An update of a record
+        that does not exist therefore cannot be detected here; replay skips
+        it with a warning, and the next compaction drops it.
+
+        Raises:
+            ValueError: If an operation's values fail validation. Nothing is
+                        recorded when any operation fails.
+        """
+        operations = list(operations)
+        for operation in operations:
+            validate_operation(operation)
+        # The lock serializes revision numbering
+        with file_lock(self.lock_for(name)):
+            changelog = self.changelog_for(name)
+            revision = changelog.append(operations, self.current_revision(name))
+            path = self.path_for(name)
+            snapshot_size = path.stat().st_size if path.exists() else 0
+            if changelog.size() > max(snapshot_size, self.COMPACT_MIN_BYTES):
+                self._compact(name)
+        return revision
+
+    def compact(self, name: str) -> Optional[Path]:
+        """Fold an organization's change log into a new snapshot."""
+        with file_lock(self.lock_for(name)):
+            return self._compact(name)
+
+    def _compact(self, name: str) -> Optional[Path]:
+        organization = self.load(name)
+        return None if organization is None else self._write_snapshot(organization)
+
+    def list_organizations(self) -> List[str]:
+        # One entry per organization, even when a legacy file sits next to the current one
+        slugs = sorted({
+            path.name.rpartition("_esg_data")[0] for path in self.data_path.glob("*_esg_data*")
+            if not path.name.startswith(".")  # Lock or temporary file of an interrupted save
+        })
+        names = []
+        for slug in slugs:
+            path = self._path_for_slug(slug)
+            try:
+                # Only the name is parsed from JSON files; other formats are decoded whole
+                with LazyOrganization(path) as view:
+                    names.append(view.name)
+            except (ValueError, IOError) as e:
+                logging.getLogger(__name__).warning(f"Skipping unreadable organization file {path}: {e}")
+        return names
+
+# Columns of each section table, after (org_id, position); list fields are stored as JSON text
+SECTION_COLUMNS: Dict[str, Tuple[Type[BaseModel], Tuple[str, ...], Tuple[str, ...]]] = {
+    "stakeholders": (Stakeholder, ("name", "category", "influence_level", "expectations"), ("expectations",)),
+    "material_issues": (MaterialIssue, ("name", "description", "category", "materiality_score"), ()),
+    "metrics": (ESGMetric, ("name", "unit", "data_source", "category", "current_value", "target_value"), ()),
+    "initiatives": (Initiative, ("name", "description", "status", "timeline", "responsible_team",
+                                 "resources_needed", "success_criteria"), ("resources_needed", "success_criteria")),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS organizations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    vision TEXT,
+    reports TEXT NOT NULL DEFAULT '[]',
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stakeholders (
+    org_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    influence_level INTEGER NOT NULL,
+    expectations TEXT NOT NULL,
+    PRIMARY KEY (org_id, position)
+);
+CREATE TABLE IF NOT EXISTS material_issues (
+    org_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    materiality_score REAL NOT NULL,
+    PRIMARY KEY (org_id, position)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    org_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    current_value REAL,
+    target_value REAL,
+    PRIMARY KEY (org_id, position)
+);
+CREATE TABLE IF NOT EXISTS initiatives (
+    org_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    timeline TEXT NOT NULL,
+    responsible_team TEXT NOT NULL,
+    resources_needed TEXT NOT NULL,
+    success_criteria TEXT NOT NULL,
+    PRIMARY KEY (org_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_stakeholders_category ON stakeholders(category);
+CREATE INDEX IF NOT EXISTS idx_material_issues_category ON material_issues(category, materiality_score);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(name);
+CREATE INDEX IF NOT EXISTS idx_metrics_category ON metrics(category);
+CREATE INDEX IF NOT EXISTS idx_initiatives_status ON initiatives(status);
+"""
+
+class SQLiteRepository(OrganizationRepository):
+    """Organizations stored as rows in a SQLite database.
+
+    Each list section is its own table keyed by ``(org_id, position)`` and
+    indexed by category (and metric name), so a single section can be loaded
+    on its own and portfolio-wide questions are answered by indexed queries
+    that only materialize the matching records.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.adapters = {section: TypeAdapter(List[model]) for section, (model, _, _) in SECTION_COLUMNS.items()}
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and always closes."""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _values(self, section: str, record: BaseModel) -> List[Any]:
+        _, columns, json_columns = SECTION_COLUMNS[section]
+        values = [getattr(record, column) for column in columns]
+        for i, column in enumerate(columns):
+            if column in json_columns:
+                values[i] = json.dumps(values[i])
+        return values
+
+    def _rows(self, section: str, records: List[BaseModel], org_id: int) -> Iterator[Tuple[Any, ...]]:
+        for position, record in enumerate(records):
+            yield (org_id, position, *self._values(section, record))
+
+    def _records(self, section: str, rows: Iterable[sqlite3.Row]) -> List[BaseModel]:
+        _, columns, json_columns = SECTION_COLUMNS[section]
+        raw = []
+        for row in rows:
+            record = {column: row[column] for column in columns}
+            for column in json_columns:
+                record[column] = json.loads(record[column])
+            raw.append(record)
+        return self.adapters[section].validate_python(raw)
+
+    def path_for(self, name: str) -> Path:
+        return self.path
+
+    def save(self, organization: ESGOrganization, expected_revision: Optional[int] = None) -> Path:
+        require_complete(organization)
+        vision = organization.vision.model_dump_json() if organization.vision else None
+        reports = json.dumps(organization.reports)
+        revision = organization.revision
+        with self.connect() as conn:
+            # Take the write lock before reading the revision, so the check and the write are atomic
+            conn.execute("BEGIN IMMEDIATE")
+            if expected_revision is not None:
+                row = conn.execute("SELECT revision FROM organizations WHERE name = ?", (organization.name,)).fetchone()
+                actual = row[0] if row else 0
+                if actual != expected_revision:
+                    raise ConcurrentModificationError(organization.name, expected_revision, actual)
+                revision = expected_revision + 1
+            conn.execute(
+                "INSERT INTO organizations (name, vision, reports, revision) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET vision = excluded.vision, reports = excluded.reports, "
+                "revision = excluded.revision",
+                (organization.name, vision, reports, revision)
+            )
+            org_id = conn.execute("SELECT id FROM organizations WHERE name = ?", (organization.name,)).fetchone()[0]
+            for section, (_, columns, _) in SECTION_COLUMNS.items():
+                conn.execute(f"DELETE FROM {section} WHERE org_id = ?", (org_id,))
+                placeholders = ", ".join("?" * (len(columns) + 2))
+                conn.executemany(
+                    f"INSERT INTO {section} (org_id, position, {', '.join(columns)}) VALUES ({placeholders})",
+                    self._rows(section, getattr(organization, section), org_id)
+                )
+        organization.revision = revision
+        return self.path
+
+    def apply(self, name: str, operations: Iterable[Operation]) -> int:
+        """Apply change-log operations as row-level changes in one transaction.
+
+        Only the rows the operations touch are read and written. The
+        organization's revision is read and advanced by one in the same
+        ``BEGIN IMMEDIATE`` transaction, so concurrent writers serialize on
+        the database lock and a failing operation leaves nothing behind.
+        """
+        operations = list(operations)
+        for operation in operations:
+            validate_operation(operation)
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO organizations (name) VALUES (?) ON CONFLICT(name) DO NOTHING", (name,))
+            org_id, revision = conn.execute("SELECT id, revision FROM organizations WHERE name = ?", (name,)).fetchone()
+            for operation in operations:
+                self._apply_operation(conn, org_id, operation)
+            conn.execute("UPDATE organizations SET revision = ? WHERE id = ?", (revision + 1, org_id))
+        return revision + 1
+
+    def _apply_operation(self, conn: sqlite3.Connection, org_id: int, operation: Operation) -> None:
+        """The row-level equivalent of ``apply_operation``."""
+        if operation.op == "set":
+            if operation.field not in ("vision", "reports"):
+                raise ValueError(f"Organization field {operation.field} cannot be set")
+            value = FIELD_ADAPTERS[operation.field].validate_python(operation.value)
+            if operation.field == "vision":
+                text = value.model_dump_json() if value else None
+            else:
+                text = json.dumps(value)
+            conn.execute(f"UPDATE organizations SET {operation.field} = ? WHERE id = ?", (text, org_id))
+            return
+        if operation.op == "append":
+            (reports,) = conn.execute("SELECT reports FROM organizations WHERE id = ?", (org_id,)).fetchone()
+            conn.execute("UPDATE organizations SET reports = ? WHERE id = ?",
+                         (json.dumps([*json.loads(reports), operation.record]), org_id))
+            return
+        section = operation.section
+        model, columns, _ = SECTION_COLUMNS[section]
+        row = conn.execute(
+            f"SELECT * FROM {section} WHERE org_id = ? AND name = ? ORDER BY position LIMIT 1", (org_id, operation.name)
+        ).fetchone()
+        if operation.op == "remove":
+            if row is not None:
+                conn.execute(f"DELETE FROM {section} WHERE org_id = ? AND position = ?", (org_id, row["position"]))
+            return
+        if operation.op == "upsert":
+            record = model.model_validate(operation.record)
+        else:
+            if row is None:
+                raise KeyError(f"No {section} record named {operation.name}")
+            current = self._records(section, [row])[0]
+            record = model.model_validate({**current.model_dump(), **operation.changes})
+        values = self._values(section, record)
+        if row is None:
+            # Positions only order the rows, so removals may leave gaps
+            (position,) = conn.execute(
+                f"SELECT COALESCE(MAX(position) + 1, 0) FROM {section} WHERE org_id = ?", (org_id,)
+            ).fetchone()
+            placeholders = ", ".join("?" * (len(columns) + 2))
+            conn.execute(f"INSERT INTO {section} (org_id, position, {', '.join(columns)}) VALUES ({placeholders})",
+                         (org_id, position, *values))
+        else:
+            conn.execute(
+                f"UPDATE {section} SET {', '.join(f'{column} = ?' for column in columns)} WHERE org_id = ? AND position = ?",
+                (*values, org_id, row["position"])
+            )
+
+    def load(self, name: str, sections: Optional[Iterable[str]] = None) -> Optional[ESGOrganization]:
+        wanted = set(SECTIONS if sections is None else sections)
+        unknown = wanted - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        with self.connect() as conn:
+            head = conn.execute(
+                f"SELECT id, name, vision, revision{', reports' if 'reports' in wanted else ''} FROM organizations WHERE name = ?",
+                (name,)
+            ).fetchone()
+            if head is None:
+                return None
+            fields: Dict[str, Any] = {"name": head["name"], "revision": head["revision"]}
+            if head["vision"]:
+                fields["vision"] = ESGVision.model_validate_json(head["vision"])
+            if "reports" in wanted:
+                fields["reports"] = json.loads(head["reports"])
+            for section in SECTION_COLUMNS:
+                if section in wanted:
+                    rows = conn.execute(f"SELECT * FROM {section} WHERE org_id = ? ORDER BY position", (head["id"],))
+                    fields[section] = self._records(section, rows)
+        # Sections were validated record by record above
+        organization = ESGOrganization.model_construct(**fields)
+        if sections is not None:
+            organization.mark_partial(wanted)
+        return organization
+
+    def list_organizations(self) -> List[str]:
+        with self.connect() as conn:
+            return [row[0] for row in conn.execute("SELECT name FROM organizations ORDER BY name")]
+
+    def delete(self, name: str) -> bool:
+        """Remove an organization and its records. Returns whether it existed."""
+        with self.connect() as conn:
+            return conn.execute("DELETE FROM organizations WHERE name = ?", (name,)).rowcount > 0
+
+    def query_metrics(
+        self,
+        name: Optional[str] = None,
+        category: Optional[str] = None,
+        organization: Optional[str] = None,
+        exceeding_target: bool = False
+    ) -> List[Tuple[str, ESGMetric]]:
+        """Find metrics across organizations.
+
+        Args:
+            name: Metric name to match exactly
+            category: ESG category to match
+            organization: Restrict to one organization
+            exceeding_target: Only metrics whose current value is above their target
+
+        Returns:
+            List of ``(organization name, metric)`` pairs, ordered by organization
+        """
+        clauses, params = [], []
+        for column, value in (("m.name", name), ("m.category", category), ("o.name", organization)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if exceeding_target:
+            clauses.append("m.current_value > m.target_value")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT o.name AS organization, m.* FROM metrics m JOIN organizations o ON o.id = m.org_id "
+                f"{where} ORDER BY o.name, m.position",
+                params
+            ).fetchall()
+        return list(zip((row["organization"] for row in rows), self._records("metrics", rows)))
+
+    def query_material_issues(
+        self,
+        category: Optional[str] = None,
+        min_score: Optional[float] = None
+    ) -> List[Tuple[str, MaterialIssue]]:
+        """Find material issues across organizations by category and minimum materiality score."""
+        clauses, params = [], []
+        if category is not None:
+            clauses.append("i.category = ?")
+            params.append(category)
+        if min_score is not None:
+            clauses.append("i.materiality_score >= ?")
+            params.append(min_score)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT o.name AS organization, i.* FROM material_issues i JOIN organizations o ON o.id = i.org_id "
+                f"{where} ORDER BY o.name, i.position",
+                params
+            ).fetchall()
+        return list(zip((row["organization"] for row in rows), self._records("material_issues", rows)))
+
+def create_repository(config: Any) -> OrganizationRepository:
+    """Build the repository selected by an ``ESGConfig``'s storage settings."""
+    storage = config.storage
+    if storage.backend == "file":
+        return FileRepository(config.data_path, storage.codec, storage.compression)
+    if storage.backend == "sqlite":
+        return SQLiteRepository(storage.sqlite_path or Path(config.data_path) / "esg.db")
+    raise ValueError(f"Unsupported storage backend: {storage.backend}")
@@ -0,0 +1,196 @@
+"""Index, compression and retention of run log files."""
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .locking import file_lock
+
+INDEX_NAME = "esg_logs_index.jsonl"
+
+class LogFileInfo(NamedTuple):
+    """Index entry of one log file; times are UNIX timestamps."""
+    file: str
+    run: str
+    opened: float
+    closed: Optional[float] = None
+    bytes: Optional[int] = None
+
+class LogIndex:
+    """JSON Lines index of the run log files in a directory.
+
+    Each line records the current state of one file; replaying the lines in
+    order gives every live file, so a run's logs are found without listing
+    the directory. A line with ``from`` records a rename (such as
+    compression) and one with ``deleted`` a removal. The index is rewritten
+    with only live entries once superseded lines outnumber them. Writes take
+    a lock file, so processes sharing an output directory can share an index.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_NAME
+        self.lock_path = self.directory / f".{INDEX_NAME}.lock"
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with file_lock(self.lock_path), self.path.open('a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _update(self, name: str, change: Callable[[LogFileInfo], Dict[str, Any]]) -> None:
+        # Read and append under one lock, so concurrent updates of a file are not lost
+        with file_lock(self.lock_path):
+            info = self._replay()[0].get(name)
+            if info is not None:
+                with self.path.open('a', encoding='utf-8') as f:
+                    f.write(json.dumps(change(info), separators=(",", ":")) + "\n")
+
+    def opened(self, path: Path, run_id: str) -> None:
+        self._append(LogFileInfo(path.name, run_id, round(time.time(), 3))._asdict())
+
+    def closed(self, path: Path) -> None:
+        size = path.stat().st_size
+        self._update(path.name, lambda info: info._replace(closed=round(time.time(), 3), bytes=size)._asdict())
+
+    def moved(self, source: Path, target: Path) -> None:
+        size = target.stat().st_size
+        self._update(source.name, lambda info: {**info._replace(file=target.name, bytes=size)._asdict(), "from": source.name})
+
+    def deleted(self, path: Path) -> None:
+        self._append({"file": path.name, "deleted": True})
+
+    def _replay(self) -> Tuple[Dict[str, LogFileInfo], int]:
+        files: Dict[str, LogFileInfo] = {}
+        lines = 0
+        if not self.path.exists():
+            return files, lines
+        with self.path.open('r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of a crashed writer
+                lines += 1
+                if record.get("deleted"):
+                    files.pop(record["file"], None)
+                    continue
+                previous = record.pop("from", None)
+                if previous is not None:
+                    files.pop(previous, None)
+                files[record["file"]] = LogFileInfo(**record)
+        return files, lines
+
+    def entries(self) -> Dict[str, LogFileInfo]:
+        """Live log files by file name, in the order they were opened."""
+        return self._replay()[0]
+
+    def find(self, run_id: str) -> List[Path]:
+        """Log files of a run, oldest first."""
+        return [self.directory / info.file for info in self.entries().values() if info.run == run_id]
+
+    def compact(self) -> None:
+        """Rewrite the index with only its live entries if most of its lines are superseded."""
+        with file_lock(self.lock_path):
+            files, lines = self._replay()
+            if lines <= 2 * len(files) + 64:
+                return
+            temp_path = self.path.with_name(f".{self.path.name}.tmp")
+            with temp_path.open('w', encoding='utf-8') as f:
+                for info in files.values():
+                    f.write(json.dumps(info._asdict(), separators=(",", ":")) + "\n")
+            os.replace(temp_path, self.path)
+
+def compress_log(index: LogIndex, path: Path) -> Path:
+    """Gzip a closed log file next to itself, remove the original and record the rename."""
+    target = path.with_name(path.name + ".gz")
+    temp_path = target.with_name(f".{target.name}.tmp")
+    with path.open('rb') as source, gzip.open(temp_path, 'wb') as compressed:
+        shutil.copyfileobj(source, compressed)
+    os.replace(temp_path, target)
+    path.unlink()
+    index.moved(path, target)
+    return target
+
+def apply_retention(index: LogIndex, max_age_days: float = 0, max_files: int = 0) -> List[Path]:
+    """Delete closed log files older than ``max_age_days`` and all but the newest ``max_files``.
+
+    Files of runs still writing are never deleted. Zero disables a limit.
+    Returns the deleted paths.
+    """
+    closed = sorted((info for info in index.entries().values() if info.closed is not None), key=lambda i: i.closed)
+    count = max(len(closed) - max_files, 0) if max_files else 0
+    if max_age_days:
+        cutoff = time.time() - max_age_days * 86400
+        count = max(count, sum(1 for info in closed if info.closed < cutoff))
+    deleted = []
+    for info in closed[:count]:
+        path = index.directory / info.file
+        path.unlink(missing_ok=True)
+        index.deleted(path)
+        deleted.append(path)
+    index.compact()
+    return deleted
+
+class LogMaintenance:
+    """Compresses closed log files and applies retention on a background thread.
+
+    Work is queued on a single worker, so the caller closing a log never
+    waits on compression or deletion; the worker finishes queued work
+    before the interpreter exits.
+    """
+
+    def __init__(self, index: LogIndex, compress: bool = True, max_age_days: float = 0, max_files: int = 0):
+        self.index = index
+        self.compress = compress
+        self.max_age_days = max_age_days
+        self.max_files = max_files
+
+    def closed(self, path: Path) -> Future:
+        """Record a log file as closed and schedule its compression and a retention pass."""
+        self.index.closed(path)
+        return _submit(self._process, path)
+
+    def sweep(self) -> Future:
+        """Schedule a retention pass."""
+        return _submit(self._retain)
+
+    def _process(self, path: Path) -> None:
+        if self.compress and path.exists():
+            compress_log(self.index, path)
+        self._retain()
+
+    def _retain(self) -> None:
+        if self.max_age_days or self.max_files:
+            apply_retention(self.index, self.max_age_days, self.max_files)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _submit(fn: Callable[..., None], *args: Any) -> Future:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="esg-log-maintenance")
+    try:
+        future = _executor.submit(fn, *args)
+    except RuntimeError:
+        # The interpreter is shutting down (a logger cleaned up at exit): do the work now
+        future = Future()
+        try:
+            fn(*args)
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+    future.add_done_callback(_report_failure)
+    return future
+
+def _report_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        # Not through logging, whose records would land in the logs being maintained
+        sys.__stderr__.write(f"Log maintenance failed: {error}\n")
@@ -0,0 +1,189 @@
+"""Serialization codecs for ESG organization files."""
+import gzip
+import json
+import lzma
+import marshal
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Type, TypeVar, Union
+import msgpack
+from pydantic import BaseModel, ValidationError
+
+from .models import SCHEMA_VERSION, ESGOrganization
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+class Codec(NamedTuple):
+    """Encoding of a model to bytes and back.
+
+    Binary codecs start with a ``magic`` prefix so that ``loads`` can tell
+    them apart; text codecs use an empty prefix and are detected last.
+    """
+    name: str
+    extension: str
+    magic: bytes
+    encode: Callable[[BaseModel], bytes]
+    decode: Callable[[bytes, Type[BaseModel]], BaseModel]
+
+class Compression(NamedTuple):
+    """Whole-file compression wrapped around a codec's output."""
+    name: str
+    extension: str
+    magic: bytes
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+MARSHAL_MAGIC = b"ESGB\x01"
+MSGPACK_MAGIC = b"ESGM\x01"
+
+def _is_current(model: BaseModel) -> bool:
+    # Data without a schema_version predates versioning; the field's default must not stand in for it
+    return not isinstance(model, ESGOrganization) or (
+        "schema_version" in model.model_fields_set and model.schema_version == SCHEMA_VERSION
+    )
+
+def _validate_document(document: Any, model_type: Type[BaseModel]) -> BaseModel:
+    if issubclass(model_type, ESGOrganization) and isinstance(document, dict):
+        from .migrations import migrate  # migrations builds on this module
+        document = migrate(document)
+    return model_type.model_validate(document)
+
+def _encode_json(model: BaseModel) -> bytes:
+    return model.model_dump_json().encode("utf-8")
+
+def _decode_json(data: bytes, model_type: Type[BaseModel]) -> BaseModel:
+    # Current files are parsed and validated in one pass, without building an intermediate dict
+    try:
+        model = model_type.model_validate_json(data)
+        if _is_current(model):
+            return model
+    except ValidationError:
+        if not issubclass(model_type, ESGOrganization):
+            raise
+    # Older layouts are upgraded first (see ``migrations``)
+    return _validate_document(json.loads(data), model_type)
+
+def _encode_marshal(model: BaseModel) -> bytes:
+    raise ValueError("marshal files are read-only, as marshal's format changes between Python versions; "
+                     "save with the msgpack codec instead")
+
+def _decode_marshal(data: bytes, model_type: Type[BaseModel]) -> BaseModel:
+    # marshal is only safe for trusted input; organization files are local state
+    return _validate_document(marshal.loads(data[len(MARSHAL_MAGIC):]), model_type)
+
+def _encode_msgpack(model: BaseModel) -> bytes:
+    return MSGPACK_MAGIC + msgpack.packb(model.model_dump(mode="json"), use_bin_type=True)
+
+def _decode_msgpack(data: bytes, model_type: Type[BaseModel]) -> BaseModel:
+    return _validate_document(msgpack.unpackb(data[len(MSGPACK_MAGIC):], raw=False), model_type)
+
+CODECS: Dict[str, Codec] = {
+    "json": Codec("json", ".json", b"", _encode_json, _decode_json),
+    "msgpack": Codec("msgpack", ".msgpack", MSGPACK_MAGIC, _encode_msgpack, _decode_msgpack),
+}
+
+# Formats that are still detected and read, so existing files load and are
+# rewritten in a current codec by their next save, but are no longer written
+LEGACY_CODECS: Dict[str, Codec] = {
+    "marshal": Codec("marshal", ".esgb", MARSHAL_MAGIC, _encode_marshal, _decode_marshal),
+}
+
+COMPRESSIONS: Dict[str, Compression] = {
+    "gzip": Compression("gzip", ".gz", b"\x1f\x8b", lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "lzma": Compression("lzma", ".xz", b"\xfd7zXZ\x00", lzma.compress, lzma.decompress),
+}
+
+def register_codec(codec: Codec) -> None:
+    """Register a codec under its name. Binary codecs need a unique magic prefix."""
+    others = [other for other in (*CODECS.values(), *LEGACY_CODECS.values()) if other.name != codec.name]
+    if codec.magic and any(other.magic == codec.magic for other in others):
+        raise ValueError(f"Magic prefix of codec {codec.name} is already registered")
+    CODECS[codec.name] = codec
+
+def _get(registry: Dict[str, Any], name: str, kind: str) -> Any:
+    if name not in registry:
+        raise ValueError(f"Unsupported {kind}: {name}. Available: {', '.join(registry)}")
+    return registry[name]
+
+def file_extension(codec: str = "json", compression: Optional[str] = None) -> str:
+    """File extension for a codec and compression, e.g. ``.json.gz``."""
+    extension = _get(CODECS, codec, "codec").extension
+    if compression:
+        extension += _get(COMPRESSIONS, compression, "compression").extension
+    return extension
+
+def dumps(model: BaseModel, codec: str = "json", compression: Optional[str] = None) -> bytes:
+    """Encode a model, optionally compressed."""
+    data = _get(CODECS, codec, "codec").encode(model)
+    if compression:
+        data = _get(COMPRESSIONS, compression, "compression").compress(data)
+    return data
+
+def detect_codec(data: bytes) -> Codec:
+    """Detect the codec of uncompressed data from its magic prefix (JSON otherwise)."""
+    for codec in (*CODECS.values(), *LEGACY_CODECS.values()):
+        if codec.magic and data.startswith(codec.magic):
+            return codec
+    return CODECS["json"]
+
+def loads(data: bytes, model_type: Type[ModelT] = ESGOrganization) -> ModelT:
+    """Decode a model, detecting compression and codec from the data itself.
+
+    Raises:
+        ValueError: If the data is corrupt or fails validation
+    """
+    for compression in COMPRESSIONS.values():
+        if data.startswith(compression.magic):
+            try:
+                data = compression.decompress(data)
+            except (OSError, EOFError, lzma.LZMAError, zlib.error) as e:
+                raise ValueError(f"Corrupt {compression.name} data: {e}") from e
+            break
+    codec = detect_codec(data)
+    try:
+        return codec.decode(data, model_type)
+    except (EOFError, TypeError) as e:  # Truncated or garbled binary data
+        raise ValueError(f"Corrupt {codec.name} data: {e}") from e
+
+def save(
+    model: BaseModel,
+    filepath: Union[str, Path],
+    codec: str = "json",
+    compression: Optional[str] = None
+) -> Path:
+    """Encode a model and write it to a file atomically.
+
+    Returns:
+        Path: The written file
+    """
+    return atomic_write_bytes(filepath, dumps(model, codec, compression))
+
+def atomic_write_bytes(filepath: Union[str, Path], data: bytes) -> Path:
+    """Write a file so that readers see either the old or the new contents, never a mix.
+
+    The data is written and fsynced to a temporary file in the same
+    directory, which then replaces the target with an atomic rename.
+    """
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+def load(filepath: Union[str, Path], model_type: Type[ModelT] = ESGOrganization) -> ModelT:
+    """Read and decode a model file written by any registered codec.
+
+    Organization files in an older schema version are migrated as they are
+    read; the file itself is only upgraded by the next save.
+    """
+    return loads(Path(filepath).read_bytes(), model_type)
@@ -0,0 +1,268 @@
+"""Columnar time-series storage for ESG metric history."""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .locking import file_lock
+
+TIMESTAMP_DTYPE = np.dtype("<i8")  # Seconds since the Unix epoch
+VALUE_DTYPE = np.dtype("<f8")
+
+TimestampLike = Union[str, int, float, np.datetime64, Any]
+
+RESAMPLE_FREQUENCIES = ("M", "Q", "Y")
+AGGREGATIONS = ("mean", "sum", "min", "max", "last", "count")
+
+def to_epoch_seconds(timestamps: Union[TimestampLike, Sequence[TimestampLike]]) -> np.ndarray:
+    """Convert ISO strings, datetimes, datetime64 values or epoch seconds to int64 seconds."""
+    array = np.atleast_1d(np.asarray(timestamps))
+    if array.dtype.kind in "iuf":
+        return array.astype(TIMESTAMP_DTYPE)
+    return array.astype("datetime64[s]").astype(TIMESTAMP_DTYPE)
+
+def _series_dirname(metric: str) -> str:
+    """Filesystem-safe, collision-free directory name for a metric."""
+    slug = re.sub(r"[^a-z0-9]+", "_", metric.lower()).strip("_")[:48]
+    digest = hashlib.sha1(metric.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}_{digest}"
+
+class TimeSeriesStore:
+    """Append-only columnar store of metric readings for one organization.
+
+    Each metric is a directory holding two flat little-endian files:
+    ``timestamps.i8`` (epoch seconds) and ``values.f8``. Appends write raw
+    array bytes to the end of both files; reads memory-map them, so range
+    queries and resampling touch only the requested slice and never build
+    per-reading Python objects. Timestamps must be non-decreasing per
+    metric, which keeps every series sorted for binary-searched range
+    queries.
+
+    Appends hold an advisory lock file on the store, so writers in other
+    threads and processes (each with its own store instance) take turns,
+    and the metric index is re-read under the lock before it is extended.
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = ".lock"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, str] = {}
+        self._read_index()
+
+    def _read_index(self) -> None:
+        index_path = self.root / self.INDEX_FILE
+        if index_path.exists():
+            with index_path.open('r', encoding='utf-8') as f:
+                self._index = json.load(f)
+
+    @classmethod
+    def for_organization(cls, data_path: Union[str, Path], name: str) -> "TimeSeriesStore":
+        """Get the store kept next to an organization's data file."""
+        return cls(Path(data_path) / f"{name.lower().replace(' ', '_')}_timeseries")
+
+    def metrics(self) -> List[str]:
+        """Names of all metrics with stored history."""
+        self._read_index()
+        return sorted(self._index)
+
+    def __contains__(self, metric: str) -> bool:
+        return self._paths(metric) is not None
+
+    def _paths(self, metric: str, create: bool = False) -> Optional[Tuple[Path, Path]]:
+        dirname = self._index.get(metric)
+        if dirname is None:
+            # Another store instance or process may have added the metric since
+            self._read_index()
+            dirname = self._index.get(metric)
+        if dirname is None:
+            if not create:
+                return None
+            # Only created under the store lock, so the index just read is current
+            dirname = _series_dirname(metric)
+            (self.root / dirname).mkdir(exist_ok=True)
+            self._index[metric] = dirname
+            self._write_index()
+        directory = self.root / dirname
+        return directory / "timestamps.i8", directory / "values.f8"
+
+    def _write_index(self) -> None:
+        index_path = self.root / self.INDEX_FILE
+        temp_path = index_path.with_suffix(".tmp")
+        with temp_path.open('w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, index_path)
+
+    def count(self, metric: str) -> int:
+        """Number of readings stored for a metric."""
+        paths = self._paths(metric)
+        return paths[0].stat().st_size // TIMESTAMP_DTYPE.itemsize if paths and paths[0].exists() else 0
+
+    def last_timestamp(self, metric: str) -> Optional[int]:
+        """Latest stored timestamp for a metric, in epoch seconds."""
+        count = self.count(metric)
+        if not count:
+            return None
+        with self._paths(metric)[0].open('rb') as f:
+            f.seek((count - 1) * TIMESTAMP_DTYPE.itemsize)
+            return int(np.frombuffer(f.read(TIMESTAMP_DTYPE.itemsize), dtype=TIMESTAMP_DTYPE)[0])
+
+    def append(self, metric: str, timestamps: Any, values: Any) -> int:
+        """Append readings to a metric's history.
+
+        Args:
+            metric: Metric name
+            timestamps: Reading times (non-decreasing, and not earlier than
+                        the last stored reading)
+            values: Reading values
+
+        Returns:
+            int: Number of readings appended
+        """
+        stamps = to_epoch_seconds(timestamps)
+        data = np.atleast_1d(np.asarray(values, dtype=VALUE_DTYPE))
+        if stamps.shape != data.shape:
+            raise ValueError("timestamps and values must have the same length")
+        if not len(stamps):
+            return 0
+        if np.any(np.diff(stamps) < 0):
+            raise ValueError(f"Readings for {metric} must be in time order")
+        with file_lock(self.root / self.LOCK_FILE):
+            return self._append(metric, stamps, data)
+
+    def _append(self, metric: str, stamps: np.ndarray, data: np.ndarray) -> int:
+        """Append sorted readings; the caller holds the store lock."""
+        if not len(stamps):
+            return 0
+        timestamp_path, value_path = self._paths(metric, create=True)
+        self._align(timestamp_path, value_path)
+        last = self.last_timestamp(metric)
+        if last is not None and stamps[0] < last:
+            raise ValueError(f"Readings for {metric} are older than its stored history")
+        with value_path.open('ab') as f:
+            f.write(data.tobytes())
+        with timestamp_path.open('ab') as f:
+            f.write(stamps.tobytes())
+        return len(stamps)
+
+    @staticmethod
+    def _align(timestamp_path: Path, value_path: Path) -> None:
+        """Truncate both columns to the shorter one.
+
+        A crash between the two column writes of an append leaves one column
+        longer than the other; cutting the unmatched tail before the next
+        append keeps timestamps and values paired.
+        """
+        sizes = [path.stat().st_size if path.exists() else 0 for path in (timestamp_path, value_path)]
+        count = min(size // dtype.itemsize for size, dtype in zip(sizes, (TIMESTAMP_DTYPE, VALUE_DTYPE)))
+        for path, size, dtype in zip((timestamp_path, value_path), sizes, (TIMESTAMP_DTYPE, VALUE_DTYPE)):
+            if size != count * dtype.itemsize:
+                os.truncate(path, count * dtype.itemsize)
+
+    def append_batch(self, metrics: Sequence[str], timestamps: Any, values: Any) -> Tuple[int, int]:
+        """Append readings for many metrics at once, grouping and ordering them by metric.
+
+        Readings older than a metric's stored history are dropped.
+
+        Returns:
+            Tuple[int, int]: Readings appended and readings dropped as out of order
+        """
+        stamps = to_epoch_seconds(timestamps)
+        data = np.asarray(values, dtype=VALUE_DTYPE)
+        names = np.asarray(metrics, dtype=object)
+        if not len(names):
+            return 0, 0
+        order = np.lexsort((stamps, names.astype(str)))
+        names, stamps, data = names[order], stamps[order], data[order]
+        boundaries = np.flatnonzero(names[1:] != names[:-1]) + 1
+        appended = dropped = 0
+        with file_lock(self.root / self.LOCK_FILE):
+            for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(names)]):
+                metric = names[start]
+                last = self.last_timestamp(metric)
+                keep = start if last is None else start + int(np.searchsorted(stamps[start:end], last, side="left"))
+                dropped += keep - start
+                appended += self._append(metric, stamps[keep:end], data[keep:end])
+        return appended, dropped
+
+    def _columns(self, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory-mapped timestamp and value columns for a metric."""
+        count = self.count(metric)
+        if not count:
+            return np.empty(0, dtype=TIMESTAMP_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+        timestamp_path, value_path = self._paths(metric)
+        count = min(count, value_path.stat().st_size // VALUE_DTYPE.itemsize)
+        return (
+            np.memmap(timestamp_path, dtype=TIMESTAMP_DTYPE, mode='r', shape=(count,)),
+            np.memmap(value_path, dtype=VALUE_DTYPE, mode='r', shape=(count,))
+        )
+
+    def query(
+        self,
+        metric: str,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Readings of a metric in ``[start, end)``.
+
+        Returns:
+            Tuple of memory-mapped views: epoch-second timestamps and values
+        """
+        timestamps, values = self._columns(metric)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, to_epoch_seconds(start)[0], side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_epoch_seconds(end)[0], side="left"))
+        return timestamps[lo:hi], values[lo:hi]
+
+    def resample(
+        self,
+        metric: str,
+        frequency: str = "M",
+        how: str = "mean",
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Aggregate a metric's readings into calendar periods.
+
+        Args:
+            metric: Metric name
+            frequency: 'M' (monthly), 'Q' (quarterly) or 'Y' (yearly)
+            how: Aggregation: mean, sum, min, max, last or count
+            start: Inclusive range start
+            end: Exclusive range end
+
+        Returns:
+            Tuple of period start dates (datetime64[D]) and aggregated values,
+            for periods that contain at least one reading
+        """
+        if frequency not in RESAMPLE_FREQUENCIES:
+            raise ValueError(f"Unsupported frequency: {frequency}")
+        if how not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {how}")
+        timestamps, values = self.query(metric, start, end)
+        if not len(timestamps):
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=VALUE_DTYPE)
+
+        months = timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+        if frequency == "Q":
+            months -= months % 3
+        elif frequency == "Y":
+            months -= months % 12
+        starts = np.r_[0, np.flatnonzero(np.diff(months)) + 1]
+        ends = np.r_[starts[1:], len(months)]
+        periods = months[starts].astype("datetime64[M]").astype("datetime64[D]")
+
+        if how == "count":
+            return periods, (ends - starts).astype(VALUE_DTYPE)
+        if how == "last":
+            return periods, np.asarray(values[ends - 1])
+        if how == "min":
+            return periods, np.minimum.reduceat(values, starts)
+        if how == "max":
+            return periods, np.maximum.reduceat(values, starts)
+        sums = np.add.reduceat(values, starts)
+        return periods, sums if how == "sum" else sums / (ends - starts)
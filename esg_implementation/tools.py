@@ -1,22 +1,34 @@
 """Tools for ESG Implementation."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import matplotlib.pyplot as plt
 import json
 from pathlib import Path
 from crewai.tools import BaseTool
 
+from .events import instrument_tool
+from .ingestion import ingest_metrics
+from .metric_table import MetricTable
+from .models import ESGOrganization
+from .reporting import ReportEngine, FORMAT_MARKUP, FRAMEWORK_LAYOUTS, render_reports, update_stored_report
+from .timeseries import TimeSeriesStore
+from .validation import get_validation_engine
+from .visualization import render_materiality_matrix, render_metrics_dashboard, render_trends
+
 class DataCollectionTool(BaseTool):
     """Tool for collecting and managing ESG data."""
     name: str = "data_collection_tool"
     description: str = "Collects and manages ESG data from various sources"
     
+    @instrument_tool
     def _run(self, operation: str, data: Dict[str, Any] = None, filepath: Optional[str] = None) -> Dict[str, Any]:
         """Run the data collection operation.
         
         Args:
-            operation: The operation to perform ('load', 'save', 'validate')
-            data: The data to save or validate (for save/validate operations)
-            filepath: The filepath to load from or save to
+            operation: The operation to perform ('load', 'save', 'validate', 'ingest')
+            data: The data to save or validate (for save/validate operations), or
+                  the organization to ingest metrics into (for ingest)
+            filepath: The filepath to load from or save to, or the CSV/JSON Lines
+                      metric feed to stream in (for ingest)
         """
         if operation == "load":
             if not filepath or not Path(filepath).exists():
@@ -32,8 +44,24 @@ class DataCollectionTool(BaseTool):
         elif operation == "validate":
             if not data:
                 return {"error": "No data to validate"}
-            # TODO: Implement data validation
-            return {"status": "valid", "issues": []}
+            issues = get_validation_engine().validate_organization(data)
+            return {
+                "status": "invalid" if issues else "valid",
+                "issues": [issue.model_dump() for issue in issues]
+            }
+        elif operation == "ingest":
+            if not filepath or not Path(filepath).exists():
+                return {"error": "File not found"}
+            try:
+                organization = ESGOrganization.model_validate(data or {"name": "Organization"})
+                stats = ingest_metrics(organization, filepath)
+            except ValueError as e:
+                return {"error": str(e)}
+            return {
+                "status": "ingested",
+                "stats": stats.model_dump(),
+                "organization": organization.model_dump(mode='json')
+            }
         return {"error": "Invalid operation"}
 
     async def _arun(self, *args, **kwargs):
@@ -44,6 +72,7 @@ class StakeholderAnalysisTool(BaseTool):
     name: str = "stakeholder_analysis_tool"
     description: str = "Analyzes stakeholder relationships, influence, and expectations"
     
+    @instrument_tool
     def _run(self, stakeholders: List[Dict[str, Any]], analysis_type: str = "influence") -> Dict[str, Any]:
         """Run stakeholder analysis.
         
@@ -86,6 +115,7 @@ class MaterialityAssessmentTool(BaseTool):
     name: str = "materiality_assessment_tool"
     description: str = "Assesses and prioritizes material ESG issues"
     
+    @instrument_tool
     def _run(self, issues: List[Dict[str, Any]], stakeholder_input: Dict[str, float]) -> Dict[str, Any]:
         """Assess materiality of ESG issues.
         
@@ -141,16 +171,67 @@ class ReportGenerationTool(BaseTool):
     name: str = "report_generation_tool"
     description: str = "Generates ESG reports in various formats and frameworks"
     
-    def _run(self, data: Dict[str, Any], framework: str = "GRI", output_format: str = "markdown") -> Dict[str, Any]:
+    @instrument_tool
+    def _run(
+        self,
+        data: Dict[str, Any],
+        framework: str = "GRI",
+        output_format: str = "markdown",
+        output_path: Optional[str] = None,
+        frameworks: Optional[List[str]] = None,
+        parallel: bool = False,
+        incremental: bool = False
+    ) -> Dict[str, Any]:
         """Generate an ESG report.
         
         Args:
-            data: ESG data to include in the report
+            data: ESG data to include in the report. ``metrics`` may be a
+                  ``MetricTable`` for very large organizations.
             framework: Reporting framework to use (GRI, SASB, TCFD)
-            output_format: Output format (markdown, html, pdf)
+            output_format: Output format (markdown, html)
+            output_path: If given, the report is written straight to this file
+                         instead of being returned in "content". In
+                         multi-framework mode this is an output directory.
+            frameworks: Render all of these frameworks from one shared
+                        aggregation pass instead of a single ``framework``
+            parallel: Render ``frameworks`` concurrently
+            incremental: Regenerate the report stored in ``data["reports"]``
+                         for this framework, re-rendering only sections whose
+                         data changed, and splice it back into the list
         """
         from datetime import datetime
         
+        if output_format not in FORMAT_MARKUP:
+            return {"error": f"Unsupported output format: {output_format}"}
+
+        if frameworks:
+            unknown = [f for f in frameworks if f not in FRAMEWORK_LAYOUTS]
+            if unknown:
+                return {"error": f"Unsupported frameworks: {', '.join(unknown)}"}
+            date = datetime.now().strftime("%Y-%m-%d")
+            rendered = render_reports(
+                data, frameworks, output_format,
+                output_dir=output_path, parallel=parallel, date=date
+            )
+            return {
+                "title": f"{data.get('name', 'Organization')} ESG Report",
+                "frameworks": list(rendered),
+                "date": date,
+                "format": output_format,
+                "reports": {
+                    framework: {"filepath": value} if output_path else {"content": value}
+                    for framework, value in rendered.items()
+                }
+            }
+
+        if incremental:
+            if framework not in FRAMEWORK_LAYOUTS:
+                return {"error": f"Unsupported framework: {framework}"}
+            report = update_stored_report(data.setdefault("reports", []), data, framework, output_format)
+            return {
+                key: report[key] for key in ("title", "framework", "date", "format", "content", "rendered_sections")
+            }
+
         result = {
             "title": f"{data.get('name', 'Organization')} ESG Report",
             "framework": framework,
@@ -161,25 +242,31 @@ class ReportGenerationTool(BaseTool):
 
         # Generate report content based on framework
         if framework == "GRI":
-            result["content"] = self._generate_gri_report(data)
+            result["content"] = self._generate_gri_report(data, output_format, output_path)
         elif framework == "SASB":
-            result["content"] = self._generate_sasb_report(data)
+            result["content"] = self._generate_sasb_report(data, output_format, output_path)
         elif framework == "TCFD":
-            result["content"] = self._generate_tcfd_report(data)
+            result["content"] = self._generate_tcfd_report(data, output_format, output_path)
         
+        if output_path:
+            result["filepath"] = output_path
         return result
 
-    def _generate_gri_report(self, data: Dict[str, Any]) -> str:
-        # TODO: Implement GRI report generation
-        return ""
+    def _render(self, framework: str, data: Dict[str, Any], output_format: str, output_path: Optional[str]) -> str:
+        engine = ReportEngine(framework, output_format)
+        if output_path:
+            engine.render_to_file(data, output_path)
+            return ""
+        return engine.render(data)
+
+    def _generate_gri_report(self, data: Dict[str, Any], output_format: str = "markdown", output_path: Optional[str] = None) -> str:
+        return self._render("GRI", data, output_format, output_path)
 
-    def _generate_sasb_report(self, data: Dict[str, Any]) -> str:
-        # TODO: Implement SASB report generation
-        return ""
+    def _generate_sasb_report(self, data: Dict[str, Any], output_format: str = "markdown", output_path: Optional[str] = None) -> str:
+        return self._render("SASB", data, output_format, output_path)
 
-    def _generate_tcfd_report(self, data: Dict[str, Any]) -> str:
-        # TODO: Implement TCFD report generation
-        return ""
+    def _generate_tcfd_report(self, data: Dict[str, Any], output_format: str = "markdown", output_path: Optional[str] = None) -> str:
+        return self._render("TCFD", data, output_format, output_path)
 
     async def _arun(self, *args, **kwargs):
         return self._run(*args, **kwargs)
@@ -189,11 +276,16 @@ class VisualizationTool(BaseTool):
     name: str = "visualization_tool"
     description: str = "Creates visualizations of ESG data and metrics"
     
+    @instrument_tool
     def _run(self, data: Dict[str, Any], viz_type: str = "metrics") -> Dict[str, Any]:
         """Create ESG visualizations.
         
         Args:
-            data: ESG data to visualize
+            data: ESG data to visualize. ``metrics`` may be a ``MetricTable``.
+                  For trends, ``timeseries_path`` points
+                  at the organization's time-series store and the optional
+                  ``frequency`` ('M', 'Q' or 'Y') resamples into periods;
+                  without it, raw readings are downsampled to the chart width.
             viz_type: Type of visualization (metrics, trends, materiality)
         """
         result = {
@@ -207,7 +299,9 @@ class VisualizationTool(BaseTool):
             result["figures"].append(("metrics_dashboard.png", fig))
             
         elif viz_type == "trends":
-            fig = self._create_trends_visualization(data.get("metrics", []))
+            fig = self._create_trends_visualization(
+                data.get("metrics", []), data.get("timeseries_path"), data.get("frequency")
+            )
             result["figures"].append(("trends.png", fig))
             
         elif viz_type == "materiality":
@@ -222,17 +316,27 @@ class VisualizationTool(BaseTool):
         
         return result
 
-    def _create_metrics_dashboard(self, metrics: List[Dict[str, Any]]) -> plt.Figure:
-        # TODO: Implement metrics dashboard
-        return plt.figure()
+    def _create_metrics_dashboard(self, metrics: Union[List[Dict[str, Any]], MetricTable]) -> plt.Figure:
+        return render_metrics_dashboard(metrics)
 
-    def _create_trends_visualization(self, metrics: List[Dict[str, Any]]) -> plt.Figure:
-        # TODO: Implement trends visualization
-        return plt.figure()
+    def _create_trends_visualization(
+        self,
+        metrics: List[Dict[str, Any]],
+        timeseries_path: Optional[str] = None,
+        frequency: Optional[str] = None
+    ) -> plt.Figure:
+        if not timeseries_path or not Path(timeseries_path).exists():
+            return plt.figure()
+        store = TimeSeriesStore(timeseries_path)
+        # Limit to the organization's current metrics when they are given
+        if isinstance(metrics, MetricTable):
+            names = metrics.column("name").tolist() or None
+        else:
+            names = [metric.get("name") for metric in metrics] or None
+        return render_trends(store, names, frequency=frequency)
 
     def _create_materiality_matrix(self, issues: List[Dict[str, Any]]) -> plt.Figure:
-        # TODO: Implement materiality matrix
-        return plt.figure()
+        return render_materiality_matrix(issues)
 
     async def _arun(self, *args, **kwargs):
         return self._run(*args, **kwargs)
@@ -0,0 +1,156 @@
+"""Span tracing of workflow runs in Chrome Trace Event format."""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+class Tracer:
+    """Collects the spans of one run and writes them as a Chrome trace.
+
+    Spans are stored as complete (``"ph": "X"``) events with microsecond
+    start and duration, one timeline per thread; viewers such as Perfetto,
+    ``chrome://tracing`` and speedscope nest them by time into the
+    run > task > agent > tool/LLM hierarchy.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self.threads: Dict[int, str] = {}
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._open: Dict[Hashable, Tuple[float, str, str, Dict[str, Any]]] = {}
+
+    def add(self, name: str, category: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        """Record a finished span; ``start`` and ``end`` are ``time.perf_counter()`` values."""
+        thread = threading.current_thread()
+        if thread.ident not in self.threads:
+            self.threads[thread.ident] = thread.name
+        # list.append is atomic, so threads of one run need no lock
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": thread.ident,
+            "ts": round((start - self._origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1), "args": args,
+        })
+
+    def begin(self, key: Hashable, name: str, category: str, **args: Any) -> None:
+        """Open a span that ends in a different call, such as a crewai event handler."""
+        self._open[key] = (time.perf_counter(), name, category, args)
+
+    def end(self, key: Hashable, **args: Any) -> None:
+        """Close the span opened with ``key``; does nothing if it was never opened."""
+        opened = self._open.pop(key, None)
+        if opened is not None:
+            start, name, category, span_args = opened
+            self.add(name, category, start, time.perf_counter(), {**span_args, **args})
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write the trace as a JSON object loadable by trace viewers."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.threads.items()
+        ]
+        with path.open('w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+_current: ContextVar[Optional[Tracer]] = ContextVar("esg_tracer", default=None)
+
+def current_tracer() -> Optional[Tracer]:
+    """Tracer of the run executing in the current thread or task, if any."""
+    return _current.get()
+
+@contextmanager
+def span(name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+    """Trace the block as one span; costs a single context variable lookup when tracing is off.
+
+    Yields the span's arguments, so the block can add results such as token counts.
+    """
+    tracer = _current.get()
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        tracer.add(name, category, start, time.perf_counter(), args)
+
+def task_label(task: Any) -> str:
+    """Display name of a crewai task: its name, else the start of its description."""
+    name = getattr(task, "name", None)
+    if name:
+        return name
+    return " ".join(str(getattr(task, "description", "")).split())[:80]
+
+def on_task_started(source: Any, event: Any) -> None:
+    """crewai ``TaskStartedEvent`` handler: open the task's span."""
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.begin(("task", id(event.task)), task_label(event.task), "task")
+
+def on_task_finished(source: Any, event: Any) -> None:
+    """crewai ``TaskCompletedEvent``/``TaskFailedEvent`` handler: close the task's span."""
+    tracer = _current.get()
+    if tracer is not None:
+        error = getattr(event, "error", None)
+        tracer.end(("task", id(event.task)), **({"error": error} if error else {}))
+
+def on_agent_started(source: Any, event: Any) -> None:
+    """crewai ``AgentExecutionStartedEvent`` handler: open the agent's span within its task."""
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.begin(("agent", id(event.agent), id(event.task)), event.agent.role, "agent",
+                     tools=len(event.tools or ()))
+
+def on_agent_finished(source: Any, event: Any) -> None:
+    """crewai ``AgentExecutionCompletedEvent``/``AgentExecutionErrorEvent`` handler: close the agent's span."""
+    tracer = _current.get()
+    if tracer is not None:
+        error = getattr(event, "error", None)
+        tracer.end(("agent", id(event.agent), id(event.task)), **({"error": error} if error else {}))
+
+_handlers_registered = False
+
+def _register_crew_handlers() -> None:
+    """Subscribe to crewai's task and agent events once per process."""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.agent_events import (
+        AgentExecutionCompletedEvent, AgentExecutionErrorEvent, AgentExecutionStartedEvent,
+    )
+    from crewai.utilities.events.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+
+    crewai_event_bus.on(TaskStartedEvent)(on_task_started)
+    crewai_event_bus.on(TaskCompletedEvent)(on_task_finished)
+    crewai_event_bus.on(TaskFailedEvent)(on_task_finished)
+    crewai_event_bus.on(AgentExecutionStartedEvent)(on_agent_started)
+    crewai_event_bus.on(AgentExecutionCompletedEvent)(on_agent_finished)
+    crewai_event_bus.on(AgentExecutionErrorEvent)(on_agent_finished)
+    _handlers_registered = True
+
+@contextmanager
+def trace_run(path: Union[str, Path], name: str = "run", **args: Any) -> Iterator[Tracer]:
+    """Trace the block as a run and write the trace to ``path`` when it ends, even on error.
+
+    The tracer is bound to the current context, so concurrent runs in other
+    threads or tasks are traced separately.
+    """
+    _register_crew_handlers()
+    tracer = Tracer()
+    token = _current.set(tracer)
+    try:
+        with span(name, "run", **args):
+            yield tracer
+    finally:
+        _current.reset(token)
+        tracer.write(path)
@@ -0,0 +1,347 @@
+"""Chart rendering helpers for ESG Implementation."""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import matplotlib.pyplot as plt
+
+from .metric_table import MetricTable
+
+CATEGORY_COLORS: Dict[str, str] = {
+    "Environmental": "green",
+    "Social": "blue",
+    "Governance": "purple"
+}
+
+# Offsets (in points) tried in order when placing a label next to its marker
+LABEL_OFFSETS: List[Tuple[int, int]] = [(5, 5), (5, -12), (-5, 5), (-5, -12), (0, 10), (0, -16)]
+
+
+def _field(item: Any, key: str, default: Any = None) -> Any:
+    """Read a field from either a dict or a model instance."""
+    if isinstance(item, dict):
+        return item.get(key, default)
+    return getattr(item, key, default)
+
+
+class LabelGrid:
+    """Uniform grid index of placed label boxes in display coordinates.
+
+    Each box is registered in every cell it overlaps, so a collision check
+    only looks at the handful of boxes sharing a cell with the candidate
+    instead of every label placed so far.
+    """
+
+    def __init__(self, cell_size: float = 40.0):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, float, float]]] = {}
+
+    def _cells_for(self, box: Tuple[float, float, float, float]) -> Iterable[Tuple[int, int]]:
+        x0, y0, x1, y1 = box
+        size = self.cell_size
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def collides(self, box: Tuple[float, float, float, float]) -> bool:
+        """Check whether a box overlaps any box already in the grid."""
+        x0, y0, x1, y1 = box
+        for cell in self._cells_for(box):
+            for ox0, oy0, ox1, oy1 in self.cells.get(cell, ()):
+                if x0 < ox1 and ox0 < x1 and y0 < oy1 and oy0 < y1:
+                    return True
+        return False
+
+    def add(self, box: Tuple[float, float, float, float]) -> None:
+        """Register a placed box."""
+        for cell in self._cells_for(box):
+            self.cells.setdefault(cell, []).append(box)
+
+    def try_place(self, box: Tuple[float, float, float, float]) -> bool:
+        """Register the box if it does not collide; return whether it was placed."""
+        if self.collides(box):
+            return False
+        self.add(box)
+        return True
+
+
+def render_materiality_matrix(
+    issues: Sequence[Any],
+    ax: Optional[plt.Axes] = None,
+    max_labels: int = 60,
+    density_threshold: int = 2000,
+    fontsize: int = 8
+) -> plt.Figure:
+    """Render a materiality matrix of business vs. stakeholder importance.
+
+    Args:
+        issues: Material issues as dicts or models. Issues without
+            importance ratings fall back to their materiality score.
+        ax: Axes to draw on. A new figure is created if None.
+        max_labels: Upper bound on annotated issues; the most material
+            issues are labelled first.
+        density_threshold: Above this many issues, points are drawn as
+            hexbin density shading instead of individual markers.
+        fontsize: Label font size in points.
+
+    Returns:
+        plt.Figure: The figure containing the matrix
+    """
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 8))
+    else:
+        fig = ax.figure
+
+    count = len(issues)
+    x = np.empty(count, dtype=float)
+    y = np.empty(count, dtype=float)
+    names: List[str] = []
+    categories: List[str] = []
+    for i, issue in enumerate(issues):
+        score = _field(issue, "materiality_score", 0) or 0
+        business = _field(issue, "importance_to_business")
+        stakeholders = _field(issue, "importance_to_stakeholders")
+        x[i] = score if business is None else business
+        y[i] = score if stakeholders is None else stakeholders
+        names.append(str(_field(issue, "name", "")))
+        categories.append(_field(issue, "category", "Unknown") or "Unknown")
+
+    ax.set_xlabel("Importance to Business")
+    ax.set_ylabel("Importance to Stakeholders")
+    ax.set_title("ESG Materiality Matrix")
+    ax.grid(True)
+    ax.set_xlim(0, 11)
+    ax.set_ylim(0, 11)
+
+    if count > density_threshold:
+        density = ax.hexbin(x, y, gridsize=40, extent=(0, 11, 0, 11), cmap="Greens", mincnt=1)
+        fig.colorbar(density, ax=ax, label="Issues")
+    else:
+        groups: Dict[str, List[int]] = {category: [] for category in CATEGORY_COLORS}
+        for i, category in enumerate(categories):
+            groups.setdefault(category, []).append(i)
+        # One scatter call per category; empty pillars still get a legend entry
+        for category, indices in groups.items():
+            ax.scatter(x[indices], y[indices], color=CATEGORY_COLORS.get(category, "gray"), s=100, label=category)
+        ax.legend()
+
+    if count:
+        _place_labels(ax, x, y, names, max_labels, fontsize)
+    return fig
+
+
+def _place_labels(
+    ax: plt.Axes,
+    x: np.ndarray,
+    y: np.ndarray,
+    names: List[str],
+    max_labels: int,
+    fontsize: int
+) -> None:
+    """Annotate the most material issues without overlapping labels."""
+    # Transform all points to pixels in a single call
+    points = ax.transData.transform(np.column_stack([x, y]))
+    px_per_pt = ax.figure.dpi / 72.0
+    char_width = 0.6 * fontsize * px_per_pt
+    line_height = 1.2 * fontsize * px_per_pt
+
+    grid = LabelGrid(cell_size=max(line_height * 3, 1.0))
+    placed = 0
+    for i in np.argsort(-(x + y), kind="stable"):
+        if placed >= max_labels:
+            break
+        px, py = points[i]
+        width = len(names[i]) * char_width
+        for dx, dy in LABEL_OFFSETS:
+            left = px + dx * px_per_pt - (width if dx < 0 else 0)
+            bottom = py + dy * px_per_pt
+            if grid.try_place((left, bottom, left + width, bottom + line_height)):
+                ax.annotate(
+                    names[i], (x[i], y[i]),
+                    xytext=(dx, dy), textcoords="offset points",
+                    ha="right" if dx < 0 else "left",
+                    fontsize=fontsize
+                )
+                placed += 1
+                break
+
+
+def render_metrics_dashboard(
+    metrics: Any,
+    max_bars: int = 20,
+    categories: Sequence[str] = tuple(CATEGORY_COLORS)
+) -> plt.Figure:
+    """Render progress towards target for each ESG category.
+
+    Categories with at most ``max_bars`` targeted metrics get one bar per
+    metric; larger ones are summarized as a histogram of progress, so the
+    chart stays readable (and cheap) for hundreds of thousands of metrics.
+
+    Args:
+        metrics: A ``MetricTable``, or metrics as dicts or models
+        max_bars: Largest number of metrics drawn as individual bars
+        categories: Categories to draw, one panel each
+
+    Returns:
+        plt.Figure: The figure containing the dashboard
+    """
+    table = metrics if isinstance(metrics, MetricTable) else MetricTable.from_records(metrics)
+    groups = table.group_by("category")
+    fig, axes = plt.subplots(1, len(categories), figsize=(6 * len(categories), 6), squeeze=False)
+    for ax, category in zip(axes[0], categories):
+        group = groups.get(category)
+        progress = group.progress() if group is not None else np.empty(0)
+        targeted = np.flatnonzero(~np.isnan(progress))
+        color = CATEGORY_COLORS.get(category, "gray")
+        total = 0 if group is None else len(group)
+        ax.set_title(f"{category} ({len(targeted)}/{total} metrics with targets)")
+        if not len(targeted):
+            ax.text(0.5, 0.5, "No metrics with targets", ha="center", va="center", transform=ax.transAxes)
+            ax.set_axis_off()
+        elif len(targeted) <= max_bars:
+            names = group.column("name")[targeted]
+            ax.barh(range(len(targeted)), progress[targeted], color=color)
+            ax.set_yticks(range(len(targeted)), names)
+            ax.axvline(100, color="black", linestyle="--", linewidth=1)
+            ax.set_xlabel("Progress to target (%)")
+        else:
+            ax.hist(np.clip(progress[targeted], 0, 300), bins=30, color=color)
+            ax.axvline(100, color="black", linestyle="--", linewidth=1)
+            ax.set_xlabel("Progress to target (%, clipped at 300)")
+            ax.set_ylabel("Metrics")
+    fig.tight_layout()
+    return fig
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of ``n_out // 2`` equal-count buckets.
+
+    Buckets are taken as a 2-D view over the series, so the per-bucket
+    argmin/argmax run as two vectorized reductions without copying the data.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    size = -(-n // max(n_out // 2, 1))
+    full = n // size
+    body = y[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    parts = [offsets + body.argmin(axis=1), offsets + body.argmax(axis=1)]
+    if full * size < n:
+        tail = y[full * size:]
+        parts.append(np.array([full * size + tail.argmin(), full * size + tail.argmax()]))
+    # Sorting orders each bucket's min/max pair by position and merges duplicates
+    return np.unique(np.concatenate(parts))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices selected by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. Each bucket in between keeps
+    the point forming the largest triangle with the previously selected point
+    and the mean of the next bucket. Bucket means are computed up front with
+    one reduction; the per-bucket step is vectorized over the bucket's points.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    # The last bucket looks ahead to the final point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - mean_x[bucket]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (mean_y[bucket] - py))
+        previous = lo + int(areas.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = "minmax_lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a sorted series to about ``n_out`` points while keeping its shape.
+
+    Args:
+        x: Sorted x values (e.g. epoch seconds)
+        y: Values
+        n_out: Point budget
+        method: 'lttb', 'minmax', or 'minmax_lttb' (min/max preselection of
+                a few points per output point, then LTTB over those; nearly
+                LTTB quality at min/max speed)
+
+    Returns:
+        Tuple of the selected x and y values
+    """
+    if len(y) <= n_out:
+        return np.asarray(x), np.asarray(y)
+    if method == "minmax":
+        indices = minmax_indices(y, n_out)
+    elif method == "lttb":
+        indices = lttb_indices(x, y, n_out)
+    elif method == "minmax_lttb":
+        candidates = minmax_indices(y, n_out * 4)
+        candidates = np.unique(np.concatenate([[0], candidates, [len(y) - 1]]))
+        indices = candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+    else:
+        raise ValueError(f"Unsupported downsampling method: {method}")
+    return np.asarray(x[indices]), np.asarray(y[indices])
+
+
+def render_trends(
+    store: Any,
+    metrics: Optional[Sequence[str]] = None,
+    frequency: Optional[str] = None,
+    how: str = "mean",
+    ax: Optional[plt.Axes] = None,
+    max_points: Optional[int] = None,
+    method: str = "minmax_lttb"
+) -> plt.Figure:
+    """Plot metric histories from a time-series store.
+
+    Args:
+        store: ``TimeSeriesStore`` holding the readings
+        metrics: Metric names to plot. Every stored metric if None.
+        frequency: Resampling period ('M', 'Q' or 'Y'). If None, raw readings
+                   are plotted, downsampled to the point budget.
+        how: Aggregation applied within each period
+        ax: Axes to draw on. A new figure is created if None.
+        max_points: Point budget per series. Defaults to twice the axes
+                    width in pixels, which is all a line can show.
+        method: Downsampling method passed to ``downsample``
+
+    Returns:
+        plt.Figure: The figure containing the trends
+    """
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 6))
+    else:
+        fig = ax.figure
+    if max_points is None:
+        max_points = max(int(ax.get_window_extent().width) * 2, 3)
+
+    names = store.metrics() if metrics is None else [name for name in metrics if name in store]
+    for name in names:
+        if frequency is None:
+            timestamps, values = downsample(*store.query(name), max_points, method=method)
+            periods = timestamps.astype("datetime64[s]")
+        else:
+            periods, values = store.resample(name, frequency=frequency, how=how)
+        if len(periods):
+            style = {"marker": "o", "markersize": 3} if len(periods) <= 100 else {"linewidth": 0.8}
+            ax.plot(periods, values, label=name, **style)
+
+    ax.set_title("ESG Metric Trends")
+    ax.set_xlabel("Date" if frequency is None else "Period")
+    ax.set_ylabel("Value")
+    ax.grid(True)
+    if ax.lines:
+        ax.legend()
+        fig.autofmt_xdate()
+    return fig
@@ -9,13 +9,18 @@ import os
 import json
 import matplotlib.pyplot as plt
 from datetime import datetime
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
 from langchain_ollama import OllamaLLM
 from pydantic import BaseModel, Field
 
+from esg_implementation.models import IndexedSections
+from esg_implementation.reporting import FRAMEWORK_LAYOUTS, update_stored_report
+from esg_implementation.serialization import atomic_write_bytes
+from esg_implementation.visualization import render_materiality_matrix
+
 # Set up the locally hosted LLM
 llm = OllamaLLM(model="ollama/llama3.2", base_url="http://localhost:11434")
 
@@ -57,8 +62,10 @@ class ESGAction(BaseModel):
     status: str = Field(description="Current status of the action")
     related_metrics: List[str] = Field(description="Metrics that this action impacts")
 
-class ESGOrganization(BaseModel):
+class ESGOrganization(IndexedSections):
     """Container class for all ESG-related data for an organization."""
+    indexed_sections: ClassVar[Tuple[str, ...]] = ("stakeholders", "material_issues", "metrics", "actions")
+
     name: str = Field(default_factory=str)
     vision: Optional[ESGVision] = None
     stakeholders: List[Stakeholder] = Field(default_factory=list)
@@ -74,8 +81,8 @@ class ESGOrganization(BaseModel):
 
         data = self.model_dump(mode='json')
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write to a temporary file and rename, so a crash never leaves a truncated file
+        atomic_write_bytes(filename, json.dumps(data, indent=2).encode('utf-8'))
 
         return filename
 
@@ -167,55 +174,16 @@ class ReportGenerationTool(BaseTool):
         if not self.organization.metrics:
             return "No metrics found to include in the report."
 
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-        report_title = f"{self.organization.name} ESG Report ({framework}) - {timestamp}"
-
-        # Structure the report based on the framework
-        report_content = f"# {report_title}\n\n"
-
-        # Add executive summary
-        report_content += "## Executive Summary\n"
-        report_content += f"{self.organization.name} is committed to its ESG journey. "
-        if self.organization.vision:
-            report_content += f"Our ESG vision: {self.organization.vision.vision_statement}\n\n"
-
-        # Add sections for E, S, and G
-        for category in ["Environmental", "Social", "Governance"]:
-            report_content += f"## {category} Performance\n"
-            category_metrics = [m for m in self.organization.metrics if m.category == category]
-
-            if category_metrics:
-                report_content += f"### Key Metrics\n"
-                for metric in category_metrics:
-                    if metric.current_value is not None:
-                        progress = ""
-                        if metric.target_value is not None:
-                            progress = f" (Target: {metric.target_value} {metric.unit})"
-                        report_content += f"- {metric.name}: {metric.current_value} {metric.unit}{progress}\n"
-            else:
-                report_content += f"No {category.lower()} metrics collected yet.\n"
-
-            report_content += "\n"
-
-        # Add section for action plans
-        report_content += "## Action Plans and Progress\n"
-        if self.organization.actions:
-            for action in organization.actions:
-                report_content += f"### {action.name}\n"
-                report_content += f"**Status**: {action.status}\n"
-                report_content += f"**Description**: {action.description}\n"
-                report_content += f"**Timeline**: {action.timeline}\n"
-                report_content += f"**Responsible**: {action.responsible_party}\n\n"
-        else:
-            report_content += "No action plans defined yet.\n"
-
-        # Store the report in the organization's records
-        self.organization.reports.append({
-            "title": report_title,
-            "framework": framework,
-            "date": timestamp,
-            "content": report_content
-        })
+        data = self.organization.model_dump(mode='json', exclude={'reports'})
+        # Metrics without a value yet are left out of the report
+        data["metrics"] = [metric for metric in data["metrics"] if metric["current_value"] is not None]
+
+        # Re-render only the sections whose data changed since the stored report
+        try:
+            report = update_stored_report(self.organization.reports, data, framework)
+        except ValueError as e:
+            return f"Could not generate the report: {e}. Supported frameworks: {', '.join(FRAMEWORK_LAYOUTS)}."
+        report_title = report["title"]
         print(f"Report generated: {self.organization.reports}")
         return f"Report generated: {report_title}"
 
@@ -231,41 +199,20 @@ class VisualizationTool(BaseTool):
         """Creates visualizations based on ESG data."""
         if visualization_type == "metrics" and organization.metrics:
             # Create a bar chart for metrics with current values
-            metrics_with_values = [m for m in self.organization.metrics if m.current_value is not None]
-
-            if not metrics_with_values:
+            if all(m.current_value is None for m in self.organization.metrics):
                 return "No metrics with values to visualize."
 
-            # Group metrics by category
-            env_metrics = [m for m in metrics_with_values if m.category == "Environmental"]
-            soc_metrics = [m for m in metrics_with_values if m.category == "Social"]
-            gov_metrics = [m for m in metrics_with_values if m.category == "Governance"]
-
             fig, axs = plt.subplots(3, 1, figsize=(10, 15))
 
-            # Plot environmental metrics
-            if env_metrics:
-                names = [m.name for m in env_metrics]
-                values = [m.current_value for m in env_metrics]
-                axs[0].bar(names, values)
-                axs[0].set_title("Environmental Metrics")
-                axs[0].tick_params(axis='x', rotation=45)
-
-            # Plot social metrics
-            if soc_metrics:
-                names = [m.name for m in soc_metrics]
-                values = [m.current_value for m in soc_metrics]
-                axs[1].bar(names, values)
-                axs[1].set_title("Social Metrics")
-                axs[1].tick_params(axis='x', rotation=45)
-
-            # Plot governance metrics
-            if gov_metrics:
-                names = [m.name for m in gov_metrics]
-                values = [m.current_value for m in gov_metrics]
-                axs[2].bar(names, values)
-                axs[2].set_title("Governance Metrics")
-                axs[2].tick_params(axis='x', rotation=45)
+            # One panel per category, read from the organization's category index
+            for ax, category in zip(axs, ("Environmental", "Social", "Governance")):
+                category_metrics = [
+                    m for m in self.organization.by_category("metrics", category) if m.current_value is not None
+                ]
+                if category_metrics:
+                    ax.bar([m.name for m in category_metrics], [m.current_value for m in category_metrics])
+                    ax.set_title(f"{category} Metrics")
+                    ax.tick_params(axis='x', rotation=45)
 
             fig.tight_layout()
 
@@ -280,42 +227,8 @@ class VisualizationTool(BaseTool):
             # Create a materiality matrix
             issues = self.organization.material_issues
 
-            # Extract data for plotting
-            x = [issue.importance_to_business for issue in issues]
-            y = [issue.importance_to_stakeholders for issue in issues]
-            labels = [issue.name for issue in issues]
-            categories = [issue.category for issue in issues]
-
-            # Set up colors for different categories
-            colors = {
-                "Environmental": "green",
-                "Social": "blue",
-                "Governance": "purple"
-            }
-
-            # Create the plot
-            fig, ax = plt.subplots(figsize=(10, 8))
-
-            for i, issue in enumerate(issues):
-                ax.scatter(x[i], y[i], color=colors.get(issue.category, "gray"), s=100)
-                ax.annotate(labels[i], (x[i], y[i]), xytext=(5, 5), textcoords='offset points')
-
-            # Add labels and title
-            ax.set_xlabel("Importance to Business")
-            ax.set_ylabel("Importance to Stakeholders")
-            ax.set_title("ESG Materiality Matrix")
-
-            # Add grid lines
-            ax.grid(True)
-
-            # Set axis limits
-            ax.set_xlim(0, 11)
-            ax.set_ylim(0, 11)
-
-            # Add legend
-            for category, color in colors.items():
-                ax.scatter([], [], color=color, label=category)
-            ax.legend()
+            # Batched per-category scatter with collision-free labels
+            render_materiality_matrix(issues)
 
             # Save the visualization
             filename = f"{self.organization.name.lower().replace(' ', '_')}_materiality_matrix.png"
@@ -0,0 +1,153 @@
+"""
+Test the append-only organization change log
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from esg_implementation import changelog, serialization
+from esg_implementation.changelog import ChangeLog
+from esg_implementation.config import ESGConfig
+from esg_implementation.core import ESGWorkflowManager
+from esg_implementation.models import ESGMetric, ESGOrganization
+from esg_implementation.repository import FileRepository
+
+def _metric(name, value=None):
+    return ESGMetric(name=name, unit="t", data_source="Meters", category="Environmental", current_value=value)
+
+def test_operations_apply_in_place():
+    """Test upsert, update, remove, append and set operations"""
+    organization = ESGOrganization(name="TestCorp", metrics=[_metric("A", 1)])
+    for operation in (
+        changelog.update("metrics", "A", current_value=2),
+        changelog.upsert("metrics", _metric("B", 5)),
+        changelog.remove("metrics", "A"),
+        changelog.append("reports", {"title": "GRI"}),
+        changelog.set_field("vision", {"vision_statement": "Net zero", "environmental_goals": [],
+                                       "social_goals": [], "governance_goals": []}),
+    ):
+        changelog.apply_operation(organization, operation)
+    assert [(m.name, m.current_value) for m in organization.metrics] == [("B", 5)]
+    assert organization.reports == [{"title": "GRI"}]
+    assert organization.vision.vision_statement == "Net zero"
+    with pytest.raises(KeyError):
+        changelog.apply_operation(organization, changelog.update("metrics", "Missing", current_value=1))
+
+def test_apply_appends_without_rewriting_snapshot():
+    """Test recorded changes go to the log and are replayed on load"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        snapshot = repository.save(ESGOrganization(name="TestCorp", metrics=[_metric("A", 1)]))
+        before = snapshot.read_bytes()
+
+        assert repository.apply("TestCorp", [changelog.update("metrics", "A", current_value=7)]) == 1
+        assert repository.apply("TestCorp", [changelog.upsert("metrics", _metric("B", 3))]) == 2
+        assert snapshot.read_bytes() == before
+
+        loaded = repository.load("TestCorp")
+        assert [(m.name, m.current_value) for m in loaded.metrics] == [("A", 7), ("B", 3)]
+        assert loaded.revision == 2
+        assert repository.load("TestCorp", sections=["stakeholders"]).metrics == []
+
+def test_invalid_operations_are_rejected_before_logging():
+    """Test the file backend validates changes before logging them"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.save(ESGOrganization(name="TestCorp", metrics=[_metric("A", 1)]))
+        for operations in (
+            [changelog.upsert("metrics", _metric("B", 2)), changelog.update("metrics", "A", current_value="n/a")],
+            [changelog.upsert("metrics", {"name": "C"})],
+            [changelog.update("budgets", "A", amount=1)],
+            [changelog.append("metrics", {"name": "D"})],
+            [changelog.set_field("vision", "Net zero")],
+        ):
+            with pytest.raises(ValueError):
+                repository.apply("TestCorp", operations)
+        assert repository.changelog_for("TestCorp").size() == 0
+        assert repository.current_revision("TestCorp") == 0
+
+def test_update_of_missing_record_is_dropped_on_compaction():
+    """Test an update the log cannot check on append is skipped on replay and compacted away"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.save(ESGOrganization(name="TestCorp", metrics=[_metric("A", 1)]))
+        assert repository.apply("TestCorp", [changelog.update("metrics", "Missing", current_value=1),
+                                             changelog.update("metrics", "A", current_value=2)]) == 2
+        repository.compact("TestCorp")
+        assert repository.changelog_for("TestCorp").size() == 0
+        organization = repository.load("TestCorp")
+        assert [(m.name, m.current_value) for m in organization.metrics] == [("A", 2)]
+        assert organization.revision == 2
+
+def test_partial_replay_only_advances_revision_for_applied_changes():
+    """Test a partial load's revision does not claim changes to sections it skipped"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.save(ESGOrganization(name="TestCorp", metrics=[_metric("A", 1)]))
+        repository.apply("TestCorp", [changelog.update("metrics", "A", current_value=2)])
+        repository.apply("TestCorp", [changelog.append("reports", {"title": "GRI"})])
+        repository.apply("TestCorp", [changelog.update("metrics", "A", current_value=3)])
+        partial = repository.load("TestCorp", sections=["metrics"])
+        assert partial.metrics[0].current_value == 3 and partial.revision == 1
+        assert repository.load("TestCorp").revision == 3
+
+def test_torn_final_line_is_ignored_and_repaired():
+    """Test a crash mid-append loses only the torn operation"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.apply("TestCorp", [changelog.upsert("metrics", _metric("A", 1))])
+        log = repository.changelog_for("TestCorp")
+        with log.path.open('ab') as f:
+            f.write(b'{"op": "upsert", "sect')
+        assert [m.name for m in repository.load("TestCorp").metrics] == ["A"]
+
+        assert repository.apply("TestCorp", [changelog.upsert("metrics", _metric("B", 2))]) == 2
+        assert [m.name for m in repository.load("TestCorp").metrics] == ["A", "B"]
+
+def test_compaction_folds_log_into_snapshot_idempotently(monkeypatch):
+    """Test compaction writes a snapshot, clears the log and never double-applies"""
+    monkeypatch.setattr(FileRepository, "COMPACT_MIN_BYTES", 0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.save(ESGOrganization(name="TestCorp"))
+        for i in range(5):
+            repository.apply("TestCorp", [changelog.append("reports", {"title": f"Report {i}"})])
+        assert repository.changelog_for("TestCorp").size() < 500
+        assert len(repository.load("TestCorp").reports) == 5
+
+        # A crash between writing the snapshot and clearing the log
+        repository.apply("TestCorp", [changelog.append("reports", {"title": "Report 5"})])
+        organization = repository.load("TestCorp")
+        serialization.save(organization, repository.path_for("TestCorp"))
+        assert len(repository.load("TestCorp").reports) == 6
+
+def test_atomic_save_keeps_previous_file_on_failure(monkeypatch):
+    """Test an interrupted save leaves the old file and no temporary files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = serialization.save(ESGOrganization(name="Old"), Path(temp_dir) / "org.json")
+
+        def fail(*args):
+            raise OSError("disk full")
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError):
+            serialization.save(ESGOrganization(name="New"), path)
+        assert serialization.load(path).name == "Old"
+        assert os.listdir(temp_dir) == ["org.json"]
+
+def test_workflow_ingestion_records_only_touched_metrics(monkeypatch):
+    """Test manager ingestion appends upserts instead of rewriting the organization"""
+    monkeypatch.setattr(ESGWorkflowManager, "_setup_api_key", lambda self: None)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = ESGWorkflowManager(ESGConfig(data_path=temp_dir))
+        manager.save_organization_data(ESGOrganization(name="TestCorp", metrics=[_metric("A", 1), _metric("B", 2)]))
+        feed = Path(temp_dir) / "feed.csv"
+        feed.write_text("name,unit,data_source,category,current_value\nB,t,Meters,Environmental,9\n", encoding="utf-8")
+
+        stats = manager.ingest_metrics("TestCorp", str(feed))
+        assert stats.updated == 1
+        operations = list(manager.repository.changelog_for("TestCorp"))
+        assert [(op.op, op.name) for op in operations] == [("upsert", "B")]
+        loaded = manager.load_or_create_organization("TestCorp")
+        assert [(m.name, m.current_value) for m in loaded.metrics] == [("A", 1), ("B", 9)]
@@ -0,0 +1,150 @@
+"""
+Test the structured JSON Lines run-event log
+"""
+
+import json
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.events.task_events import TaskCompletedEvent, TaskStartedEvent
+from esg_implementation import events
+from esg_implementation.config import ESGConfig
+from esg_implementation.core import ESGWorkflowManager
+from esg_implementation.events import EventLog, run_events
+from esg_implementation.llm import GeminiLLM
+from esg_implementation.tools import StakeholderAnalysisTool
+
+def _read(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+class FakeGeminiModel:
+    def generate_content(self, prompt, generation_config=None):
+        usage = SimpleNamespace(prompt_token_count=12, candidates_token_count=5)
+        return SimpleNamespace(text="Thought: I now know the final answer\nFinal Answer: done", usage_metadata=usage)
+
+def test_run_records_tools_tasks_and_llm_calls():
+    """Test a run emits start/end, task timings, tool argument hashes and LLM token counts"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = EventLog(Path(temp_dir) / "events.jsonl")
+        tool = StakeholderAnalysisTool()
+        stakeholders = [{"name": "Investors", "influence_level": 9}]
+        tool._run(stakeholders)  # Outside a run: not recorded
+
+        task = Task(description="Collect baseline data", expected_output="Data")
+        with run_events(log, organization="TestCorp") as run:
+            # As delivered by crewai's event bus during crew.kickoff()
+            events.on_task_started(task, TaskStartedEvent(context="", task=task))
+            tool._run(stakeholders)
+            tool._run(stakeholders)
+            GeminiLLM(FakeGeminiModel()).call("Assess materiality")
+            output = TaskOutput(description=task.description, raw="Data", agent="Analyst")
+            events.on_task_finished(task, TaskCompletedEvent(output=output, task=task))
+        log.close()
+
+        records = _read(log.path)
+        assert [r["ev"] for r in records] == ["run_start", "task_start", "tool", "tool", "llm", "task_end", "run_end"]
+        assert {r["run"] for r in records} == {run.run_id}
+        assert records[0]["organization"] == "TestCorp"
+        assert records[2]["name"] == "stakeholder_analysis_tool"
+        assert records[2]["args"] == records[3]["args"]
+        assert (records[4]["in_tokens"], records[4]["out_tokens"]) == (12, 5)
+        assert records[5]["name"] == "Collect baseline data" and records[5]["dur"] >= 0
+        assert records[-1]["status"] == "ok"
+
+def test_failed_run_records_error_and_concurrent_runs_stay_separate():
+    """Test errors are recorded and each thread's run gets its own ID"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = EventLog(Path(temp_dir) / "events.jsonl")
+        with pytest.raises(RuntimeError):
+            with run_events(log, run_id="failing"):
+                raise RuntimeError("LLM unavailable")
+
+        def worker(name):
+            with run_events(log, run_id=name):
+                for _ in range(20):
+                    events.emit("step", worker=name)
+
+        threads = [threading.Thread(target=worker, args=(f"run{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+
+        records = _read(log.path)
+        assert [r["ev"] for r in records[:3]] == ["run_start", "error", "run_end"]
+        assert records[1]["error"] == "RuntimeError: LLM unavailable" and records[2]["status"] == "error"
+        steps = [r for r in records if r["ev"] == "step"]
+        assert len(steps) == 80 and all(r["run"] == r["worker"] for r in steps)
+
+def test_event_log_rotates_by_size():
+    """Test the log rotates into numbered backups and keeps at most the configured number"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = EventLog(Path(temp_dir) / "events.jsonl", max_bytes=1000, backups=2)
+        for i in range(200):
+            log.write({"ev": "step", "i": i})
+        log.close()
+        files = sorted(path.name for path in Path(temp_dir).iterdir())
+        assert files == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+        assert all(path.stat().st_size <= 1000 for path in Path(temp_dir).iterdir())
+        assert _read(log.path)[-1]["i"] == 199
+
+def test_listener_removed_during_emit_does_not_skip_others():
+    """Test every listener registered when an event is emitted receives it"""
+    received = []
+
+    def once(record):
+        events.remove_listener(once)
+        received.append("once")
+
+    def always(record):
+        received.append("always")
+
+    events.add_listener(once)
+    events.add_listener(always)
+    try:
+        events.RunEvents(None).emit("step")
+    finally:
+        events.remove_listener(always)
+    assert received == ["once", "always"]
+
+def test_failing_listener_does_not_fail_the_run(monkeypatch, capsys):
+    """Test a listener that raises is reported without stopping the emit or the other listeners"""
+    received = []
+
+    def broken(record):
+        raise RuntimeError("listener bug")
+
+    monkeypatch.setattr(events.sys, "__stderr__", events.sys.stderr)
+    events.add_listener(broken)
+    events.add_listener(received.append)
+    try:
+        events.RunEvents(None).emit("step")
+    finally:
+        events.remove_listener(broken)
+        events.remove_listener(received.append)
+    assert [record["ev"] for record in received] == ["step"]
+    assert "broken failed on step: listener bug" in capsys.readouterr().err
+
+def test_workflow_run_with_injected_llm_records_every_call(monkeypatch):
+    """Test a full run_implementation uses an injected LLM, without a Gemini API key"""
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(data_path=temp_dir, output_path=f"{temp_dir}/output",
+                           agents={"verbose": False},
+                           logging={"compress_logs": False, "retention_days": 0, "retention_max_files": 0})
+        manager = ESGWorkflowManager(config, llm=GeminiLLM(FakeGeminiModel()))
+        manager.run_implementation("TestCorp")
+        manager.event_log.close()
+
+        records = _read(Path(temp_dir) / "output" / "esg_events.jsonl")
+        kinds = [r["ev"] for r in records]
+        assert kinds[0] == "run_start" and kinds[-1] == "run_end" and records[-1]["status"] == "ok"
+        assert kinds.count("task_end") == len(next(r for r in records if r["ev"] == "plan")["tasks"])
+        assert kinds.count("llm") >= kinds.count("task_end")
+        assert manager.repository.load("TestCorp") is not None
@@ -0,0 +1,86 @@
+"""
+Test streaming metric ingestion
+"""
+
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+from esg_implementation.ingestion import detect_format, ingest_metrics
+from esg_implementation.models import ESGMetric, ESGOrganization
+from esg_implementation.tools import DataCollectionTool
+
+CSV_FEED = """name,unit,data_source,category,current_value
+Scope 1 Emissions,tCO2e,Meters,Environmental,1200
+Water Use,m3,Meters,Environmental,
+Scope 1 Emissions,tCO2e,Meters,Environmental,1100
+Broken Metric,kg,Meters,Environmental,not-a-number
+"""
+
+def _write(directory, name, content):
+    path = Path(directory) / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+def test_ingest_csv_upserts_by_name_and_rejects_bad_rows():
+    """Test CSV ingestion upserts metrics and reports rejected rows"""
+    organization = ESGOrganization(name="TestCorp", metrics=[
+        ESGMetric(name="Water Use", unit="m3", data_source="Old", category="Environmental", current_value=5)
+    ])
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stats = ingest_metrics(organization, _write(temp_dir, "feed.csv", CSV_FEED), chunk_size=2)
+
+    assert (stats.rows, stats.accepted, stats.rejected) == (4, 3, 1)
+    assert (stats.inserted, stats.updated) == (1, 2)
+    assert stats.rejects[0]["line"] == 5
+    assert "current_value" in stats.rejects[0]["errors"][0]
+    by_name = {m.name: m for m in organization.metrics}
+    assert len(organization.metrics) == 2
+    assert by_name["Scope 1 Emissions"].current_value == 1100
+    assert by_name["Water Use"].current_value is None
+    assert by_name["Water Use"].data_source == "Meters"
+
+def test_ingest_gzipped_jsonl_with_parse_errors():
+    """Test JSON Lines ingestion through gzip, including unparseable lines"""
+    lines = [
+        json.dumps({"name": f"Metric {i}", "unit": "t", "data_source": "ERP",
+                    "category": "Social", "current_value": i})
+        for i in range(10)
+    ]
+    lines.insert(3, "{not json")
+    lines.insert(5, json.dumps({"name": "Missing fields"}))
+    organization = ESGOrganization(name="TestCorp")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "feed.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        stats = ingest_metrics(organization, str(path), chunk_size=4, max_rejects=1)
+
+    assert (stats.accepted, stats.rejected) == (10, 2)
+    assert len(stats.rejects) == 1
+    assert stats.rejects[0]["errors"][0].startswith("parse error")
+    assert [m.current_value for m in organization.metrics] == list(range(10))
+    assert stats.rows_per_second > 0
+
+def test_detect_format():
+    """Test feed format detection from file extensions"""
+    assert detect_format("feed.CSV") == "csv"
+    assert detect_format("feed.ndjson.gz") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("feed.json")
+
+def test_data_collection_tool_ingest():
+    """Test the ingest operation of DataCollectionTool"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = DataCollectionTool()._run("ingest", {"name": "TestCorp"}, _write(temp_dir, "feed.csv", CSV_FEED))
+    assert result["status"] == "ingested"
+    assert result["stats"]["rejected"] == 1
+    assert len(result["organization"]["metrics"]) == 2
+
+def test_data_collection_tool_ingest_reports_invalid_organization():
+    """Test the ingest operation returns an error for organization data that fails validation"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = DataCollectionTool()._run("ingest", {"metrics": "none"}, _write(temp_dir, "feed.csv", CSV_FEED))
+    assert "error" in result
@@ -0,0 +1,99 @@
+"""
+Test lazy, section-level loading of organization files
+"""
+
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from esg_implementation import lazy, serialization
+from esg_implementation.lazy import LazyOrganization, index_json_object
+from esg_implementation.models import ESGMetric, ESGOrganization, Stakeholder
+from esg_implementation.repository import FileRepository
+
+TRICKY = {
+    "name": "Quote \" brace } bracket ] colon : comma , backslash \\",
+    "vision": None,
+    "metrics": [{"name": "x\\\\\"y", "unit": "{[", "data_source": "]}", "category": "a,b:c"}],
+    "reports": [{"nested": [1, [2, {"deep": "}}]]"}], {}]}],
+}
+
+def _organization():
+    return ESGOrganization(
+        name="TestCorp",
+        stakeholders=[Stakeholder(name="Investors", category="Financial", influence_level=8, expectations=["Returns"])],
+        metrics=[ESGMetric(name="Scope 1 Emissions", unit="tCO2e", data_source="Meters", category="Environmental")],
+        reports=[{"title": "GRI Report", "content": "x" * 1000}]
+    )
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("block_size", [7, 1 << 20])
+def test_index_handles_strings_escapes_and_block_boundaries(monkeypatch, indent, block_size):
+    """Test offsets are exact for escaped quotes, structural characters in strings and small blocks"""
+    monkeypatch.setattr(lazy, "SCAN_BLOCK_SIZE", block_size)
+    monkeypatch.setattr(lazy, "_MASK_SLICE_SIZE", 3)
+    document = json.dumps(TRICKY, indent=indent).encode("utf-8")
+    index = index_json_object(document)
+    assert list(index) == list(TRICKY)
+    for key, (start, end) in index.items():
+        assert json.loads(document[start:end]) == TRICKY[key]
+
+def test_index_rejects_non_objects():
+    """Test arrays and truncated documents are refused"""
+    with pytest.raises(ValueError):
+        index_json_object(b"[1, 2]")
+    with pytest.raises(ValueError):
+        index_json_object(b'{"name": "x"')
+
+def test_view_parses_only_accessed_sections():
+    """Test sections are validated on first access and the rest stay unparsed"""
+    organization = _organization()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = serialization.save(organization, Path(temp_dir) / "org.json")
+        with LazyOrganization(path) as view:
+            assert view.metrics == organization.metrics
+            assert view.loaded_sections == ["metrics"]
+            partial = view.to_organization(["metrics"])
+        assert partial.reports == [] and partial.stakeholders == []
+        assert partial.name == "TestCorp" and partial.loaded_sections == {"metrics"}
+        with LazyOrganization(path) as view:
+            assert view.to_organization() == organization
+
+def test_view_decodes_compressed_and_binary_files():
+    """Test files without byte-addressable JSON fall back to a full decode"""
+    organization = _organization()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for codec, compression in (("json", "gzip"), ("msgpack", None)):
+            path = serialization.save(organization, Path(temp_dir) / f"org.{codec}", codec, compression)
+            with LazyOrganization(path) as view:
+                assert view.stakeholders == organization.stakeholders
+
+def test_index_cache_evicts_safely_across_threads(monkeypatch):
+    """Test concurrent views of more files than the cache holds all read their sections"""
+    monkeypatch.setattr(lazy, "INDEX_CACHE_SIZE", 2)
+    organization = _organization()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [serialization.save(organization, Path(temp_dir) / f"org{i}.json") for i in range(16)]
+
+        def read(path):
+            with LazyOrganization(path) as view:
+                return view.metrics
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(metrics == organization.metrics for metrics in pool.map(read, paths * 20))
+        assert len(lazy._INDEX_CACHE) <= 2
+
+def test_file_repository_partial_load_is_lazy(monkeypatch):
+    """Test partial repository loads never validate the skipped sections"""
+    organization = _organization()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir)
+        repository.save(organization)
+        parsed = []
+        original = LazyOrganization._parse
+        monkeypatch.setattr(LazyOrganization, "_parse", lambda self, name: parsed.append(name) or original(self, name))
+        loaded = repository.load("TestCorp", sections=["stakeholders"])
+        assert loaded.stakeholders == organization.stakeholders
+        assert "reports" not in parsed and "metrics" not in parsed
@@ -2,7 +2,9 @@
 Test ESG implementation logging functionality
 """
 
+import io
 import os
+import sys
 import pytest
 import logging
 import tempfile
@@ -27,6 +29,7 @@ def test_esg_logger_file_creation():
         log.info("Test info message")
         log.warning("Test warning message")
         log.error("Test error message")
+        logger.flush()
         
         # Check log file exists and has correct format
         log_files = list(Path(temp_dir).glob("esg_implementation_*.log"))
@@ -45,6 +48,7 @@ def test_esg_logger_file_creation():
             assert "Test info message" in content
             assert "Test warning message" in content
             assert "Test error message" in content
+        logger.cleanup()
 
 def test_esg_logger_console_output():
     """Test that ESGLogger outputs to both console and file"""
@@ -66,6 +70,7 @@ def test_esg_logger_console_output():
         
         try:
             log.info("Console test message")
+            logger.flush()
             console_output = captured_output.getvalue()
             assert "Console test message" in console_output
             
@@ -77,6 +82,20 @@ def test_esg_logger_console_output():
                 
         finally:
             sys.stdout = sys.__stdout__
+            logger.cleanup()
+
+def test_records_outside_any_run_reach_the_console():
+    """Test records logged after a run ended are printed rather than dropped"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ESGLogger(ESGConfig(output_path=temp_dir)):
+            pass
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        try:
+            logging.getLogger("ESGImplementation").error("ESG Implementation failed")
+        finally:
+            sys.stdout = sys.__stdout__
+        assert "ERROR - ESG Implementation failed" in captured_output.getvalue()
 
 def test_esg_logger_levels():
     """Test that ESGLogger respects log levels"""
@@ -94,6 +113,7 @@ def test_esg_logger_levels():
         log.info("Info message")
         log.warning("Warning message")
         log.error("Error message")
+        logger.flush()
         
         # Check log file content
         log_file = next(Path(temp_dir).glob("esg_implementation_*.log"))
@@ -103,3 +123,148 @@ def test_esg_logger_levels():
             assert "Info message" not in content
             assert "Warning message" in content
             assert "Error message" in content
+        logger.cleanup()
+
+def test_buffered_file_writer_flushes_by_size_interval_and_close():
+    """Test buffered console capture reaches the file on a full buffer, after the interval and on close"""
+    import time
+    from esg_implementation.logging import BufferedFileWriter
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "capture.log"
+        writer = BufferedFileWriter(path, buffer_size=100, flush_interval=0.5)
+        writer.write("short line\n")
+        assert path.read_text() == ""
+        deadline = time.monotonic() + 5
+        while path.read_text() != "short line\n" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.read_text() == "short line\n"
+
+        writer.flush_interval = 60
+        for i in range(50):
+            writer.write(f"line {i}\n")
+        # Full batches are written without waiting for the interval
+        while path.stat().st_size < 100 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.stat().st_size >= 100
+        writer.flush()
+        assert path.read_text().splitlines()[1:] == [f"line {i}" for i in range(50)]
+
+        writer.write("last line\n")
+        writer.close()
+        assert path.read_text().endswith("line 49\nlast line\n")
+        with pytest.raises(ValueError):
+            writer.write("after close\n")
+
+def test_concurrent_runs_log_to_separate_files():
+    """Test runs in threads and async tasks each get only their own records, and stdout is not replaced"""
+    import asyncio
+    import sys
+    import threading
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(output_path=temp_dir, logging={"level": "INFO", "compress_logs": False})
+        log = logging.getLogger("ESGImplementation")
+        stdout = sys.stdout
+
+        def thread_run(name):
+            with ESGLogger(config, run_id=name) as logger:
+                assert sys.stdout is stdout
+                for i in range(50):
+                    log.info(f"{name} step {i}")
+
+        threads = [threading.Thread(target=thread_run, args=(f"thread{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        async def task_run(name):
+            with ESGLogger(config, run_id=name):
+                for i in range(20):
+                    log.info(f"{name} step {i}")
+                    await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*(task_run(f"task{i}") for i in range(3)))
+
+        asyncio.run(main())
+        log.info("Outside any run")
+
+        log_files = sorted(Path(temp_dir).glob("esg_implementation_*.log"))
+        assert len(log_files) == 7
+        for log_file in log_files:
+            name = log_file.stem.rsplit("_", 1)[1]
+            lines = log_file.read_text().splitlines()
+            assert len(lines) == (50 if name.startswith("thread") else 20)
+            assert all(f"{name} step" in line for line in lines)
+
+def test_capture_stdout_copies_prints_within_the_run_only():
+    """Test opt-in stdout capture copies a run's prints to its file and restores stdout afterwards"""
+    import sys
+    import threading
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(output_path=temp_dir, logging={"capture_stdout": True, "compress_logs": False})
+        original_stdout = sys.stdout
+        with ESGLogger(config, run_id="capturing") as logger:
+            print("Printed in the run")
+            other = threading.Thread(target=print, args=("Printed elsewhere",))
+            other.start()
+            other.join()
+        assert sys.stdout is original_stdout
+        content = logger.log_file.read_text()
+        assert "Printed in the run" in content and "Printed elsewhere" not in content
+
+def test_run_batch_runs_workflows_concurrently_with_own_logs(monkeypatch):
+    """Test run_batch returns each organization's result and writes one log file per run"""
+    from types import SimpleNamespace
+    from esg_implementation.core import ESGWorkflowManager
+
+    monkeypatch.setattr(ESGWorkflowManager, "_setup_api_key", lambda self: None)
+    monkeypatch.setattr(
+        ESGWorkflowManager, "create_workflow",
+        lambda self, organization: SimpleNamespace(tasks=[], kickoff=lambda: f"Done: {organization.name}")
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(output_path=temp_dir, data_path=temp_dir, logging={"level": "INFO", "compress_logs": False})
+        manager = ESGWorkflowManager(config)
+        names = ["GreenTech", "EcoCorp", "TechInnovate"]
+        assert manager.run_batch(names, max_workers=3) == {name: f"Done: {name}" for name in names}
+
+        log_files = list(Path(temp_dir).glob("esg_implementation_*.log"))
+        assert len(log_files) == 3
+        logged = sorted(f.read_text().split("Running ESG implementation for ")[1].split(" ")[0] for f in log_files)
+        assert logged == sorted(names)
+        manager.event_log.close()
+
+def test_logs_rotate_compress_and_expire_through_the_index():
+    """Test size rotation, background gzip of closed files, retention limits and index lookup"""
+    import gzip
+    from esg_implementation.retention import INDEX_NAME, LogIndex, apply_retention
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(output_path=temp_dir, logging={"max_log_bytes": 2000, "buffer_size": 100})
+        log = logging.getLogger("ESGImplementation")
+        with ESGLogger(config, run_id="rotating") as logger:
+            for i in range(100):
+                log.info(f"Step {i:03d} of a long run")
+            logger.flush()
+        logger.maintenance.sweep().result()
+
+        index = LogIndex(temp_dir)
+        files = index.find("rotating")
+        assert len(files) > 2 and all(f.name.endswith(".log.gz") and f.exists() for f in files)
+        assert files[-1].name == logger.log_file.name + ".gz"
+        assert all(f.stat().st_size <= 2000 for f in files)
+        text = "".join(gzip.open(f, "rt").read() for f in files)
+        assert [line.split("Step ")[1][:3] for line in text.splitlines()] == [f"{i:03d}" for i in range(100)]
+        assert not list(Path(temp_dir).glob("*.log"))
+
+        deleted = apply_retention(index, max_files=1)
+        assert deleted == files[:-1] and not any(f.exists() for f in deleted)
+        assert index.find("rotating") == files[-1:]
+        assert apply_retention(index, max_age_days=1) == []
+        assert sorted(p.name for p in Path(temp_dir).iterdir() if not p.name.startswith(".")) == sorted(
+            [files[-1].name, INDEX_NAME]
+        )
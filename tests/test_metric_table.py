@@ -0,0 +1,83 @@
+"""
+Test the compact array-backed metric table
+"""
+
+import tempfile
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pytest
+from esg_implementation import serialization
+from esg_implementation.lazy import LazyOrganization
+from esg_implementation.metric_table import MetricTable, StringTable
+from esg_implementation.models import ESGMetric, ESGOrganization
+from esg_implementation.reporting import ReportEngine
+from esg_implementation.visualization import render_metrics_dashboard
+
+def _metrics():
+    return [
+        ESGMetric(name="Scope 1 Emissions", unit="tCO2e", data_source="Meters", category="Environmental",
+                  current_value=1200, target_value=1000),
+        ESGMetric(name="Water Use", unit="m3", data_source="Meters", category="Environmental"),
+        ESGMetric(name="Board Diversity", unit="%", data_source="HR", category="Governance",
+                  current_value=40.5, target_value=50),
+    ]
+
+def test_round_trip_and_interning():
+    """Test tables round-trip with ESGMetric lists and intern repeated strings"""
+    metrics = _metrics()
+    table = MetricTable.from_metrics(metrics)
+    assert len(table) == 3
+    assert table.to_metrics() == metrics
+    assert table.strings["data_source"].values == ["Meters", "HR"]
+    assert table.codes["category"].tolist() == [0, 0, 1]
+    assert np.isnan(table.values["current_value"][1])
+    assert table.row(1)["current_value"] is None
+
+def test_columns_are_validated_in_bulk():
+    """Test invalid values are rejected with their row"""
+    records = [m.model_dump() for m in _metrics()]
+    records[2]["current_value"] = "lots"
+    with pytest.raises(ValueError, match="current_value at row 2"):
+        MetricTable.from_records(records)
+    del records[1]["unit"]
+    with pytest.raises(ValueError, match="unit at row 1"):
+        MetricTable.from_records(records)
+
+def test_filter_group_and_progress():
+    """Test array-based selection, grouping and target progress"""
+    table = MetricTable.from_metrics(_metrics())
+    groups = table.group_by("category")
+    assert list(groups) == ["Environmental", "Governance"]
+    assert groups["Environmental"].column("name").tolist() == ["Scope 1 Emissions", "Water Use"]
+    assert len(table.where("category", "Social")) == 0
+    assert table.progress()[0] == pytest.approx(1000 / 1200 * 100)
+    assert np.isnan(table.progress()[1])
+    permuted = {c: StringTable(reversed(table.strings[c].values)) for c in table.strings}
+    recoded = MetricTable({c: permuted[c].encode(table.column(c)) for c in permuted}, table.values, permuted)
+    assert recoded.codes["name"].tolist() != table.codes["name"].tolist()
+    assert recoded.digest() == table.digest()
+
+def test_reports_render_identically_from_tables():
+    """Test the report engine gives the same output for tables and dict lists"""
+    metrics = _metrics()
+    as_dicts = {"name": "TestCorp", "metrics": [m.model_dump() for m in metrics]}
+    as_table = {"name": "TestCorp", "metrics": MetricTable.from_metrics(metrics)}
+    for framework in ("GRI", "SASB", "TCFD"):
+        engine = ReportEngine(framework, "markdown")
+        assert engine.render(as_table, date="2024-01-01") == engine.render(as_dicts, date="2024-01-01")
+
+def test_dashboard_and_lazy_view_use_tables():
+    """Test the dashboard draws from a table and the lazy view builds one from JSON"""
+    organization = ESGOrganization(name="TestCorp", metrics=_metrics())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = serialization.save(organization, Path(temp_dir) / "org.json")
+        with LazyOrganization(path) as view:
+            table = view.metric_table()
+            assert view.loaded_sections == []
+    assert table.to_metrics() == organization.metrics
+    fig = render_metrics_dashboard(table)
+    assert len(fig.axes) == 3
+    assert len(fig.axes[0].patches) == 1
@@ -0,0 +1,74 @@
+"""
+Test the operational metrics registry and Prometheus endpoint
+"""
+
+import threading
+import urllib.request
+
+import pytest
+from esg_implementation import metrics
+from esg_implementation.events import run_events
+from esg_implementation.metrics import MetricsRegistry
+from esg_implementation.tools import StakeholderAnalysisTool
+
+def _sample(text, line_start):
+    return float(next(line for line in text.splitlines() if line.startswith(line_start)).rsplit(" ", 1)[1])
+
+def test_registry_renders_prometheus_text_and_sums_threads():
+    """Test counters, gauges and histograms render correctly with updates from many threads"""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls", "Calls made", ["tool"])
+    depth = registry.gauge("depth", "Queue depth")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+
+    def work():
+        for _ in range(1000):
+            calls.labels('say "hi"').inc()
+        depth.inc(2)
+        latency.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    depth.dec()
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE calls counter" in text and "# HELP depth Queue depth" in text
+    assert 'calls_total{tool="say \\"hi\\""} 4000' in text
+    assert "\ndepth 7\n" in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="1"} 4' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 5' in text
+    assert "latency_seconds_sum 7\n" in text and "latency_seconds_count 5" in text
+    with pytest.raises(ValueError):
+        registry.counter("calls", "Duplicate")
+    with pytest.raises(ValueError):
+        calls.labels()
+
+def test_run_events_update_metrics_served_over_http():
+    """Test run and tool events feed the default registry, which is served at /metrics"""
+    server = metrics.serve(port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    before = urllib.request.urlopen(url).read().decode()
+    tool = StakeholderAnalysisTool()
+
+    with run_events(None, run_id="metrics"):
+        assert metrics.RUNS_IN_FLIGHT.labels().get() >= 1
+        tool._run([{"name": "Investors", "influence_level": 9}])
+    with pytest.raises(RuntimeError):
+        with run_events(None):
+            raise RuntimeError("LLM unavailable")
+
+    response = urllib.request.urlopen(url)
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    after = response.read().decode()
+    for line in ['esg_runs_total{status="ok"}', 'esg_runs_total{status="error"}',
+                 'esg_tool_calls_total{tool="stakeholder_analysis_tool",status="ok"}',
+                 'esg_tool_duration_seconds_count{tool="stakeholder_analysis_tool"}']:
+        assert _sample(after, line) == (_sample(before, line) if line in before else 0) + 1
+    assert _sample(after, "esg_runs_in_flight") == _sample(before, "esg_runs_in_flight")
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(url.replace("/metrics", "/other"))
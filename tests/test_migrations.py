@@ -0,0 +1,113 @@
+"""
+Test schema migrations of organization data files
+"""
+
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from esg_implementation import changelog, migrations, serialization
+from esg_implementation.lazy import LazyOrganization
+from esg_implementation.locking import file_lock
+from esg_implementation.models import SCHEMA_VERSION, ESGOrganization
+from esg_implementation.repository import ConcurrentModificationError, FileRepository
+
+MONOLITH_ORGANIZATION = {
+    "name": "TestCorp",
+    "material_issues": [
+        {"name": "Climate", "category": "Environmental", "importance_to_business": 9,
+         "importance_to_stakeholders": 10, "description": "Emissions"},
+        {"name": "Diversity", "category": "Social", "importance_to_business": 6,
+         "importance_to_stakeholders": 8, "description": "Workforce", "materiality_score": 8},
+    ],
+    "actions": [
+        {"name": "Solar", "description": "Rooftop PV", "responsible_party": "Ops", "timeline": "2025",
+         "resources_required": "$1M budget, installer", "status": "In Progress",
+         "related_metrics": ["Renewable Energy"]},
+    ],
+    "reports": []
+}
+
+def test_monolith_data_migrates_to_package_schema():
+    """Test importance ratings become scores and actions become initiatives"""
+    assert migrations.detect_version(MONOLITH_ORGANIZATION) == 1
+    organization = ESGOrganization.model_validate(migrations.migrate(MONOLITH_ORGANIZATION))
+    assert [issue.materiality_score for issue in organization.material_issues] == [9.5, 8.0]
+    initiative = organization.initiatives[0]
+    assert (initiative.responsible_team, initiative.status) == ("Ops", "In Progress")
+    assert initiative.resources_needed == ["$1M budget", "installer"]
+    assert initiative.success_criteria == ["Progress on Renewable Energy"]
+    assert organization.schema_version == SCHEMA_VERSION
+    assert "actions" in MONOLITH_ORGANIZATION  # The input is not modified
+
+    with pytest.raises(ValueError):
+        migrations.migrate({"name": "Future", "schema_version": SCHEMA_VERSION + 1})
+
+def test_bulk_migration_rewrites_files_in_place():
+    """Test the process pool migrates plain and compressed files and reports failures"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for i in range(20):
+            (root / f"org{i}_esg_data.json").write_text(json.dumps(MONOLITH_ORGANIZATION), encoding="utf-8")
+        (root / "packed_esg_data.json.gz").write_bytes(
+            serialization.COMPRESSIONS["gzip"].compress(json.dumps(MONOLITH_ORGANIZATION).encode("utf-8"))
+        )
+        serialization.save(ESGOrganization(name="Current"), root / "current_esg_data.json")
+        (root / "broken_esg_data.json").write_text("{", encoding="utf-8")
+        (root / "notes.txt").write_text("not an organization", encoding="utf-8")
+
+        results = []
+        counts = migrations.migrate_files(
+            migrations.iter_organization_files([temp_dir]), workers=2, on_result=results.append, batch_size=4
+        )
+        assert counts == {"migrated": 21, "current": 1, "failed": 1}
+        assert [r.path for r in results if r.status == "failed"] == [str(root / "broken_esg_data.json")]
+
+        packed = serialization.load(root / "packed_esg_data.json.gz")
+        assert packed.initiatives[0].name == "Solar"
+        assert json.loads((root / "org0_esg_data.json").read_text())["schema_version"] == SCHEMA_VERSION
+        # Only the organizations' lock files remain, no temporary files
+        assert not [path for path in root.iterdir() if path.name.startswith(".") and path.suffix != ".lock"]
+
+def test_migration_takes_the_repository_lock_and_advances_the_revision():
+    """Test migrating waits for the organization's lock, folds in its change log and bumps the revision"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "testcorp_esg_data.json"
+        path.write_text(json.dumps(MONOLITH_ORGANIZATION), encoding="utf-8")
+        repository = FileRepository(temp_dir, durable=False)
+        repository.apply("TestCorp", [changelog.append("reports", {"title": "GRI Report"})])
+        stale = repository.load("TestCorp")
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with file_lock(repository.lock_for("TestCorp")):
+                pending = pool.submit(migrations.migrate_file, str(path))
+                with pytest.raises(TimeoutError):
+                    pending.result(timeout=0.2)
+            assert pending.result().status == "migrated"
+
+        assert not repository.changelog_for("TestCorp").size()
+        migrated = serialization.load(path)
+        assert migrated.revision == stale.revision + 1 and migrated.reports == [{"title": "GRI Report"}]
+        with pytest.raises(ConcurrentModificationError):
+            repository.save(stale, expected_revision=stale.revision)
+
+def test_loading_migrates_older_files():
+    """Test files in an older layout are migrated on load instead of validated as current"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "testcorp_esg_data.json"
+        path.write_text(json.dumps(MONOLITH_ORGANIZATION), encoding="utf-8")
+        for organization in (serialization.load(path), ESGOrganization.load_from_json(str(path)),
+                             LazyOrganization(path).to_organization()):
+            assert [issue.materiality_score for issue in organization.material_issues] == [9.5, 8.0]
+            assert organization.initiatives[0].name == "Solar"
+            assert organization.schema_version == SCHEMA_VERSION
+
+        with pytest.raises(ValueError):
+            serialization.loads(json.dumps({**MONOLITH_ORGANIZATION, "schema_version": SCHEMA_VERSION + 1}).encode())
+        gzipped = serialization.COMPRESSIONS["gzip"].compress(json.dumps(MONOLITH_ORGANIZATION).encode("utf-8"))
+        assert serialization.loads(gzipped).material_issues[0].materiality_score == 9.5
+
+    example = Path(__file__).resolve().parent.parent / "examples" / "techinnovate_esg_data.json"
+    assert [issue.materiality_score for issue in serialization.load(example).material_issues] == [8.5, 7.5, 9.0]
@@ -0,0 +1,69 @@
+"""
+Test the maintained secondary indexes on organization sections
+"""
+
+import copy
+import pickle
+import random
+
+from esg_implementation.models import ESGMetric, ESGOrganization, IndexedList
+
+def _metric(name, category="Environmental", value=None):
+    return ESGMetric(name=name, unit="t", data_source="Meters", category=category, current_value=value)
+
+def _expected(records, key, value):
+    return [i for i, record in enumerate(records) if getattr(record, key) == value]
+
+def test_sections_are_indexed_and_serialize_as_lists():
+    """Test that validated, constructed and assigned sections are indexed lists"""
+    organization = ESGOrganization(name="TestCorp", metrics=[_metric("A"), _metric("B", "Social")])
+    assert isinstance(organization.metrics, IndexedList)
+    assert isinstance(ESGOrganization.model_construct(name="TestCorp", metrics=[]).metrics, IndexedList)
+    organization.stakeholders = []
+    assert isinstance(organization.stakeholders, IndexedList)
+
+    assert organization.find("metrics", "B").category == "Social"
+    assert organization.find("metrics", "Missing") is None
+    assert [m.name for m in organization.by_category("metrics", "Environmental")] == ["A"]
+    assert organization.model_dump()["metrics"][1]["name"] == "B"
+    assert ESGOrganization.model_validate_json(organization.model_dump_json()) == organization
+
+def test_indexes_stay_in_sync_with_mutations():
+    """Test lookups against a linear scan after random appends, replacements and deletions"""
+    rng = random.Random(7)
+    records = IndexedList(_metric(f"M{i}", rng.choice(["Environmental", "Social"])) for i in range(50))
+    assert records.position("name", "M3") == 3
+    for step in range(500):
+        action = rng.random()
+        if action < 0.4:
+            records.append(_metric(f"M{rng.randrange(80)}", rng.choice(["Environmental", "Social", "Governance"])))
+        elif action < 0.8 and records:
+            records[rng.randrange(-len(records), len(records))] = _metric(f"M{rng.randrange(80)}", "Governance")
+        elif records:
+            del records[rng.randrange(len(records))]
+        for name in ("M1", "M42", f"M{step % 80}"):
+            assert records.positions("name", name) == _expected(records, "name", name)
+        for category in ("Environmental", "Social", "Governance"):
+            assert records.select("category", category) == [r for r in records if r.category == category]
+
+def test_indexes_follow_records_changed_in_place():
+    """Test lookups see indexed attributes changed on a record without reassigning it"""
+    organization = ESGOrganization(name="TestCorp", metrics=[_metric("A"), _metric("B")])
+    assert [m.name for m in organization.by_category("metrics", "Environmental")] == ["A", "B"]
+    assert organization.metrics.position("name", "B") == 1
+
+    organization.metrics[0].category = "Social"
+    organization.metrics[1].name = "Renamed"
+    assert [m.name for m in organization.by_category("metrics", "Social")] == ["A"]
+    assert [m.name for m in organization.by_category("metrics", "Environmental")] == ["Renamed"]
+    assert organization.find("metrics", "B") is None
+    assert organization.metrics.position("name", "Renamed") == 1
+
+def test_copies_rebuild_indexes():
+    """Test that copied and pickled organizations keep working indexes"""
+    organization = ESGOrganization(name="TestCorp", metrics=[_metric("A"), _metric("B")])
+    assert organization.find("metrics", "B") is not None
+    for clone in (copy.deepcopy(organization), pickle.loads(pickle.dumps(organization)), organization.model_copy()):
+        clone.metrics.append(_metric("C", "Social"))
+        assert clone.metrics.position("name", "C") == 2
+        assert [m.name for m in clone.by_category("metrics", "Social")] == ["C"]
@@ -0,0 +1,45 @@
+"""
+Test opt-in CPU and memory profiling of runs
+"""
+
+import pstats
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from esg_implementation.models import ESGMetric
+from esg_implementation.profiling import profile_run
+
+def _build_metrics():
+    return [
+        ESGMetric(name=f"Metric {i}", unit="tCO2e", data_source="Meters", category="Environmental", current_value=i)
+        for i in range(2000)
+    ]
+
+def test_profile_run_writes_cpu_and_memory_artifacts_with_summary():
+    """Test a profiled block writes a pstats file, a tracemalloc snapshot and a readable summary"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with profile_run(temp_dir, "run", cpu=True, memory=True, top=10) as artifacts:
+            metrics = _build_metrics()
+
+        assert sorted(p.name for p in Path(temp_dir).iterdir()) == ["run.prof", "run.tracemalloc", "run_profile.txt"]
+        stats = pstats.Stats(str(artifacts.cpu))
+        assert any(func[2] == "_build_metrics" for func in stats.stats)
+        snapshot = tracemalloc.Snapshot.load(str(artifacts.memory))
+        assert snapshot.statistics("filename")
+        summary = artifacts.summary.read_text()
+        assert "_build_metrics" in summary and "Peak traced memory" in summary
+        assert not tracemalloc.is_tracing()
+        assert len(metrics) == 2000
+
+def test_profile_run_writes_on_error_and_skips_nested_runs():
+    """Test artifacts are written when the block raises and a concurrent profile runs unprofiled"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(RuntimeError):
+            with profile_run(temp_dir, "outer", cpu=True) as outer:
+                with profile_run(temp_dir, "inner", cpu=True) as inner:
+                    assert inner is None
+                raise RuntimeError("LLM unavailable")
+        assert outer.cpu.exists() and outer.memory is None
+        assert sorted(p.name for p in Path(temp_dir).iterdir()) == ["outer.prof", "outer_profile.txt"]
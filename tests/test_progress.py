@@ -0,0 +1,52 @@
+"""
+Test the live progress view of runs and tasks
+"""
+
+import io
+from types import SimpleNamespace
+
+from esg_implementation import events
+from esg_implementation.events import run_events
+from esg_implementation.progress import ProgressView
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def _run(name, tasks, fail_llm=False):
+    with run_events(None, organization=name):
+        events.emit("plan", tasks=tasks)
+        for task in tasks:
+            events.on_task_started(None, SimpleNamespace(task=SimpleNamespace(name=task)))
+            if fail_llm:
+                events.emit("llm", model="gemini", dur=0.1, error="RuntimeError: quota")
+            events.emit("llm", model="gemini", dur=0.2, in_tokens=100, out_tokens=20)
+            events.on_task_finished(None, SimpleNamespace(task=SimpleNamespace(name=task)))
+
+def test_view_tracks_tasks_tokens_and_retries_of_a_run():
+    """Test a run's row and task rows show state, tokens and retries from run events"""
+    view = ProgressView(stream=FakeTerminal(), interval=60)
+    with view:
+        _run("TechInnovate", ["Stakeholder analysis", "Materiality assessment", "Gap analysis"], fail_llm=True)
+        events.emit("llm", model="gemini", in_tokens=5)  # Outside any run: ignored
+    lines = view.render()
+    assert lines[0].startswith("TechInnovate") and "done" in lines[0] and "task 3/3" in lines[0]
+    assert "tokens      360" in lines[0] and lines[0].endswith("retries 3")
+    assert len(lines) == 4 and all("done" in line and "tokens      120 retries 1" in line for line in lines[1:])
+    # Redrawn in place: the final drawing moves back over the previous lines
+    output = view.stream.getvalue()
+    assert output.endswith("retries 1\x1b[K\n")
+
+def test_batch_view_shows_pending_runs_and_prints_lines_when_not_a_terminal():
+    """Test expected runs start pending, and without a terminal a line is printed per finished run"""
+    stream = io.StringIO()
+    with ProgressView(detail=False, stream=stream) as view:
+        view.expect("GreenTech")
+        view.expect("EcoCorp")
+        assert [line.split()[:2] for line in view.render()] == [["GreenTech", "pending"], ["EcoCorp", "pending"]]
+        _run("EcoCorp", ["Stakeholder analysis"])
+    lines = view.render()
+    assert lines[0].split()[:2] == ["GreenTech", "pending"] and lines[1].split()[:2] == ["EcoCorp", "done"]
+    printed = stream.getvalue().splitlines()
+    assert len(printed) == 1 and printed[0].startswith("EcoCorp") and "task 1/1" in printed[0]
+    assert view.on_event not in events._listeners
@@ -0,0 +1,192 @@
+"""
+Test ESG report rendering engine
+"""
+
+import copy
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from esg_implementation.metric_table import MetricTable
+from esg_implementation.reporting import (
+    ReportAggregates,
+    ReportEngine,
+    compile_template,
+    render_incremental,
+    render_reports,
+    update_stored_report
+)
+from esg_implementation.tools import ReportGenerationTool
+
+SAMPLE_DATA = {
+    "name": "TestCorp",
+    "vision": {
+        "vision_statement": "Net zero by 2030",
+        "environmental_goals": ["Cut emissions"],
+        "social_goals": ["Fair pay"],
+        "governance_goals": ["Board diversity"]
+    },
+    "stakeholders": [{"name": "Investors", "category": "Investor", "influence_level": 9, "expectations": []}],
+    "material_issues": [
+        {"name": "Climate", "category": "Environmental", "importance_to_business": 8, "importance_to_stakeholders": 9}
+    ],
+    "metrics": [
+        {"name": "Scope 1 Emissions", "unit": "tCO2e", "data_source": "Meters",
+         "category": "Environmental", "current_value": 1200.0, "target_value": 900.0},
+        {"name": "Women in Leadership", "unit": "%", "data_source": "HR",
+         "category": "Social", "current_value": 35.5}
+    ],
+    "initiatives": [
+        {"name": "Solar Rollout", "description": "Install panels", "status": "in_progress",
+         "timeline": "2025", "responsible_team": "Facilities", "resources_needed": [], "success_criteria": []}
+    ]
+}
+
+@pytest.mark.parametrize("framework", ["GRI", "SASB", "TCFD"])
+def test_report_contains_framework_sections(framework):
+    """Test that each framework renders its metrics and initiatives"""
+    content = ReportEngine(framework).render(SAMPLE_DATA, date="2025-01-01")
+    assert content.startswith(f"# TestCorp ESG Report ({framework}) - 2025-01-01")
+    assert "| Scope 1 Emissions | 1200 | 900 | 75% | tCO2e | Meters |" in content
+    assert "### Solar Rollout" in content
+    assert "### Executive Summary\n\nTestCorp is committed to its ESG journey.\n\nOur ESG vision: Net zero by 2030" in content
+
+def test_markdown_report_handles_missing_sections():
+    """Test that empty organizations render placeholder notes"""
+    content = ReportEngine("GRI").render({"name": "Empty"})
+    assert "_No social metrics collected yet._" in content
+    assert "_No initiatives defined yet._" in content
+
+def test_html_report_escapes_content():
+    """Test that HTML output is a complete, escaped document"""
+    data = dict(SAMPLE_DATA, name="A & B <Corp>")
+    content = ReportEngine("SASB", "html").render(data)
+    assert content.startswith("<!DOCTYPE html>")
+    assert "A &amp; B &lt;Corp&gt;" in content
+    assert "<A & B" not in content
+    assert content.rstrip().endswith("</html>")
+
+def test_report_streams_to_file_and_buffer():
+    """Test that file and stream output match the returned content"""
+    engine = ReportEngine("TCFD")
+    expected = engine.render(SAMPLE_DATA, date="2025-01-01")
+    buffer = io.StringIO()
+    assert engine.render(SAMPLE_DATA, out=buffer, date="2025-01-01") is None
+    assert buffer.getvalue() == expected
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = engine.render_to_file(SAMPLE_DATA, str(Path(temp_dir) / "report.md"), date="2025-01-01")
+        assert path.read_text(encoding="utf-8") == expected
+
+def test_templates_are_compiled_once():
+    """Test that compiled templates are cached per framework and format"""
+    assert compile_template("GRI", "markdown") is compile_template("GRI", "markdown")
+    with pytest.raises(ValueError):
+        compile_template("UNKNOWN", "markdown")
+
+def test_report_generation_tool_uses_engine():
+    """Test that ReportGenerationTool produces framework content"""
+    tool = ReportGenerationTool()
+    result = tool._run(SAMPLE_DATA, framework="GRI")
+    assert "GRI 300: Environmental Topics" in result["content"]
+    assert "error" in tool._run(SAMPLE_DATA, output_format="pdf")
+
+def test_aggregates_are_built_in_one_pass():
+    """Test shared aggregations group metrics and count initiative statuses"""
+    aggregates = ReportAggregates(SAMPLE_DATA)
+    assert [row[0] for row in aggregates.metric_rows("Environmental")] == ["Scope 1 Emissions"]
+    assert aggregates.metric_rows("Social")[0][3] == "n/a"
+    assert aggregates.status_counts == {"in_progress": 1}
+    assert len(aggregates.issue_lines("Environmental")) == 1
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_render_reports_matches_individual_reports(parallel):
+    """Test multi-framework rendering matches one-at-a-time rendering"""
+    reports = render_reports(SAMPLE_DATA, ["GRI", "SASB", "TCFD"], parallel=parallel, date="2025-01-01")
+    for framework, content in reports.items():
+        assert content == ReportEngine(framework).render(SAMPLE_DATA, date="2025-01-01")
+
+def test_parallel_render_writes_each_framework_once():
+    """Test duplicate frameworks are rendered and written once"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        reports = render_reports(SAMPLE_DATA, ["GRI", "SASB", "GRI"], output_dir=temp_dir, parallel=True)
+        assert list(reports) == ["GRI", "SASB"]
+        assert len(list(Path(temp_dir).iterdir())) == 2
+
+def test_reduction_target_progress():
+    """Test emissions progress is measured towards a reduction target"""
+    data = copy.deepcopy(SAMPLE_DATA)
+    metric = next(m for m in data["metrics"] if m["name"] == "Scope 1 Emissions")
+    metric["current_value"] = 800
+    content = ReportEngine("GRI").render(data, date="2025-01-01")
+    assert "| Scope 1 Emissions | 800 | 900 | 100% |" in content
+
+def test_reduction_progress_without_positive_value_is_not_applicable():
+    """Test zero emissions above a net removal target report n/a from dicts and metric tables alike"""
+    data = copy.deepcopy(SAMPLE_DATA)
+    metric = next(m for m in data["metrics"] if m["name"] == "Scope 1 Emissions")
+    metric["current_value"], metric["target_value"] = 0, -50
+    table = MetricTable.from_records(data["metrics"])
+    assert np.isnan(table.progress()[table.column("name").tolist().index("Scope 1 Emissions")])
+    for metrics in (data["metrics"], table):
+        content = ReportEngine("GRI").render({**data, "metrics": metrics}, date="2025-01-01")
+        assert "| Scope 1 Emissions | 0 | -50 | n/a |" in content
+
+def test_report_generation_tool_multi_framework_to_directory():
+    """Test the tool's multi-framework mode writes one file per framework"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = ReportGenerationTool()._run(
+            SAMPLE_DATA, output_format="html", output_path=temp_dir, frameworks=["GRI", "TCFD"]
+        )
+        assert set(result["reports"]) == {"GRI", "TCFD"}
+        for report in result["reports"].values():
+            assert Path(report["filepath"]).read_text(encoding="utf-8").startswith("<!DOCTYPE html>")
+        assert "error" in ReportGenerationTool()._run(SAMPLE_DATA, frameworks=["GRI", "XYZ"])
+
+def test_incremental_report_rerenders_only_changed_section():
+    """Test that a metric update re-renders only its category's section"""
+    first = render_incremental(SAMPLE_DATA, "GRI", date="2025-01-01")
+    assert len(first["rendered_sections"]) == len(first["sections"])
+    assert first["content"] == ReportEngine("GRI").render(SAMPLE_DATA, date="2025-01-01")
+
+    updated = copy.deepcopy(SAMPLE_DATA)
+    updated["metrics"][0]["current_value"] = 1000.0
+    second = render_incremental(updated, "GRI", previous=first, date="2025-01-01")
+    assert second["rendered_sections"] == ["metrics:Environmental"]
+    assert "| Scope 1 Emissions | 1000 | 900 | 90% |" in second["content"]
+    assert second["content"] == ReportEngine("GRI").render(updated, date="2025-01-01")
+
+def test_incremental_report_stores_section_text_once():
+    """Test the section cache holds spans into the content rather than a second copy of the text"""
+    first = render_incremental(SAMPLE_DATA, "GRI", date="2025-01-01")
+    assert all(set(entry) == {"key", "fingerprint", "start", "end"} for entry in first["sections"])
+    assert first["content"][first["sections"][0]["start"]:].startswith("## ")
+
+    # A later date changes the title length, which shifts every span
+    second = render_incremental(SAMPLE_DATA, "GRI", previous=first, date="2025-01-01T12:00")
+    assert second["rendered_sections"] == []
+    assert second["content"] == ReportEngine("GRI").render(SAMPLE_DATA, date="2025-01-01T12:00")
+
+    edited = {**second, "content": second["content"].replace("## ", "#  ", 1)}
+    third = render_incremental(SAMPLE_DATA, "GRI", previous=edited, date="2025-01-01T12:00")
+    assert third["rendered_sections"] == [third["sections"][0]["key"]]
+    assert third["content"] == second["content"]
+
+def test_incremental_report_ignores_other_framework_cache():
+    """Test that cached sections are only reused for the same framework and format"""
+    gri = render_incremental(SAMPLE_DATA, "GRI")
+    html_report = render_incremental(SAMPLE_DATA, "GRI", "html", previous=gri)
+    assert len(html_report["rendered_sections"]) == len(html_report["sections"])
+
+def test_update_stored_report_splices_in_place():
+    """Test regenerated reports replace the stored report for the framework"""
+    reports = [{"framework": "SASB", "content": "old"}]
+    update_stored_report(reports, SAMPLE_DATA, "GRI")
+    updated = copy.deepcopy(SAMPLE_DATA)
+    updated["initiatives"][0]["status"] = "completed"
+    report = update_stored_report(reports, updated, "GRI")
+    assert len(reports) == 2
+    assert reports[1] is report
+    assert report["rendered_sections"] == ["initiatives:*"]
+    assert reports[0]["content"] == "old"
@@ -0,0 +1,226 @@
+"""
+Test organization storage backends
+"""
+
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from esg_implementation import changelog
+from esg_implementation.config import ESGConfig, StorageConfig
+from esg_implementation.core import ESGWorkflowManager
+from esg_implementation.models import ESGMetric, ESGOrganization, ESGVision, Initiative, MaterialIssue, Stakeholder
+from esg_implementation.repository import (
+    ConcurrentModificationError, FileRepository, PartialOrganizationError, SQLiteRepository
+)
+
+def _organization(name, scope1, target=1000.0):
+    return ESGOrganization(
+        name=name,
+        vision=ESGVision(vision_statement="Net zero", environmental_goals=["Cut emissions"],
+                         social_goals=[], governance_goals=[]),
+        stakeholders=[Stakeholder(name="Investors", category="Financial", influence_level=8, expectations=["Returns"])],
+        material_issues=[MaterialIssue(name="Climate", description="Emissions", category="Environmental", materiality_score=9)],
+        metrics=[
+            ESGMetric(name="Scope 1 Emissions", unit="tCO2e", data_source="Meters", category="Environmental",
+                      current_value=scope1, target_value=target),
+            ESGMetric(name="Board Diversity", unit="%", data_source="HR", category="Governance", current_value=40),
+        ],
+        initiatives=[Initiative(name="Solar", description="Rooftop PV", timeline="2025", responsible_team="Ops",
+                                resources_needed=["Capex"], success_criteria=["1 MW installed"])],
+        reports=[{"title": "GRI Report"}]
+    )
+
+def _repository(backend, temp_dir):
+    return FileRepository(temp_dir, durable=False) if backend == "file" else SQLiteRepository(Path(temp_dir) / "esg.db")
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_round_trip_and_partial_load(backend):
+    """Test both backends round-trip organizations and load single sections"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir) if backend == "file" else SQLiteRepository(Path(temp_dir) / "esg.db")
+        organization = _organization("Acme Corp", 1200)
+        repository.save(organization)
+        repository.save(_organization("Beta Ltd", 800))
+
+        assert repository.load("Acme Corp") == organization
+        assert repository.load("Missing") is None
+        assert repository.list_organizations() == ["Acme Corp", "Beta Ltd"]
+
+        partial = repository.load("Acme Corp", sections=["metrics"])
+        assert partial.metrics == organization.metrics
+        assert partial.vision == organization.vision
+        assert partial.stakeholders == [] and partial.reports == []
+
+        # Saving a partial load would erase the sections that were not loaded
+        assert partial.loaded_sections == {"metrics"} and repository.load("Acme Corp").loaded_sections is None
+        with pytest.raises(PartialOrganizationError):
+            repository.save(partial)
+        with pytest.raises(PartialOrganizationError):
+            repository.merge(partial, partial.model_copy(deep=True))
+        assert repository.load("Acme Corp") == organization
+
+def test_file_listing_reads_names_once_per_organization(monkeypatch):
+    """Test listing skips a legacy file shadowed by the current one and reads only names"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        FileRepository(temp_dir, durable=False).save(_organization("Acme Corp", 1200))
+        repository = FileRepository(temp_dir, codec="msgpack", durable=False)
+        repository.save(_organization("Acme Corp", 900))
+        repository.save(_organization("Beta Ltd", 800))
+        assert sorted(path.suffix for path in Path(temp_dir).glob("acme_corp_esg_data*")) == [".json", ".msgpack"]
+        assert repository.list_organizations() == ["Acme Corp", "Beta Ltd"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = FileRepository(temp_dir, durable=False)
+        repository.save(_organization("Acme Corp", 1200))
+        monkeypatch.setattr(ESGOrganization, "model_validate", lambda *args, **kwargs: pytest.fail("decoded in full"))
+        assert repository.list_organizations() == ["Acme Corp"]
+
+def test_sqlite_save_replaces_previous_version():
+    """Test saving again replaces section rows instead of appending"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = SQLiteRepository(Path(temp_dir) / "esg.db")
+        organization = _organization("Acme Corp", 1200)
+        repository.save(organization)
+        organization.metrics = organization.metrics[:1]
+        repository.save(organization)
+        assert len(repository.load("Acme Corp").metrics) == 1
+        assert repository.delete("Acme Corp")
+        assert repository.load("Acme Corp") is None
+
+def test_sqlite_portfolio_queries():
+    """Test indexed cross-organization metric and issue queries"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = SQLiteRepository(Path(temp_dir) / "esg.db")
+        repository.save(_organization("Acme Corp", 1200))
+        repository.save(_organization("Beta Ltd", 800))
+        repository.save(_organization("Gamma Inc", 1500))
+
+        over = repository.query_metrics(name="Scope 1 Emissions", exceeding_target=True)
+        assert [(org, metric.current_value) for org, metric in over] == [("Acme Corp", 1200), ("Gamma Inc", 1500)]
+        assert len(repository.query_metrics(category="Governance")) == 3
+        assert len(repository.query_metrics(organization="Beta Ltd")) == 2
+        assert len(repository.query_material_issues(category="Environmental", min_score=9)) == 3
+        assert repository.query_material_issues(min_score=9.5) == []
+
+        with repository.connect() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM metrics WHERE name = ?", ("Scope 1 Emissions",)
+            ))
+        assert "idx_metrics_name" in plan
+
+def test_sqlite_apply_changes_rows_in_one_transaction():
+    """Test SQLite applies operations row by row, bumping the revision once and rolling back on failure"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = SQLiteRepository(Path(temp_dir) / "esg.db")
+        repository.save(_organization("Acme Corp", 1200), expected_revision=0)
+        revision = repository.apply("Acme Corp", [
+            changelog.update("metrics", "Scope 1 Emissions", current_value=900),
+            changelog.remove("metrics", "Board Diversity"),
+            changelog.upsert("metrics", ESGMetric(name="Water Use", unit="m3", data_source="Meters",
+                                                  category="Environmental", current_value=5)),
+            changelog.append("reports", {"title": "TCFD Report"}),
+            changelog.set_field("vision", None),
+        ])
+        assert revision == 2
+        loaded = repository.load("Acme Corp")
+        assert [(m.name, m.current_value) for m in loaded.metrics] == [("Scope 1 Emissions", 900), ("Water Use", 5)]
+        assert [r["title"] for r in loaded.reports] == ["GRI Report", "TCFD Report"]
+        assert loaded.vision is None and loaded.revision == 2
+
+        with pytest.raises(KeyError):
+            repository.apply("Acme Corp", [changelog.upsert("metrics", ESGMetric(
+                name="Energy", unit="MWh", data_source="Meters", category="Environmental")),
+                changelog.update("metrics", "Missing", current_value=1)])
+        assert repository.load("Acme Corp") == loaded
+        assert repository.apply("Newco", [changelog.append("reports", {"title": "GRI Report"})]) == 1
+
+def test_workflow_manager_uses_configured_backend(monkeypatch):
+    """Test load/save dispatch to the SQLite backend when configured"""
+    monkeypatch.setattr(ESGWorkflowManager, "_setup_api_key", lambda self: None)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ESGConfig(data_path=temp_dir, storage=StorageConfig(backend="sqlite"))
+        manager = ESGWorkflowManager(config)
+        organization = _organization("Acme Corp", 1200)
+        assert manager.save_organization_data(organization) == Path(temp_dir) / "esg.db"
+        assert manager.load_or_create_organization("Acme Corp") == organization
+        assert manager.load_or_create_organization("Acme Corp", sections=["stakeholders"]).metrics == []
+        assert manager.load_or_create_organization("New Corp").name == "New Corp"
+
+def test_unreadable_organization_raises_instead_of_starting_empty(monkeypatch):
+    """Test invalid or corrupt stored data is reported, not replaced by an empty organization"""
+    monkeypatch.setattr(ESGWorkflowManager, "_setup_api_key", lambda self: None)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = ESGWorkflowManager(ESGConfig(data_path=temp_dir))
+        path = manager.save_organization_data(_organization("Acme Corp", 1200))
+        data = json.loads(path.read_text())
+        data["stakeholders"][0]["influence_level"] = "high"
+        path.write_text(json.dumps(data))
+        with pytest.raises(ValueError):
+            manager.load_or_create_organization("Acme Corp")
+        assert json.loads(path.read_text()) == data
+
+        corrupt = Path(temp_dir) / "corrupt.json.xz"
+        corrupt.write_bytes(b"\xfd7zXZ\x00garbage")
+        with pytest.raises(ValueError, match="Corrupt lzma data"):
+            manager.load_or_create_organization("Corrupt", data_path=str(corrupt))
+        assert manager.load_or_create_organization("New Corp", data_path=str(Path(temp_dir) / "missing.json")).name == "New Corp"
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_checked_save_rejects_stale_revision(backend):
+    """Test a save based on an outdated revision raises instead of overwriting"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = _repository(backend, temp_dir)
+        first, second = _organization("Acme Corp", 1200), _organization("Acme Corp", 900)
+        repository.save(first, expected_revision=0)
+        assert first.revision == 1
+        # A concurrent creation of the same organization loses the race
+        with pytest.raises(ConcurrentModificationError) as excinfo:
+            repository.save(second, expected_revision=0)
+        assert (excinfo.value.expected, excinfo.value.actual) == (0, 1)
+        assert second.revision == 0
+        assert repository.load("Acme Corp").metrics[0].current_value == 1200
+
+        loaded = repository.load("Acme Corp")
+        loaded.metrics[0].current_value = 1100
+        repository.save(loaded, expected_revision=loaded.revision)
+        assert repository.load("Acme Corp").revision == 2
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_parallel_updates_are_not_lost(backend):
+    """Test concurrent read-modify-write updates retry until every change is stored"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = _repository(backend, temp_dir)
+
+        def add_report(i):
+            repository.update("Acme Corp", lambda organization: organization.reports.append({"title": f"Report {i}"}),
+                              retries=100)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(add_report, range(40)))
+        reports = repository.load("Acme Corp").reports
+        assert sorted(report["title"] for report in reports) == sorted(f"Report {i}" for i in range(40))
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_merge_combines_concurrent_changes(backend):
+    """Test a conflicting save merges its record changes into the newer stored state"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = _repository(backend, temp_dir)
+        repository.save(_organization("Acme Corp", 1200), expected_revision=0)
+        run_a, run_b = repository.load("Acme Corp"), repository.load("Acme Corp")
+        base = run_b.model_copy(deep=True)
+
+        run_a.metrics[0] = run_a.metrics[0].model_copy(update={"current_value": 1000})
+        repository.save(run_a, expected_revision=run_a.revision)
+        run_b.metrics[1] = run_b.metrics[1].model_copy(update={"current_value": 45})
+        run_b.reports.append({"title": "TCFD Report"})
+        del run_b.initiatives[0]
+        repository.merge(run_b, base)
+
+        merged = repository.load("Acme Corp")
+        assert [m.current_value for m in merged.metrics] == [1000, 45]
+        assert [r["title"] for r in merged.reports] == ["GRI Report", "TCFD Report"]
+        assert merged.initiatives == []
+        assert merged.revision == run_b.revision
@@ -0,0 +1,65 @@
+"""
+Test organization serialization codecs
+"""
+
+import marshal
+import tempfile
+from pathlib import Path
+
+import pytest
+from esg_implementation import serialization
+from esg_implementation.models import ESGMetric, ESGOrganization, Stakeholder
+from esg_implementation.repository import FileRepository
+
+def _organization():
+    return ESGOrganization(
+        name="TestCorp",
+        stakeholders=[Stakeholder(name="Investors", category="Financial", influence_level=8, expectations=["Returns"])],
+        metrics=[ESGMetric(name="Scope 1 Emissions", unit="tCO2e", data_source="Meters",
+                           category="Environmental", current_value=1200.5, target_value=900)],
+        reports=[{"title": "GRI Report", "sections": []}]
+    )
+
+@pytest.mark.parametrize("codec", list(serialization.CODECS))
+@pytest.mark.parametrize("compression", [None, "gzip", "lzma"])
+def test_round_trip_detects_format(codec, compression):
+    """Test every codec and compression round-trips with auto-detection on load"""
+    organization = _organization()
+    data = serialization.dumps(organization, codec, compression)
+    assert serialization.loads(data) == organization
+
+def test_json_codec_is_compact_and_binary_codec_is_marked():
+    """Test the JSON codec writes no indentation and binary output carries its magic"""
+    organization = _organization()
+    assert b"\n" not in serialization.dumps(organization, "json")
+    assert serialization.dumps(organization, "msgpack").startswith(serialization.MSGPACK_MAGIC)
+    assert serialization.file_extension("msgpack", "gzip") == ".msgpack.gz"
+    for codec in ("yaml", "marshal"):
+        with pytest.raises(ValueError):
+            serialization.dumps(organization, codec)
+
+def test_legacy_marshal_files_are_read_only():
+    """Test files written by the removed marshal codec still load, but nothing writes marshal"""
+    organization = _organization()
+    legacy = serialization.MARSHAL_MAGIC + marshal.dumps(organization.model_dump(mode="json"))
+    assert serialization.loads(legacy) == organization
+    with tempfile.TemporaryDirectory() as temp_dir:
+        Path(temp_dir, "testcorp_esg_data.esgb").write_bytes(legacy)
+        repository = FileRepository(temp_dir, codec="msgpack")
+        assert repository.load("TestCorp") == organization
+        repository.save(organization)
+        assert repository.path_for("TestCorp").name == "testcorp_esg_data.msgpack"
+        with pytest.raises(ValueError):
+            FileRepository(temp_dir, codec="marshal")
+
+def test_save_and_load_file_and_legacy_pretty_json():
+    """Test file round trip and that existing pretty-printed files still load"""
+    organization = _organization()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = serialization.save(organization, Path(temp_dir) / "org.json.xz", "json", "lzma")
+        assert serialization.load(path) == organization
+
+        legacy = Path(temp_dir) / "legacy.json"
+        legacy.write_text(organization.model_dump_json(indent=2), encoding="utf-8")
+        assert serialization.load(legacy) == organization
+        assert ESGOrganization.load_from_json(str(legacy)) == organization
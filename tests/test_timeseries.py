@@ -0,0 +1,130 @@
+"""
+Test the columnar metric time-series store
+"""
+
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from esg_implementation.ingestion import ingest_metrics
+from esg_implementation.models import ESGOrganization
+from esg_implementation.timeseries import TimeSeriesStore, to_epoch_seconds
+from esg_implementation.tools import VisualizationTool
+
+def test_append_and_range_query_survive_reopen():
+    """Test readings persist across store instances and range queries are half-open"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        store.append("Energy Use", ["2024-01-01", "2024-01-15", "2024-02-01"], [1.0, 2.0, 3.0])
+        store.append("Energy Use", ["2024-03-01"], [4.0])
+
+        reopened = TimeSeriesStore(temp_dir)
+        assert reopened.metrics() == ["Energy Use"]
+        assert reopened.count("Energy Use") == 4
+        timestamps, values = reopened.query("Energy Use", start="2024-01-15", end="2024-03-01")
+        assert list(values) == [2.0, 3.0]
+        assert list(timestamps) == list(to_epoch_seconds(["2024-01-15", "2024-02-01"]))
+        assert len(reopened.query("Unknown")[0]) == 0
+
+def test_append_rejects_out_of_order_readings():
+    """Test appends must not go back in time"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        store.append("Water Use", ["2024-02-01"], [1.0])
+        with pytest.raises(ValueError):
+            store.append("Water Use", ["2024-01-01"], [2.0])
+        with pytest.raises(ValueError):
+            store.append("Water Use", ["2024-03-02", "2024-03-01"], [2.0, 3.0])
+        assert store.count("Water Use") == 1
+
+def test_append_batch_groups_metrics_and_drops_stale_readings():
+    """Test batch appends sort readings per metric and drop those older than the history"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        store.append("A", ["2024-01-10"], [0.0])
+        appended, dropped = store.append_batch(
+            ["B", "A", "A", "B"],
+            ["2024-01-02", "2024-01-01", "2024-01-20", "2024-01-01"],
+            [2.0, 9.0, 1.0, 1.0]
+        )
+        assert (appended, dropped) == (3, 1)
+        assert list(store.query("A")[1]) == [0.0, 1.0]
+        assert list(store.query("B")[1]) == [1.0, 2.0]
+
+def test_append_after_torn_write_keeps_columns_paired():
+    """Test an append drops the unmatched tail a crash left between the two column writes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        store.append("Energy Use", ["2024-01-01"], [1.0])
+        directory = Path(temp_dir) / store._index["Energy Use"]
+        with (directory / "values.f8").open('ab') as f:
+            f.write(np.array([99.0]).tobytes())  # Value written, timestamp lost
+
+        store.append("Energy Use", ["2024-02-01"], [2.0])
+        timestamps, values = store.query("Energy Use")
+        assert list(values) == [1.0, 2.0]
+        assert list(timestamps) == list(to_epoch_seconds(["2024-01-01", "2024-02-01"]))
+
+def test_concurrent_stores_on_one_directory_keep_every_metric():
+    """Test separate store instances appending at once neither lose index entries nor interleave columns"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def ingest(worker):
+            store = TimeSeriesStore(temp_dir)
+            for i in range(20):
+                store.append_batch([f"Metric {worker}", "Shared"], [i, i], [float(i), float(worker)])
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(ingest, range(4)))
+        store = TimeSeriesStore(temp_dir)
+        assert store.metrics() == sorted(["Shared", *(f"Metric {worker}" for worker in range(4))])
+        assert all(store.count(f"Metric {worker}") == 20 for worker in range(4))
+        timestamps, values = store.query("Shared")
+        assert len(timestamps) == len(values) == store.count("Shared")
+
+@pytest.mark.parametrize("frequency,how,expected", [
+    ("M", "mean", [1.5, 3.0, 5.0]),
+    ("M", "count", [2.0, 1.0, 2.0]),
+    ("Q", "sum", [6.0, 10.0]),
+    ("Q", "last", [3.0, 6.0]),
+    ("Y", "max", [6.0]),
+])
+def test_resample_calendar_periods(frequency, how, expected):
+    """Test monthly, quarterly and yearly aggregation"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        store.append(
+            "Energy Use",
+            ["2024-01-01", "2024-01-31T23:00", "2024-02-10", "2024-04-01", "2024-04-30"],
+            [1.0, 2.0, 3.0, 4.0, 6.0]
+        )
+        periods, values = store.resample("Energy Use", frequency=frequency, how=how)
+        assert list(values) == expected
+        assert periods[0] == np.datetime64("2024-01-01")
+
+def test_ingestion_records_history_and_trends_plot_it():
+    """Test timestamped feed rows are kept as history and drawn by the trends view"""
+    rows = [
+        {"name": "Energy Use", "unit": "MWh", "data_source": "Meters", "category": "Environmental",
+         "current_value": value, "timestamp": f"2024-0{month}-01"}
+        for month, value in [(1, 10), (2, 12), (3, 11)]
+    ] + [{"name": "Water Use", "unit": "m3", "data_source": "Meters", "category": "Environmental",
+          "timestamp": "2024-01-01"}]
+    organization = ESGOrganization(name="TestCorp")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        feed = Path(temp_dir) / "feed.jsonl"
+        feed.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+        store = TimeSeriesStore(Path(temp_dir) / "history")
+        stats = ingest_metrics(organization, str(feed), history=store)
+
+        assert (stats.history_points, stats.history_dropped) == (3, 1)
+        assert organization.metrics[0].current_value == 11
+        assert list(store.query("Energy Use")[1]) == [10.0, 12.0, 11.0]
+
+        fig = VisualizationTool()._create_trends_visualization(
+            [{"name": "Energy Use"}], str(store.root), "M"
+        )
+        assert len(fig.axes[0].lines) == 1
+        assert len(fig.axes[0].lines[0].get_xdata()) == 3
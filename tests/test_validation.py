@@ -0,0 +1,71 @@
+"""
+Test ESG batch validation engine
+"""
+
+import pytest
+from esg_implementation.models import ESGMetric, Stakeholder
+from esg_implementation.tools import DataCollectionTool
+from esg_implementation.validation import RangeRule, ValidationEngine, get_validation_engine
+
+def _metric(name="Water Use", unit="m3", value=1.0, **extra):
+    return dict(name=name, unit=unit, data_source="Meters", category="Environmental", current_value=value, **extra)
+
+def test_validate_records_reports_indices_and_rules():
+    """Test that schema and range issues carry record indices and rule names"""
+    stakeholders = [
+        {"name": "Investors", "category": "Investor", "influence_level": 9, "expectations": []},
+        {"name": "Employees", "category": "Internal", "influence_level": 11, "expectations": []},
+        {"name": "Regulators", "category": "Regulator", "expectations": []},
+    ]
+    issues = get_validation_engine().validate_records("stakeholders", stakeholders)
+    assert [(i.index, i.field, i.rule) for i in issues] == [
+        (1, "influence_level", "influence_level_range"),
+        (2, "influence_level", "schema"),
+    ]
+
+def test_emissions_must_be_non_negative():
+    """Test the conditional non-negative emissions rule"""
+    records = [
+        _metric(value=-5.0),
+        _metric(name="Scope 1 Emissions", unit="tCO2e", value=-1.0),
+        _metric(name="Fleet", unit="kg CO2", value=2.0, target_value=-3.0),
+    ]
+    valid, issues = get_validation_engine().parse_records("metrics", records)
+    assert [index for index, _ in valid] == [0]
+    assert [(i.index, i.field, i.rule) for i in issues] == [
+        (1, "current_value", "non_negative_emissions"),
+        (2, "target_value", "non_negative_emissions"),
+    ]
+
+def test_parse_records_returns_models_across_chunks():
+    """Test that valid records survive errors in other chunks"""
+    records = [_metric(name=f"M{i}", value=i) for i in range(25)]
+    records[12]["current_value"] = "bad"
+    section = get_validation_engine().sections["metrics"]
+    valid, issues = section.parse(records, chunk_size=10)
+    assert len(valid) == 24
+    assert all(isinstance(metric, ESGMetric) for _, metric in valid)
+    assert [i.index for i in issues] == [12]
+
+def test_custom_rules_compile_into_schema():
+    """Test that unconditional rules are enforced natively and keep model types"""
+    engine = ValidationEngine([RangeRule("small_influence", "stakeholders", "influence_level", le=5)])
+    valid, issues = engine.parse_records(
+        "stakeholders",
+        [{"name": "A", "category": "X", "influence_level": 6, "expectations": []},
+         {"name": "B", "category": "X", "influence_level": 0, "expectations": []}]
+    )
+    assert [i.rule for i in issues] == ["small_influence"]
+    assert isinstance(valid[0][1], Stakeholder)
+    with pytest.raises(ValueError):
+        engine.parse_records("unknown", [])
+
+def test_data_collection_tool_validate():
+    """Test the validate operation returns structured issues"""
+    tool = DataCollectionTool()
+    assert tool._run("validate", {"name": "TestCorp", "metrics": [_metric()]}) == {"status": "valid", "issues": []}
+    result = tool._run("validate", {"name": "TestCorp", "vision": {"vision_statement": 1}, "metrics": [_metric(), {"name": "x"}]})
+    assert result["status"] == "invalid"
+    sections = {(issue["section"], issue["index"]) for issue in result["issues"]}
+    assert (None, None) in sections
+    assert ("metrics", 1) in sections
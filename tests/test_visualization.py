@@ -0,0 +1,105 @@
+"""
+Test ESG chart rendering helpers
+"""
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.collections import PathCollection, PolyCollection
+import numpy as np
+import pytest
+import tempfile
+
+from esg_implementation.timeseries import TimeSeriesStore
+from esg_implementation.visualization import (
+    LabelGrid, downsample, lttb_indices, minmax_indices, render_materiality_matrix, render_trends
+)
+
+def _issues(count):
+    categories = ["Environmental", "Social", "Governance"]
+    return [
+        {
+            "name": f"Issue {i}",
+            "category": categories[i % 3],
+            "importance_to_business": i % 10 + 1,
+            "importance_to_stakeholders": (i * 7) % 10 + 1,
+        }
+        for i in range(count)
+    ]
+
+def test_label_grid_rejects_overlaps():
+    """Test that the label grid only accepts non-overlapping boxes"""
+    grid = LabelGrid(cell_size=10)
+    assert grid.try_place((0, 0, 15, 5))
+    assert not grid.try_place((12, 2, 30, 8)), "Overlapping box should be rejected"
+    assert grid.try_place((15, 0, 30, 5)), "Touching box should be accepted"
+
+def test_materiality_matrix_batches_scatter_per_category():
+    """Test that points are drawn with one scatter call per category"""
+    fig = render_materiality_matrix(_issues(300))
+    ax = fig.axes[0]
+    scatters = [c for c in ax.collections if isinstance(c, PathCollection)]
+    assert len(scatters) == 3
+    assert sum(len(c.get_offsets()) for c in scatters) == 300
+    plt.close(fig)
+
+def test_materiality_matrix_labels_do_not_overlap():
+    """Test that placed labels never overlap each other"""
+    fig = render_materiality_matrix(_issues(200), max_labels=40)
+    ax = fig.axes[0]
+    fig.canvas.draw()
+    boxes = [t.get_window_extent() for t in ax.texts]
+    assert 0 < len(boxes) <= 40
+    for i, a in enumerate(boxes):
+        for b in boxes[i + 1:]:
+            assert not a.shrunk(0.9, 0.9).overlaps(b.shrunk(0.9, 0.9))
+    plt.close(fig)
+
+def test_materiality_matrix_density_fallback():
+    """Test that large issue sets are rendered as density shading"""
+    fig = render_materiality_matrix(_issues(500), density_threshold=100)
+    ax = fig.axes[0]
+    assert any(isinstance(c, PolyCollection) for c in ax.collections)
+    assert not any(isinstance(c, PathCollection) for c in ax.collections)
+    plt.close(fig)
+
+def test_minmax_keeps_extremes_of_every_bucket():
+    """Test min/max bucketing keeps each bucket's peak and trough"""
+    y = np.zeros(1000)
+    y[123], y[877] = 50.0, -50.0
+    indices = minmax_indices(y, 20)
+    assert 123 in indices and 877 in indices
+    assert len(indices) <= 20
+    assert np.all(np.diff(indices) > 0)
+
+def test_lttb_keeps_endpoints_and_spikes():
+    """Test LTTB keeps the first and last points and isolated spikes"""
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 25.0
+    indices = lttb_indices(x, y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 9_999
+    assert 4321 in indices
+
+@pytest.mark.parametrize("method", ["lttb", "minmax", "minmax_lttb"])
+def test_downsample_respects_budget(method):
+    """Test every method reduces a long series to the point budget"""
+    x = np.arange(100_000)
+    y = np.random.default_rng(0).normal(size=100_000)
+    sx, sy = downsample(x, y, 500, method=method)
+    assert len(sx) == len(sy) <= 500
+    assert np.all(np.diff(sx) > 0)
+    assert np.array_equal(downsample(x[:10], y[:10], 500)[1], y[:10])
+
+def test_trends_downsample_raw_readings_to_pixel_budget():
+    """Test the trends chart plots at most the point budget per series"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir)
+        start = np.datetime64("2024-01-01T00:00:00").astype(np.int64)
+        store.append("Energy Use", start + np.arange(50_000) * 60, np.arange(50_000, dtype=float))
+        fig = render_trends(store, max_points=1000)
+        line = fig.axes[0].lines[0]
+        assert len(line.get_ydata()) <= 1000
+        assert line.get_ydata()[-1] == 49_999
+        plt.close(fig)